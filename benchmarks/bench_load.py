@@ -0,0 +1,496 @@
+"""
+Load test the MCP servers and the Item Tracker bridge with local stand-ins.
+
+Each scenario starts its processes on free ports, drives them with concurrent
+clients for a fixed time and reports throughput, p50/p99 latency and the peak
+RSS of every process:
+
+    server        server.py (DuckDuckGo stand-in), N MCP/SSE clients
+    itemtracker   server_itemtracker.py (Item Tracker stand-in), N MCP/SSE clients
+    bridge        client_itemtracker_llm.py (Ollama stand-in) in front of server_itemtracker.py,
+                  N HTTP clients sending a prompt to /get_toolcall and running it with /execute_toolcall
+
+    python benchmarks/bench_load.py --scenario server --clients 16 --duration 20
+    python benchmarks/bench_load.py --scenario itemtracker --clients 32 --api-latency 0.02
+    python benchmarks/bench_load.py --scenario bridge --http-clients 8 --llm-latency 0.5
+    python benchmarks/bench_load.py --scenario all --output results.json
+
+The tool mix is a preset name (see MIXES), "tool=weight,..." using the default
+arguments in TOOL_ARGUMENTS, or a JSON file with a list of
+{"tool": ..., "weight": ..., "arguments": {...}}. Results are also written as JSON
+(--output, by default benchmarks/results/load_<time>.json) so runs can be compared.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import random
+import asyncio
+import argparse
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+import httpx
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+SERVER_DIR = os.path.join(REPO_DIR, "mcp_server")
+CLIENT_DIR = os.path.join(REPO_DIR, "mcp_client")
+STANDINS_DIR = os.path.join(BENCHMARKS_DIR, "standins")
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+
+SCENARIOS = ("server", "itemtracker", "bridge")
+
+_SAMPLE_TEXT = (
+    "The quick brown fox jumps over the lazy dog. Pack my box with five dozen liquor jugs. "
+) * 40
+
+# Default arguments per tool, drawn from a seeded random generator
+TOOL_ARGUMENTS = {
+    "convert_length": lambda rng: {"value": rng.uniform(0, 1000), "from_unit": "meters", "to_unit": "feet"},
+    "convert_temperature": lambda rng: {"value": rng.uniform(-40, 100), "from_unit": "celsius", "to_unit": "fahrenheit"},
+    "convert_units": lambda rng: {"value": rng.uniform(0, 1000), "from_unit": "km", "to_unit": "mi"},
+    "convert_units_batch": lambda rng: {"values": [rng.uniform(0, 1000) for _ in range(1000)], "from_unit": "kg", "to_unit": "lb"},
+    "count_words": lambda rng: {"text": _SAMPLE_TEXT[: rng.randint(100, len(_SAMPLE_TEXT))]},
+    "analyze_text": lambda rng: {"text": _SAMPLE_TEXT * 10, "top_n": 5},
+    "generate_password": lambda rng: {"length": 16},
+    "generate_passwords": lambda rng: {"count": 100, "length": 16},
+    "calculate_age": lambda rng: {"birth_date": f"{rng.randint(1940, 2020)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"},
+    "get_timezone_info": lambda rng: {"timezone_name": rng.choice(["Europe/Lisbon", "America/New_York", "Asia/Tokyo", "UTC"])},
+    "get_world_clock": lambda rng: {"timezone_names": ["Europe/Lisbon", "America/New_York", "Asia/Tokyo"]},
+    "search_timezones": lambda rng: {"query": rng.choice(["lisbon", "new york", "tokio", "sao paulo"])},
+    "duckduckgo_search": lambda rng: {"query": f"benchmark query {rng.randint(1, 50)}", "max_results": 5},
+    "list_items": lambda rng: {"storage_name": f"Storage {rng.randint(0, 9)}", "limit": 50},
+    "query_items": lambda rng: {"name_contains": f"Item {rng.randint(1, 9)}", "limit": 50},
+    "get_expiring_items": lambda rng: {"days": 30},
+    "add_item": lambda rng: {"name": "Benchmark item", "quantity": rng.randint(1, 5), "replacement_date": "2026-01-01", "storage_name": "Bench"},
+    "edit_item": lambda rng: {"item_id": rng.randint(1, 1000), "quantity": rng.randint(1, 5)},
+}
+
+MIXES = {
+    "utility": {
+        "convert_length": 4, "convert_units": 2, "count_words": 2, "calculate_age": 2,
+        "get_timezone_info": 2, "search_timezones": 1, "generate_password": 1, "analyze_text": 1,
+    },
+    "search": {"duckduckgo_search": 1},
+    "cpu": {"analyze_text": 2, "convert_units_batch": 1, "generate_passwords": 1},
+    "itemtracker": {"list_items": 4, "query_items": 2, "get_expiring_items": 2, "add_item": 1, "edit_item": 1},
+}
+
+DEFAULT_MIXES = {"server": "utility", "itemtracker": "itemtracker"}
+
+# Prompts the bridge clients send, with {id} replaced by a random item id
+PROMPTS = {
+    "add": "Add Canned Tuna with replacement date in 25th June 2025 into storage named Bunker 101",
+    "edit": "Edit item with id {id} to quantity 2",
+    "remove": "Remove item with id {id}",
+}
+DEFAULT_PROMPT_MIX = "add=3,edit=1,remove=1"
+
+
+def parse_mix(spec: str) -> list:
+    """
+    Parse a tool mix into (tool, weight, argument factory) entries.
+
+    Args:
+        spec (str): Preset name, "tool=weight,..." or path to a JSON file.
+    """
+    if os.path.isfile(spec):
+        with open(spec, encoding="utf-8") as f:
+            entries = json.load(f)
+        return [
+            (entry["tool"], entry.get("weight", 1), (lambda arguments: lambda rng: arguments)(entry.get("arguments", {})))
+            for entry in entries
+        ]
+    weights = MIXES.get(spec)
+    if weights is None:
+        weights = {}
+        for part in spec.split(","):
+            tool, _, weight = part.partition("=")
+            weights[tool.strip()] = float(weight or 1)
+    unknown = [tool for tool in weights if tool not in TOOL_ARGUMENTS]
+    if unknown:
+        raise SystemExit(f"No default arguments for {', '.join(unknown)}; use a JSON mix file for these tools")
+    return [(tool, weight, TOOL_ARGUMENTS[tool]) for tool, weight in weights.items()]
+
+
+def parse_weights(spec: str) -> dict:
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(ordered: list, q: float) -> float:
+    """Nearest-rank percentile of an ordered list."""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+
+class Recorder:
+    """Latencies and errors per operation."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, operation: str, seconds: float, ok: bool = True):
+        self.latencies.setdefault(operation, []).append(seconds)
+        if not ok:
+            self.errors[operation] = self.errors.get(operation, 0) + 1
+
+    @staticmethod
+    def _summary(latencies: list, errors: int, duration: float) -> dict:
+        ordered = sorted(latencies)
+        return {
+            "count": len(ordered),
+            "errors": errors,
+            "throughput": round(len(ordered) / duration, 2),
+            "mean_ms": round(1000 * sum(ordered) / len(ordered), 3) if ordered else None,
+            "p50_ms": round(1000 * percentile(ordered, 0.5), 3) if ordered else None,
+            "p99_ms": round(1000 * percentile(ordered, 0.99), 3) if ordered else None,
+            "max_ms": round(1000 * ordered[-1], 3) if ordered else None,
+        }
+
+    def summary(self, duration: float, total: str = None) -> dict:
+        operations = {
+            operation: self._summary(latencies, self.errors.get(operation, 0), duration)
+            for operation, latencies in sorted(self.latencies.items())
+        }
+        if total is not None:
+            overall = self._summary(self.latencies.get(total, []), self.errors.get(total, 0), duration)
+        else:
+            overall = self._summary(
+                [value for latencies in self.latencies.values() for value in latencies],
+                sum(self.errors.values()),
+                duration,
+            )
+        return {**overall, "operations": operations}
+
+
+def _rss_kb(pid: int) -> int:
+    # Resident memory of a process and all its descendants, from /proc (Linux only)
+    children = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+        except OSError:
+            pass
+    return total
+
+
+class Process:
+    """A benchmarked process, with its output in a log file and its peak RSS."""
+
+    def __init__(self, name: str, command: list, port: int, cwd: str = REPO_DIR, env: dict = None, log_dir: str = None):
+        self.name = name
+        self.port = port
+        self.log_path = os.path.join(log_dir or RESULTS_DIR, f"{name}.log")
+        self.log = open(self.log_path, "w")
+        self.process = subprocess.Popen(
+            command, cwd=cwd, env={**os.environ, **(env or {})},
+            stdout=self.log, stderr=subprocess.STDOUT,
+        )
+        self.peak_rss_kb = 0
+
+    def wait_ready(self, timeout: float = 30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise SystemExit(f"{self.name} exited with code {self.process.returncode}, see {self.log_path}")
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.5):
+                    return
+            except OSError:
+                time.sleep(0.1)
+        raise SystemExit(f"{self.name} did not start listening on port {self.port}, see {self.log_path}")
+
+    def sample_rss(self) -> int:
+        if sys.platform.startswith("linux") and self.process.poll() is None:
+            rss = _rss_kb(self.process.pid)
+            self.peak_rss_kb = max(self.peak_rss_kb, rss)
+            return rss
+        return 0
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.log.close()
+
+
+async def _sample_rss(processes: list, stop: asyncio.Event, interval: float = 0.5):
+    while not stop.is_set():
+        for process in processes:
+            process.sample_rss()
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def drive_mcp(url: str, clients: int, duration: float, mix: list, seed: int) -> tuple:
+    """
+    Run MCP/SSE clients, each calling tools from the mix back to back.
+
+    Sessions are opened before the clock starts.
+
+    Returns:
+        tuple: (Recorder, measured duration in seconds)
+    """
+    recorder = Recorder()
+    ready = asyncio.Barrier(clients + 1)
+    start = asyncio.Event()
+    deadline = 0.0
+
+    async def client(index):
+        rng = random.Random(seed + index)
+        tools = [tool for tool, _, _ in mix]
+        weights = [weight for _, weight, _ in mix]
+        factories = {tool: factory for tool, _, factory in mix}
+        try:
+            async with sse_client(url) as (read_stream, write_stream):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    await ready.wait()
+                    await start.wait()
+                    while time.perf_counter() < deadline:
+                        tool = rng.choices(tools, weights)[0]
+                        began = time.perf_counter()
+                        try:
+                            result = await session.call_tool(tool, factories[tool](rng))
+                            recorder.record(tool, time.perf_counter() - began, not result.isError)
+                        except Exception:
+                            # The session is unusable once its transport fails
+                            recorder.record(tool, time.perf_counter() - began, False)
+                            return
+        except Exception as e:
+            print(f"  client {index} failed: {type(e).__name__}: {e}", file=sys.stderr)
+            if not ready.broken:
+                await ready.abort()
+
+    tasks = [asyncio.create_task(client(index)) for index in range(clients)]
+    try:
+        await ready.wait()
+    except asyncio.BrokenBarrierError:
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise SystemExit("Could not open every MCP session")
+    began = time.perf_counter()
+    deadline = began + duration
+    start.set()
+    await asyncio.gather(*tasks)
+    return recorder, time.perf_counter() - began
+
+
+async def drive_bridge(base_url: str, clients: int, duration: float, prompt_mix: dict, items: int, seed: int) -> tuple:
+    """
+    Run HTTP clients against the bridge, each turning prompts into tool calls and running them.
+
+    Returns:
+        tuple: (Recorder, measured duration in seconds)
+    """
+    recorder = Recorder()
+    kinds = list(prompt_mix)
+    weights = list(prompt_mix.values())
+    began = time.perf_counter()
+    deadline = began + duration
+
+    async def client(index, http):
+        rng = random.Random(seed + index)
+        while time.perf_counter() < deadline:
+            prompt = PROMPTS[rng.choices(kinds, weights)[0]].format(id=rng.randint(1, max(1, items)))
+            prompt_began = time.perf_counter()
+            ok = False
+            try:
+                response = await http.post("/get_toolcall", json={"prompt": prompt})
+                recorder.record("get_toolcall", time.perf_counter() - prompt_began, response.is_success)
+                if response.is_success:
+                    execute_began = time.perf_counter()
+                    executed = await http.post("/execute_toolcall", json={"tool_call": response.json()["tool_call"]})
+                    recorder.record("execute_toolcall", time.perf_counter() - execute_began, executed.is_success)
+                    ok = executed.is_success
+            except httpx.HTTPError:
+                pass
+            recorder.record("prompt", time.perf_counter() - prompt_began, ok)
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as http:
+        await asyncio.gather(*(client(index, http) for index in range(clients)))
+    return recorder, time.perf_counter() - began
+
+
+def start_processes(scenario: str, args, log_dir: str) -> tuple:
+    """
+    Start the processes of a scenario and wait until they listen.
+
+    Returns:
+        tuple: (processes, URL the clients connect to)
+    """
+    python = sys.executable
+    processes = []
+
+    def start(name, command, port, **kwargs):
+        process = Process(name, command, port, log_dir=log_dir, **kwargs)
+        processes.append(process)
+        process.wait_ready()
+        return process
+
+    try:
+        if scenario == "server":
+            search_port = free_port()
+            start("duckduckgo_standin", [python, os.path.join(STANDINS_DIR, "duckduckgo.py"), "--port", str(search_port), "--latency", str(args.api_latency)], search_port)
+            port = free_port()
+            start(
+                "server", [python, "server.py", "--profile", args.profile, "--host", "127.0.0.1", "--port", str(port), "--workers", str(args.workers)], port,
+                cwd=SERVER_DIR, env={"DUCKDUCKGO_URL": f"http://127.0.0.1:{search_port}/html/", "SEARCH_CACHE_PATH": ""},
+            )
+            return processes, f"http://127.0.0.1:{port}/sse"
+
+        api_port = free_port()
+        start("itemtracker_standin", [python, os.path.join(STANDINS_DIR, "itemtracker.py"), "--port", str(api_port), "--latency", str(args.api_latency), "--items", str(args.items)], api_port)
+        port = free_port()
+        start(
+            "server_itemtracker", [python, "server_itemtracker.py", "--host", "127.0.0.1", "--port", str(port), "--workers", str(args.workers)], port,
+            cwd=SERVER_DIR, env={"ITEM_TRACKER_API": f"http://127.0.0.1:{api_port}"},
+        )
+        if scenario == "itemtracker":
+            return processes, f"http://127.0.0.1:{port}/sse"
+
+        llm_port = free_port()
+        start("ollama_standin", [python, os.path.join(STANDINS_DIR, "ollama.py"), "--port", str(llm_port), "--latency", str(args.llm_latency)], llm_port)
+        bridge_port = free_port()
+        start(
+            "bridge", [python, "-m", "uvicorn", "client_itemtracker_llm:app", "--host", "127.0.0.1", "--port", str(bridge_port), "--log-level", "warning"], bridge_port,
+            cwd=CLIENT_DIR, env={"SERVER_IP": "127.0.0.1", "SERVER_PORT": str(port), "OLLAMA_HOST": f"http://127.0.0.1:{llm_port}"},
+        )
+        return processes, f"http://127.0.0.1:{bridge_port}"
+    except BaseException:
+        for process in processes:
+            process.stop()
+        raise
+
+
+async def run_scenario(scenario: str, args, log_dir: str) -> dict:
+    processes, url = start_processes(scenario, args, log_dir)
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_rss(processes, stop))
+    try:
+        if scenario == "bridge":
+            recorder, duration = await drive_bridge(url, args.http_clients, args.duration, parse_weights(args.prompt_mix), args.items, args.seed)
+            summary = recorder.summary(duration, total="prompt")
+            clients = args.http_clients
+        else:
+            mix = parse_mix(args.mix or DEFAULT_MIXES[scenario])
+            recorder, duration = await drive_mcp(url, args.clients, args.duration, mix, args.seed)
+            summary = recorder.summary(duration)
+            clients = args.clients
+    finally:
+        stop.set()
+        await sampler
+        for process in processes:
+            process.sample_rss()
+            process.stop()
+
+    return {
+        "clients": clients,
+        "duration_s": round(duration, 3),
+        **summary,
+        "peak_rss_mb": {process.name: round(process.peak_rss_kb / 1024, 1) for process in processes},
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(name: str, result: dict):
+    print(f"\n{name}: {result['clients']} clients for {result['duration_s']} s")
+    print(f"  {'operation':<22} {'count':>8} {'errors':>7} {'ops/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    rows = [("total", result), *result["operations"].items()]
+    for operation, stats in rows:
+        p50 = "-" if stats["p50_ms"] is None else f"{stats['p50_ms']:.1f}"
+        p99 = "-" if stats["p99_ms"] is None else f"{stats['p99_ms']:.1f}"
+        print(f"  {operation:<22} {stats['count']:>8} {stats['errors']:>7} {stats['throughput']:>9.1f} {p50:>9} {p99:>9}")
+    print("  peak RSS: " + ", ".join(f"{process} {rss} MB" for process, rss in result["peak_rss_mb"].items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load benchmark for the MCP servers and the Item Tracker bridge")
+    parser.add_argument("--scenario", choices=(*SCENARIOS, "all"), default="all")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent MCP/SSE clients")
+    parser.add_argument("--http-clients", type=int, default=4, help="Concurrent HTTP clients of the bridge")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load per scenario")
+    parser.add_argument("--mix", help=f"Tool mix: preset ({', '.join(MIXES)}), 'tool=weight,...' or a JSON file")
+    parser.add_argument("--prompt-mix", default=DEFAULT_PROMPT_MIX, help="Bridge prompt mix, e.g. 'add=3,edit=1,remove=1'")
+    parser.add_argument("--profile", default="all", help="Tool profile of server.py")
+    parser.add_argument("--workers", type=int, default=1, help="Server worker processes")
+    parser.add_argument("--api-latency", type=float, default=0.01, help="Seconds the API stand-ins wait per request")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds the Ollama stand-in waits per request")
+    parser.add_argument("--items", type=int, default=1000, help="Items the Item Tracker stand-in starts with")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the clients' random choices")
+    parser.add_argument("--label", help="Free-form label stored with the results")
+    parser.add_argument("--output", help="Results JSON path (default benchmarks/results/load_<time>.json)")
+    args = parser.parse_args()
+
+    started = datetime.now(timezone.utc)
+    output = args.output or os.path.join(RESULTS_DIR, f"load_{started:%Y%m%d_%H%M%S}.json")
+    log_dir = os.path.splitext(output)[0] + "_logs"
+    os.makedirs(log_dir, exist_ok=True)
+
+    results = {
+        "label": args.label,
+        "started_at": started.isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": vars(args),
+        "scenarios": {},
+    }
+    for scenario in SCENARIOS if args.scenario == "all" else [args.scenario]:
+        results["scenarios"][scenario] = asyncio.run(run_scenario(scenario, args, log_dir))
+        print_results(scenario, results["scenarios"][scenario])
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output} (process logs in {log_dir})")
+
+
+if __name__ == "__main__":
+    main()
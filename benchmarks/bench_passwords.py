@@ -0,0 +1,57 @@
+"""
+Compare password generation throughput: one generate_password call per password
+(the per-character secrets.choice path) against one generate_passwords call.
+
+    python benchmarks/bench_passwords.py --count 10000 --length 16
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mcp_server"))
+
+from tools.text_tools import generate_password, generate_passwords  # noqa: E402
+
+
+def best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Password generation benchmark")
+    parser.add_argument("--count", type=int, default=10000, help="Passwords per run")
+    parser.add_argument("--length", type=int, default=16, help="Password length")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path; the best is reported")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    chars = args.count * args.length
+    single = best_of(args.repeat, lambda: [generate_password(args.length) for _ in range(args.count)])
+    bulk = best_of(args.repeat, lambda: generate_passwords(args.count, args.length))
+
+    results = {
+        "count": args.count,
+        "length": args.length,
+        "generate_password_chars_per_second": round(chars / single),
+        "generate_passwords_chars_per_second": round(chars / bulk),
+        "speedup": round(single / bulk, 2),
+    }
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    print(f"{args.count} passwords of {args.length} characters (best of {args.repeat})")
+    print(f"  generate_password x{args.count}: {single:8.3f} s  {results['generate_password_chars_per_second']:>12,} chars/s")
+    print(f"  generate_passwords:        {bulk:8.3f} s  {results['generate_passwords_chars_per_second']:>12,} chars/s")
+    print(f"  speedup: {results['speedup']}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Compare system prompts listing every tool against prompts listing only the top-k
+tools picked by the client's ToolIndex, on a fixed set of queries with known tools.
+
+    python benchmarks/bench_tool_index.py --top-k 3,6,10
+    python benchmarks/bench_tool_index.py --model qwen3:4b --repeat 3
+
+Reports the prompt size, the time to select the tools and the share of queries whose
+needed tools all made it into the prompt (recall). With --model, also times the
+model's answer (first token and total) with each prompt on the Ollama server at
+OLLAMA_HOST.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", "mcp_server"))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", "mcp_client"))
+
+from server import create_server  # noqa: E402
+from tool_index import ToolIndex, describe_tools  # noqa: E402
+from tool_plan import PLAN_FORMAT_PROMPT  # noqa: E402
+
+# (server profile, query, tools the query needs)
+QUERIES = [
+    ("all", "A person born on 1998-04-27 with 1.85m, what would be his age and height in feet?", ["calculate_age", "convert_length"]),
+    ("all", "Convert 30 degrees Celsius to Fahrenheit", ["convert_temperature"]),
+    ("all", "How many kilograms are 12 pounds?", ["convert_units"]),
+    ("all", "Convert these speeds from km/h to mph: 50, 80, 120", ["convert_units_batch"]),
+    ("all", "Which units of volume can you convert?", ["list_units"]),
+    ("all", "What time is it in Tokyo right now?", ["get_timezone_info"]),
+    ("all", "Show me the current time in London, New York and Sydney", ["get_world_clock"]),
+    ("all", "What is the timezone name for Lisbon?", ["search_timezones"]),
+    ("all", "Generate a secure password of 20 characters with symbols", ["generate_password"]),
+    ("all", "Create 50 passwords for the new accounts", ["generate_passwords"]),
+    ("all", "I need 10 random API tokens", ["generate_tokens"]),
+    ("all", "Count the words in this text: the quick brown fox jumps over the lazy dog", ["count_words"]),
+    ("all", "Give me detailed statistics for this paragraph of text", ["analyze_text"]),
+    ("all", "Analyze the log file at /var/log/app.log", ["analyze_file"]),
+    ("all", "Search the web for the latest Python release", ["duckduckgo_search"]),
+    ("all", "Search DuckDuckGo for rust async runtimes and for go generics at the same time", ["duckduckgo_multi_search"]),
+    ("all", "Calculate the ages of people born on 1990-01-01, 1985-06-15 and 2001-12-31", ["calculate_ages"]),
+    ("all", "Add Canned Tuna to the storage named Bunker 101", ["add_item"]),
+    ("all", "Remove item with id 21", ["remove_item"]),
+    ("itemtracker", "Add Canned Tuna with replacement date in 25th June 2025 and expiration date in 25th June 2025 into storage named Bunker 101", ["add_item"]),
+    ("itemtracker", "Edit item with id 21 to expiration date 26th June 2025", ["edit_item"]),
+    ("itemtracker", "Remove item with id 21", ["remove_item"]),
+    ("itemtracker", "Remove the items with ids 3, 4 and 9", ["remove_items"]),
+    ("itemtracker", "Which items expire in the next 7 days?", ["get_expiring_items"]),
+    ("itemtracker", "List the items in the storage Pantry", ["list_items"]),
+    ("itemtracker", "Find items whose name contains rice expiring before August", ["query_items"]),
+    ("itemtracker", "Adiciona Pao com data de validade a 26 de Junho de 2025 no armazenamento: mochila do Joao", ["add_item"]),
+    ("itemtracker", "Remove item com id 21", ["remove_item"]),
+]
+
+SYSTEM_PROMPT = (
+    "You are a helpful assistant. "
+    "If you need to use tools, " + PLAN_FORMAT_PROMPT +
+    "Otherwise, answer normally."
+    "\nAvailable tools:\n"
+)
+
+
+async def load_tools(profile: str) -> list:
+    """The profile's tools, in the OpenAI format the clients build from list_tools."""
+    server = create_server(profile, "localhost", 0)
+    return [
+        {"type": "function", "function": {"name": tool.name, "description": tool.description, "parameters": tool.inputSchema}}
+        for tool in await server.list_tools()
+    ]
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def time_model(client, model: str, prompt: str, query: str, repeat: int) -> dict:
+    first_tokens, totals = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        first = None
+        for chunk in client.chat(
+            model=model,
+            messages=[{"role": "system", "content": prompt}, {"role": "user", "content": query}],
+            stream=True,
+        ):
+            if first is None and chunk["message"]["content"]:
+                first = time.perf_counter() - start
+        totals.append(time.perf_counter() - start)
+        first_tokens.append(first if first is not None else totals[-1])
+    return {"first_token": statistics.median(first_tokens), "total": statistics.median(totals)}
+
+
+def run(args) -> dict:
+    profiles = sorted({profile for profile, _, _ in QUERIES})
+    tools = {profile: asyncio.run(load_tools(profile)) for profile in profiles}
+
+    build_times = {}
+    indexes = {}
+    for profile in profiles:
+        start = time.perf_counter()
+        indexes[profile] = ToolIndex(tools[profile])
+        build_times[profile] = time.perf_counter() - start
+
+    client = None
+    if args.model:
+        import ollama
+        client = ollama.Client(host=os.getenv("OLLAMA_HOST"))
+
+    full_sizes = [len(SYSTEM_PROMPT + describe_tools(tools[profile])) for profile, _, _ in QUERIES]
+    results = {
+        "queries": len(QUERIES),
+        "tools": {profile: len(tools[profile]) for profile in profiles},
+        "index_build_ms": {profile: round(seconds * 1000, 3) for profile, seconds in build_times.items()},
+        "full": {"prompt_chars": round(statistics.mean(full_sizes)), "recall": 1.0},
+        "top_k": {},
+    }
+    if client:
+        timings = [time_model(client, args.model, SYSTEM_PROMPT + describe_tools(tools[profile]), query, args.repeat) for profile, query, _ in QUERIES]
+        results["full"]["first_token_s"] = round(statistics.mean(t["first_token"] for t in timings), 3)
+        results["full"]["total_s"] = round(statistics.mean(t["total"] for t in timings), 3)
+
+    for k in args.top_k:
+        sizes, select_times, hits, fallbacks, misses, timings = [], [], 0, 0, [], []
+        for (profile, query, expected), full_size in zip(QUERIES, full_sizes):
+            index = indexes[profile]
+            start = time.perf_counter()
+            selected = index.select(query, k)
+            select_times.append(time.perf_counter() - start)
+            names = {tool["function"]["name"] for tool in selected}
+            prompt = SYSTEM_PROMPT + describe_tools(selected)
+            sizes.append(len(prompt))
+            fallbacks += len(selected) == len(index.tools)
+            if set(expected) <= names:
+                hits += 1
+            else:
+                misses.append(query)
+            if client:
+                timings.append(time_model(client, args.model, prompt, query, args.repeat))
+        entry = {
+            "prompt_chars": round(statistics.mean(sizes)),
+            "prompt_reduction": round(1 - sum(sizes) / sum(full_sizes), 3),
+            "recall": round(hits / len(QUERIES), 3),
+            "fallbacks": fallbacks,
+            "select_ms_p50": round(percentile(select_times, 0.5) * 1000, 3),
+            "select_ms_p99": round(percentile(select_times, 0.99) * 1000, 3),
+            "misses": misses,
+        }
+        if client:
+            entry["first_token_s"] = round(statistics.mean(t["first_token"] for t in timings), 3)
+            entry["total_s"] = round(statistics.mean(t["total"] for t in timings), 3)
+        results["top_k"][str(k)] = entry
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool selection benchmark")
+    parser.add_argument("--top-k", type=lambda value: [int(k) for k in value.split(",")], default=[3, 6, 10], help="Comma-separated k values")
+    parser.add_argument("--model", help="Also time the answers of this Ollama model (at OLLAMA_HOST)")
+    parser.add_argument("--repeat", type=int, default=1, help="Model calls per prompt; the median is reported")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    tools = ", ".join(f"{profile}: {count}" for profile, count in results["tools"].items())
+    builds = ", ".join(f"{profile}: {ms} ms" for profile, ms in results["index_build_ms"].items())
+    print(f"{results['queries']} queries, tools per profile ({tools}), index build ({builds})")
+    timed = "first_token_s" in results["full"]
+    header = f"  {'prompt':<8} {'chars':>7} {'saved':>7} {'recall':>7} {'fallbacks':>9} {'select p50':>11}"
+    print(header + (f" {'1st token':>10} {'total':>8}" if timed else ""))
+    full = results["full"]
+    line = f"  {'full':<8} {full['prompt_chars']:>7} {'':>7} {full['recall']:>7.0%} {'':>9} {'':>11}"
+    print(line + (f" {full['first_token_s']:>9.3f}s {full['total_s']:>7.3f}s" if timed else ""))
+    for k, entry in results["top_k"].items():
+        line = (
+            f"  {'top ' + k:<8} {entry['prompt_chars']:>7} {entry['prompt_reduction']:>7.0%} {entry['recall']:>7.0%} "
+            f"{entry['fallbacks']:>9} {entry['select_ms_p50']:>8.3f} ms"
+        )
+        print(line + (f" {entry['first_token_s']:>9.3f}s {entry['total_s']:>7.3f}s" if timed else ""))
+    for k, entry in results["top_k"].items():
+        for query in entry["misses"]:
+            print(f"  top {k} missed a tool for: {query}")
+
+
+if __name__ == "__main__":
+    main()
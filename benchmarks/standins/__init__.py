@@ -0,0 +1 @@
+# Stand-in services for offline testing and benchmarking
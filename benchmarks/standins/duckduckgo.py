@@ -0,0 +1,101 @@
+"""
+Stand-in for the DuckDuckGo HTML endpoint, serving saved result pages.
+
+A POST to /html/ answers with fixtures/duckduckgo/<slug>.html, where slug is the
+query lowercased with non-alphanumeric runs replaced by '_', or default.html when
+there is no fixture for the query. GET /stats returns the number of searches served.
+
+Point the server at it with:
+
+    python benchmarks/standins/duckduckgo.py --port 3320
+    DUCKDUCKGO_URL=http://localhost:3320/html/ SEARCH_CACHE_PATH= python mcp_server/server.py
+"""
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from urllib.parse import parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "duckduckgo")
+
+
+def fixture_for(query: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "_", query.lower()).strip("_")
+    path = os.path.join(FIXTURES_DIR, f"{slug}.html")
+    return path if os.path.isfile(path) else os.path.join(FIXTURES_DIR, "default.html")
+
+
+class DuckDuckGoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    searches = 0
+    _lock = threading.Lock()
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        if self.path.rstrip("/") != "/html":
+            self._send(404, b"Not found", "text/plain")
+            return
+        with DuckDuckGoHandler._lock:
+            DuckDuckGoHandler.searches += 1
+        if self.latency:
+            time.sleep(self.latency)
+        with open(fixture_for(form.get("q", [""])[0]), "rb") as f:
+            self._send(200, f.read(), "text/html; charset=UTF-8")
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send(200, json.dumps({"searches": DuckDuckGoHandler.searches}).encode(), "application/json")
+        else:
+            self._send(404, b"Not found", "text/plain")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 3320, latency: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Start the stand-in in a background thread.
+
+    Args:
+        host (str): Host to bind.
+        port (int): Port to bind; 0 picks a free port.
+        latency (float): Seconds to wait before answering each search.
+
+    Returns:
+        ThreadingHTTPServer: The running server; call shutdown() to stop it.
+    """
+    handler = type("Handler", (DuckDuckGoHandler,), {"latency": latency})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DuckDuckGo HTML endpoint stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3320)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each answer")
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.latency)
+    print(f"DuckDuckGo stand-in on http://{args.host}:{server.server_port}/html/")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Stand-in for the Item Tracker API, keeping items in memory.
+
+Endpoints:
+    GET    /items/        list all items (with an ETag; answers 304 to a matching If-None-Match)
+    POST   /items/        create an item, answers 201 with the item and its new "id"
+    GET    /items/{id}    get one item
+    PATCH  /items/{id}    update fields of an item, answers with the item
+    DELETE /items/{id}    delete an item
+    GET    /stats         request counts per method
+
+Point the server at it with:
+
+    python benchmarks/standins/itemtracker.py --port 3310 --latency 0.05
+    ITEM_TRACKER_API=http://localhost:3310 python mcp_server/server_itemtracker.py
+"""
+import json
+import time
+import argparse
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+ITEM_FIELDS = ("name", "quantity", "replacement_date", "storage_name", "expiration_date")
+
+
+class ItemStore:
+    """Items in memory, with a version number bumped on every change (used as ETag)."""
+
+    def __init__(self, items: list = None):
+        self.items = {}
+        self.next_id = 1
+        self.version = 0
+        self.requests = Counter()
+        self.lock = threading.Lock()
+        for item in items or []:
+            self.create(item)
+
+    def create(self, fields: dict) -> dict:
+        with self.lock:
+            item = {"id": self.next_id, **{field: fields.get(field) for field in ITEM_FIELDS}}
+            self.items[item["id"]] = item
+            self.next_id += 1
+            self.version += 1
+            return item
+
+    def update(self, item_id: int, fields: dict) -> dict:
+        with self.lock:
+            item = self.items.get(item_id)
+            if item is None:
+                return None
+            item.update({field: value for field, value in fields.items() if field in ITEM_FIELDS})
+            self.version += 1
+            return item
+
+    def delete(self, item_id: int) -> bool:
+        with self.lock:
+            if self.items.pop(item_id, None) is None:
+                return False
+            self.version += 1
+            return True
+
+
+class ItemTrackerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    store: ItemStore = None
+    latency = 0.0
+
+    def _send(self, status: int, data=None, headers: dict = None):
+        body = b"" if data is None else json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _item_id(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "items" and parts[1].isdigit():
+            return int(parts[1])
+        return None
+
+    def _begin(self):
+        self.store.requests[self.command] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send(200, dict(self.store.requests))
+            return
+        self._begin()
+        if self.path.rstrip("/") == "/items":
+            etag = f'"{self.store.version}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, headers={"ETag": etag})
+                return
+            with self.store.lock:
+                items = list(self.store.items.values())
+            self._send(200, items, {"ETag": etag})
+            return
+        item = self.store.items.get(self._item_id())
+        self._send(200, item) if item else self._send(404, {"detail": "Item not found"})
+
+    def do_POST(self):
+        self._begin()
+        if self.path.rstrip("/") != "/items":
+            self._send(404, {"detail": "Not found"})
+            return
+        fields = self._body()
+        missing = [field for field in ("name", "quantity", "replacement_date") if fields.get(field) is None]
+        if missing:
+            self._send(422, {"detail": f"Missing fields: {', '.join(missing)}"})
+            return
+        self._send(201, self.store.create(fields))
+
+    def do_PATCH(self):
+        self._begin()
+        item = self.store.update(self._item_id(), self._body())
+        self._send(200, item) if item else self._send(404, {"detail": "Item not found"})
+
+    def do_DELETE(self):
+        self._begin()
+        if self.store.delete(self._item_id()):
+            self._send(200, {"ok": True})
+        else:
+            self._send(404, {"detail": "Item not found"})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def generated_items(count: int) -> list:
+    """Items with varied storages and dates, for starting the stand-in with data."""
+    return [
+        {
+            "name": f"Item {index}",
+            "quantity": 1 + index % 5,
+            "replacement_date": f"2025-{1 + index % 12:02d}-{1 + index % 28:02d}",
+            "storage_name": f"Storage {index % 10}",
+            "expiration_date": f"2026-{1 + index % 12:02d}-{1 + index % 28:02d}",
+        }
+        for index in range(count)
+    ]
+
+
+def serve(host: str = "127.0.0.1", port: int = 3310, latency: float = 0.0, items: list = None) -> ThreadingHTTPServer:
+    """
+    Start the stand-in in a background thread.
+
+    Args:
+        host (str): Host to bind.
+        port (int): Port to bind; 0 picks a free port.
+        latency (float): Seconds to wait before answering each item request.
+        items (list, optional): Items to start with.
+
+    Returns:
+        ThreadingHTTPServer: The running server; its handler's store holds the items.
+    """
+    handler = type("Handler", (ItemTrackerHandler,), {"store": ItemStore(items), "latency": latency})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Item Tracker API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3310)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each answer")
+    parser.add_argument("--items", type=int, default=0, help="Generated items to start with")
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.latency, generated_items(args.items))
+    print(f"Item Tracker stand-in on http://{args.host}:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
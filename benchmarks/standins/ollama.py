@@ -0,0 +1,147 @@
+"""
+Stand-in for the Ollama API, answering Item Tracker prompts with canned tool calls.
+
+Endpoints:
+    POST /api/chat        answers with a tool call JSON chosen from the last user message
+                          (streamed as NDJSON chunks when "stream" is true)
+    POST /api/generate    answers with an empty response (used to preload a model)
+    GET  /stats           request counts per endpoint
+
+The tool call depends on the first matching keyword of the prompt:
+
+    "remove"/"remov" + an id   {"remove_item": {"item_id": <id>}}
+    "edit" + an id             {"edit_item": {"item_id": <id>, "quantity": 2}}
+    anything else              {"add_item": {...}}
+
+Point the bridge at it with:
+
+    python benchmarks/standins/ollama.py --port 11435 --latency 0.5
+    OLLAMA_HOST=http://localhost:11435 python mcp_client/client_itemtracker_llm.py
+"""
+import re
+import json
+import time
+import argparse
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+_ITEM_ID = re.compile(r"\bid\s*(\d+)", re.IGNORECASE)
+
+
+def tool_call_for(prompt: str) -> dict:
+    lowered = prompt.lower()
+    match = _ITEM_ID.search(prompt)
+    item_id = int(match.group(1)) if match else 1
+    if "remov" in lowered:
+        return {"remove_item": {"item_id": item_id}}
+    if "edit" in lowered:
+        return {"edit_item": {"item_id": item_id, "quantity": 2}}
+    return {
+        "add_item": {
+            "name": "Canned Tuna",
+            "quantity": 1,
+            "replacement_date": "2025-06-25",
+            "storage_name": "Bunker 101",
+            "expiration_date": "2025-06-26",
+        }
+    }
+
+
+class OllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    requests = None
+    _lock = threading.Lock()
+
+    def _send_json(self, status: int, data: dict):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _chunk(self, data: dict):
+        line = json.dumps(data).encode("utf-8") + b"\n"
+        self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        with self._lock:
+            self.requests[self.path] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        base = {"model": request.get("model", ""), "created_at": datetime.now(timezone.utc).isoformat()}
+        if self.path == "/api/generate":
+            self._send_json(200, {**base, "response": "", "done": True, "done_reason": "load"})
+            return
+        if self.path != "/api/chat":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        prompt = next((m.get("content", "") for m in reversed(request.get("messages", [])) if m.get("role") == "user"), "")
+        content = json.dumps(tool_call_for(prompt))
+        if request.get("stream") is False:
+            self._send_json(200, {**base, "message": {"role": "assistant", "content": content}, "done": True, "done_reason": "stop"})
+            return
+
+        # Stream the answer in a few pieces, like tokens
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for start in range(0, len(content), 16):
+            self._chunk({**base, "message": {"role": "assistant", "content": content[start:start + 16]}, "done": False})
+        self._chunk({**base, "message": {"role": "assistant", "content": ""}, "done": True, "done_reason": "stop"})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, dict(self.requests))
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 11435, latency: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Start the stand-in in a background thread.
+
+    Args:
+        host (str): Host to bind.
+        port (int): Port to bind; 0 picks a free port.
+        latency (float): Seconds to wait before answering each request.
+
+    Returns:
+        ThreadingHTTPServer: The running server; call shutdown() to stop it.
+    """
+    handler = type("Handler", (OllamaHandler,), {"latency": latency, "requests": Counter()})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ollama API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each answer")
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.latency)
+    print(f"Ollama stand-in on http://{args.host}:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,9 @@ from dotenv import load_dotenv
 from mcp import ClientSession
 from mcp.client.sse import sse_client
 
+from tool_index import describe_tools, index_for
+from tool_plan import PLAN_FORMAT_PROMPT, TOOL_CONCURRENCY, normalize_plan, run_plan
+
 
 # Load environment variables
 load_dotenv()
@@ -94,13 +97,14 @@ async def process_query(query: str) -> str:
     
     system_prompt = (
         "You are a helpful assistant. "
-        "If you need to use a tool, reply ONLY with a JSON object like "
-        '{"<tool_name1>": "arguments": {...}, "<tool_name2>": "arguments": {...}, ...}. '
+        "If you need to use tools, " + PLAN_FORMAT_PROMPT +
         "Otherwise, answer normally."
         "\nAvailable tools:\n"
     )
-    for tool in tools:
-        system_prompt += f"- {tool['function']['name']}: {tool['function']['description']}\n"
+    # Only the tools relevant to the query, to keep the prompt short
+    selected = index_for(tools).select(query)
+    print(f"Tools in prompt: {len(selected)}/{len(tools)}")
+    system_prompt += describe_tools(selected)
     
     
     response = ollama.chat(
@@ -119,14 +123,13 @@ async def process_query(query: str) -> str:
     try:
         tools_json = json.loads(content_no_think)
         print("tools_json:", tools_json)
-    except (json.JSONDecodeError, TypeError):
+        calls = normalize_plan(tools_json)
+    except (json.JSONDecodeError, TypeError, ValueError):
         return response['message']['content']
 
-    tool_results = {}
-    for tool_name, arguments in tools_json.items():
-        response = await session.call_tool(tool_name, arguments=arguments)
-        tool_results.update({tool_name: response.content[0].text})
-        
+    # Independent calls run concurrently; each result or error stays with its call
+    tool_results = await run_plan(session, calls, TOOL_CONCURRENCY)
+
     print("tool_results:", tool_results)
 
     system_prompt = (
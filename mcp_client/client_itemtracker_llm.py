@@ -2,19 +2,24 @@ import os
 import re
 import json
 import time
-from contextlib import AsyncExitStack
+import asyncio
 from typing import Any, Dict, List
 
 import ollama
 from dotenv import load_dotenv
-from mcp import ClientSession
-from mcp.client.sse import sse_client
-
 import uvicorn
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
+from command_parser import FastPath
+from metrics import PROMETHEUS_CONTENT_TYPE, LatencyMetric, render_metrics
+from prompt_cache import PromptCache
+from session_pool import SessionPool, SessionPoolTimeout
+from tool_index import describe_tools, index_for
+from tool_plan import PLAN_FORMAT_PROMPT, TOOL_CONCURRENCY, ToolCallError, normalize_plan, run_plan
+
 # --- Configuration and Globals ---
 
 def load_config():
@@ -23,36 +28,84 @@ def load_config():
         "SERVER_IP": os.getenv("SERVER_IP", "localhost"),
         "SERVER_PORT": os.getenv("SERVER_PORT", "3312"),
         "MODEL": os.getenv("MODEL", "hf.co/unsloth/Phi-4-mini-instruct-GGUF:Q4_K_M"),
+        "OLLAMA_HOST": os.getenv("OLLAMA_HOST"),
+        # How long Ollama keeps the model loaded after a request (e.g. "30m", "-1" for always)
+        "KEEP_ALIVE": os.getenv("MODEL_KEEP_ALIVE", "30m"),
+        # Prompt cache: prompts kept (0 disables it), seconds each stays valid (0 for no expiry),
+        # minimum similarity (0-1) for a near-repeat to count as a hit (unset for exact repeats only)
+        # and JSON file it is saved to on shutdown and loaded from on startup (unset to keep it in memory)
+        "PROMPT_CACHE_SIZE": int(os.getenv("PROMPT_CACHE_SIZE", "1024")),
+        "PROMPT_CACHE_TTL": float(os.getenv("PROMPT_CACHE_TTL", "3600")) or None,
+        "PROMPT_CACHE_SIMILARITY": float(os.getenv("PROMPT_CACHE_SIMILARITY") or 0) or None,
+        "PROMPT_CACHE_PATH": os.getenv("PROMPT_CACHE_PATH") or None,
+        # MCP session pool: sessions, seconds a request waits for a free one, seconds between
+        # health checks of an idle session, seconds to wait for a tool call's answer, and
+        # longest wait in seconds between reconnection attempts, and the read-only tools, which
+        # are called again when their connection drops mid-call
+        "MCP_POOL_SIZE": int(os.getenv("MCP_POOL_SIZE", "4")),
+        "MCP_POOL_CHECKOUT_TIMEOUT": float(os.getenv("MCP_POOL_CHECKOUT_TIMEOUT", "10")),
+        "MCP_POOL_HEALTH_INTERVAL": float(os.getenv("MCP_POOL_HEALTH_INTERVAL", "15")),
+        "MCP_CALL_TIMEOUT": float(os.getenv("MCP_CALL_TIMEOUT", "150")),
+        "MCP_RECONNECT_BACKOFF_MAX": float(os.getenv("MCP_RECONNECT_BACKOFF_MAX", "30")),
+        "MCP_READ_ONLY_TOOLS": [tool for tool in os.getenv("MCP_READ_ONLY_TOOLS", "list_items,query_items,get_expiring_items").split(",") if tool],
+        # Batches: prompts interpreted by the LLM at once, and most prompts in one batch
+        "BATCH_CONCURRENCY": int(os.getenv("BATCH_CONCURRENCY", "4")),
+        "BATCH_MAX_PROMPTS": int(os.getenv("BATCH_MAX_PROMPTS", "500")),
+        # Fast path: answer simple add/edit/remove commands with the rule-based parser
+        # instead of the LLM (0 disables it), and the parse confidence (0-1) needed to do so
+        "FAST_PATH": os.getenv("FAST_PATH", "1") != "0",
+        "FAST_PATH_MIN_CONFIDENCE": float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.8")),
     }
 
 config = load_config()
-exit_stack = AsyncExitStack()
-session: ClientSession | None = None
+# Sessions to the MCP server, shared by the requests
+pool = SessionPool(
+    f"http://{config['SERVER_IP']}:{config['SERVER_PORT']}/sse",
+    size=config["MCP_POOL_SIZE"],
+    checkout_timeout=config["MCP_POOL_CHECKOUT_TIMEOUT"],
+    health_interval=config["MCP_POOL_HEALTH_INTERVAL"],
+    call_timeout=config["MCP_CALL_TIMEOUT"],
+    backoff_max=config["MCP_RECONNECT_BACKOFF_MAX"],
+    read_only_tools=config["MCP_READ_ONLY_TOOLS"],
+)
+# Async client, so a generation doesn't block the event loop for the other requests
+llm_client = ollama.AsyncClient(host=config["OLLAMA_HOST"])
+# Tool calls already generated for a prompt
+prompt_cache = PromptCache(
+    config["PROMPT_CACHE_SIZE"],
+    config["PROMPT_CACHE_TTL"],
+    config["PROMPT_CACHE_SIMILARITY"],
+    config["PROMPT_CACHE_PATH"],
+) if config["PROMPT_CACHE_SIZE"] > 0 else None
+# Rule-based parser answering simple commands without the LLM
+fast_path = FastPath(config["FAST_PATH_MIN_CONFIDENCE"]) if config["FAST_PATH"] else None
+
+# Latency of the LLM, of the MCP tool calls and of whole bridge requests, served at /metrics
+llm_metrics = LatencyMetric("bridge_llm", "LLM request", "model")
+tool_metrics = LatencyMetric("bridge_tool", "MCP tool call", "tool")
+request_metrics = LatencyMetric("bridge_request", "Bridge request", "endpoint")
 
 # --- MCP Server Connection ---
 
 async def connect_to_server():
     """
-    Connect to the MCP server and initialize the session.
+    Open the pool of sessions to the MCP server. If the server is not up yet, the
+    pool keeps trying in the background.
     """
-    global session, exit_stack
-    
-    sse_url = f"http://{config['SERVER_IP']}:{config['SERVER_PORT']}/sse"
-    read_stream, write_stream = await exit_stack.enter_async_context(sse_client(sse_url))
-    session = await exit_stack.enter_async_context(ClientSession(read_stream, write_stream))
-    await session.initialize()
-    tools_result = await session.list_tools()
-    
-    print("\nConnected to server with tools:")
-    for tool in tools_result.tools:
-        print(f"  - {tool.name}: {tool.description}")
+    if not await pool.start():
+        print(f"\nMCP server at {pool.url} not reachable yet, retrying in the background")
+        return
+    tools = await get_mcp_tools()
+
+    print(f"\nConnected to server ({pool.size} sessions) with tools:")
+    for tool in tools:
+        print(f"  - {tool['function']['name']}: {tool['function']['description']}")
 
 async def cleanup():
     """
-    Clean up resources by closing the async exit stack.
+    Clean up resources by closing the sessions.
     """
-    global exit_stack
-    await exit_stack.aclose()
+    await pool.close()
 
 # --- Tool Utilities ---
 
@@ -63,9 +116,8 @@ async def get_mcp_tools() -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: A list of tools, each represented as a dictionary with type, function name, description, and parameters.
     """
-    global session
-
-    tools_result = await session.list_tools()
+    async with pool.session() as session:
+        tools_result = await session.list_tools()
     return [
         {
             "type": "function",
@@ -78,46 +130,65 @@ async def get_mcp_tools() -> List[Dict[str, Any]]:
         for tool in tools_result.tools
     ]
 
-async def get_llm_tool_json(query: str, try_extract_json: bool = False) -> dict | str:
+async def preload_model():
     """
-    Query the LLM with the user query and available tools, and extract the tool call JSON from the LLM's response.
+    Load the model into memory ahead of the first request and keep it loaded for KEEP_ALIVE.
+    """
+    start_time = time.time()
+    try:
+        await llm_client.generate(model=config["MODEL"], prompt="", keep_alive=config["KEEP_ALIVE"])
+        print(f"Model {config['MODEL']} loaded in {time.time() - start_time:.2f} seconds")
+    except Exception as e:
+        # The bridge still works, the first request just pays the load time
+        print(f"Could not preload model {config['MODEL']}: {e}")
+
+async def get_llm_messages(query: str) -> List[Dict[str, str]]:
+    """
+    Build the chat messages asking the LLM for a tool plan for the user query.
 
     Args:
         query (str): The user's query.
-        try_extract_json (bool): If True, try to extract a JSON/dict from the response even if not valid JSON.
 
     Returns:
-        dict | str: The extracted JSON object if valid, otherwise the raw response string.
+        List[Dict[str, str]]: The system prompt listing the available tools, and the query.
     """
     tools = await get_mcp_tools()
     system_prompt = (
         "You are a helpful assistant that helps track items taking into account the user ask. "
-        "You need to use a tool. Don't use any formating. Reply ONLY with a JSON object like "
-        '{"<tool_name>": {"<argument0>": "<value0>",...} '
+        "You need to use a tool. Don't use any formating. " + PLAN_FORMAT_PROMPT +
         "\nAvailable tools:\n"
     )
-    for tool in tools:
-        system_prompt += f"- {tool['function']['name']}: {tool['function']['description']}\n"
-
-    response = ollama.chat(
-        model=config["MODEL"],
-        messages=[
-            {'role': 'system', 'content': system_prompt},
-            {'role': 'user', 'content': query},
-        ]
-    )
-    print("Response from model:", response['message']['content'])
+    # Only the tools relevant to the query, to keep the prompt short
+    selected = index_for(tools).select(query)
+    print(f"Tools in prompt: {len(selected)}/{len(tools)}")
+    system_prompt += describe_tools(selected)
 
+    return [
+        {'role': 'system', 'content': system_prompt},
+        {'role': 'user', 'content': query},
+    ]
+
+def parse_tool_json(content: str, try_extract_json: bool = False) -> list | dict | str:
+    """
+    Extract the tool call JSON from the LLM's response.
+
+    Args:
+        content (str): The LLM's response.
+        try_extract_json (bool): If True, try to extract a JSON array/object from the response even if not valid JSON.
+
+    Returns:
+        list | dict | str: The extracted tool plan if valid JSON, otherwise the raw response string.
+    """
     try:
-        tools_json = json.loads(response['message']['content'])
+        tools_json = json.loads(content)
         print("tools_json:", tools_json)
         return tools_json
     except (json.JSONDecodeError, TypeError):
         if try_extract_json:
             # If JSON extraction is requested and the response is not valid JSON,
             # try to extract a JSON-like string from the response
-            # match from the first "{" to the last "}"
-            match = re.search(r'(\{.*\})', response['message']['content'], re.DOTALL)
+            # match from the first "[" to the last "]", or the first "{" to the last "}"
+            match = re.search(r'(\[.*\]|\{.*\})', content, re.DOTALL)
             if match:
                 json_str = match.group(1)
                 try:
@@ -125,26 +196,93 @@ async def get_llm_tool_json(query: str, try_extract_json: bool = False) -> dict
                     print("tools_json (extracted):", tools_json)
                     return tools_json
                 except Exception:
-                    return response['message']['content']
-        return response['message']['content']
+                    return content
+        return content
+
+def fast_tool_json(query: str) -> list | None:
+    """The tool plan of a simple command from the rule-based parser, or None if the LLM is needed."""
+    if fast_path is None:
+        return None
+    tool_call = fast_path.parse(query)
+    if tool_call is not None:
+        print("Tool call from fast path:", tool_call)
+    return tool_call
+
+async def get_llm_tool_json(query: str, try_extract_json: bool = False) -> list | dict | str:
+    """
+    Query the LLM with the user query and available tools, and extract the tool call JSON from the LLM's response.
+    Simple commands are answered by the rule-based fast path without querying the LLM.
 
+    Args:
+        query (str): The user's query.
+        try_extract_json (bool): If True, try to extract a JSON array/object from the response even if not valid JSON.
 
-async def call_tools_with_json(tools_json: dict) -> dict:
+    Returns:
+        list | dict | str: The extracted tool plan if valid JSON, otherwise the raw response string.
     """
-    Call the MCP tools specified in the JSON and return their results.
+    tool_call = fast_tool_json(query)
+    if tool_call is not None:
+        return tool_call
+    messages = await get_llm_messages(query)
+
+    with llm_metrics.time(config["MODEL"]):
+        response = await llm_client.chat(model=config["MODEL"], messages=messages, keep_alive=config["KEEP_ALIVE"])
+    print("Response from model:", response['message']['content'])
+
+    return parse_tool_json(response['message']['content'], try_extract_json)
+
+async def stream_llm_tool_json(query: str, try_extract_json: bool = False):
+    """
+    Query the LLM like get_llm_tool_json, yielding its response as it is generated.
+    A command answered by the fast path only yields its ("tool_call", <tool plan>).
 
     Args:
-        tools_json (dict): A dictionary mapping tool names to their arguments.
+        query (str): The user's query.
+        try_extract_json (bool): If True, try to extract a JSON array/object from the response even if not valid JSON.
+
+    Yields:
+        tuple: ("token", <text>) for each piece of the response, then ("tool_call", <tool plan>)
+            with the result of parse_tool_json on the whole response.
+    """
+    tool_call = fast_tool_json(query)
+    if tool_call is not None:
+        yield "tool_call", tool_call
+        return
+    messages = await get_llm_messages(query)
+
+    content = ""
+    with llm_metrics.time(config["MODEL"]):
+        stream = await llm_client.chat(model=config["MODEL"], messages=messages, keep_alive=config["KEEP_ALIVE"], stream=True)
+        async for chunk in stream:
+            token = chunk['message']['content']
+            if token:
+                content += token
+                yield "token", token
+    print("Response from model:", content)
+
+    yield "tool_call", parse_tool_json(content, try_extract_json)
+
+async def call_tools_with_json(tools_json: list | dict) -> list | dict:
+    """
+    Call the MCP tools of a tool plan concurrently and return their results.
+
+    Args:
+        tools_json (list | dict): A list of {"tool", "arguments"} calls (the same tool
+            may appear several times), or a dictionary mapping tool names to their arguments.
 
     Returns:
-        dict: A dictionary mapping tool names to their call results.
+        list | dict: For a list, one entry per call in order, with "ok" and either
+            "result" or "error". For a dictionary, a dictionary mapping tool names
+            to their call results (or error messages).
     """
-    tool_results = {}
-    for tool_name, arguments in tools_json.items():
-        response = await session.call_tool(tool_name, arguments=arguments)
-        tool_results[tool_name] = response.content[0].text
-    print("tool_results:", tool_results)
-    return tool_results
+    calls = normalize_plan(tools_json)
+    # One session per request: concurrent requests spread over the pool's connections
+    async with pool.session() as session:
+        results = await run_plan(session, calls, TOOL_CONCURRENCY, timer=tool_metrics.time)
+    if isinstance(tools_json, dict) and not isinstance(tools_json.get("calls"), list) and "tool" not in tools_json:
+        results = {result["tool"]: result["result"] if result["ok"] else result["error"] for result in results}
+    print("tool_results:", results)
+    return results
 
 # --- FastAPI App ---
 
@@ -161,16 +299,52 @@ app.add_middleware(
 
 class PromptRequest(BaseModel):
     prompt: str
+    # Generate a fresh tool call even if the prompt is cached (the cache is then refreshed)
+    bypass_cache: bool = False
 
 class ToolCallRequest(BaseModel):
-    tool_call: dict
+    tool_call: list | dict
+
+class BatchRequest(BaseModel):
+    prompts: List[str]
+    # Also run the tool calls of each prompt, as soon as it is interpreted
+    execute: bool = False
+    # Prompts interpreted at once, at most BATCH_CONCURRENCY
+    max_concurrency: int | None = None
+    bypass_cache: bool = False
+
+def cached_tool_call(prompt: str, bypass_cache: bool = False) -> tuple:
+    """
+    The cached tool call for a prompt.
+
+    Returns:
+        tuple: (tool_call, match) as from PromptCache.get, or (None, None) when not cached.
+    """
+    if prompt_cache is None or bypass_cache:
+        return None, None
+    return prompt_cache.get(prompt)
+
+def remember_tool_call(prompt: str, tool_call):
+    """Cache the tool call generated for a prompt, if it is a valid tool plan."""
+    if prompt_cache is None or not isinstance(tool_call, (list, dict)):
+        return
+    try:
+        normalize_plan(tool_call)
+    except ValueError:
+        return
+    prompt_cache.put(prompt, tool_call)
 
 @app.on_event("startup")
 async def startup_event():
     await connect_to_server()
+    if prompt_cache is not None and prompt_cache.path:
+        print(f"Loaded {prompt_cache.load(config['MODEL'])} cached prompts from {prompt_cache.path}")
+    await preload_model()
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    if prompt_cache is not None:
+        prompt_cache.save(config["MODEL"])
     await cleanup()
 
 @app.post("/get_toolcall")
@@ -178,23 +352,177 @@ async def get_toolcall(request: PromptRequest):
     start_time = time.time()
     print(f"MODEL being used: {config['MODEL']}")
     try:
-        result = await get_llm_tool_json(query=request.prompt, try_extract_json=True)
+        with request_metrics.time("get_toolcall"):
+            cached, match = cached_tool_call(request.prompt, request.bypass_cache)
+            if cached is not None:
+                print(f"Elapsed time for get_toolcall (cached): {time.time() - start_time:.4f} seconds")
+                return {"tool_call": cached, "cached": True, "cache_match": match}
+            result = await get_llm_tool_json(query=request.prompt, try_extract_json=True)
+            remember_tool_call(request.prompt, result)
         elapsed = time.time() - start_time
         print(f"Elapsed time for get_toolcall: {elapsed:.2f} seconds")
-        return {"tool_call": result}
+        return {"tool_call": result, "cached": False}
+    except SessionPoolTimeout as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception:
         elapsed = time.time() - start_time
         print(f"Elapsed time for get_toolcall (error): {elapsed:.2f} seconds")
         raise HTTPException(status_code=400, detail="Prompt could not be understood as a tool call.")
 
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/get_toolcall/stream")
+async def get_toolcall_stream(request: PromptRequest):
+    """
+    Like /get_toolcall, as Server-Sent Events: a "token" event per piece of the LLM's
+    response ({"content": ...}), then a "tool_call" event ({"tool_call": ..., "cached": ...}),
+    or an "error" event ({"detail": ...}) if the response is not a tool call. A cached
+    prompt gets the "tool_call" event right away.
+    """
+    async def events():
+        start_time = time.time()
+        try:
+            with request_metrics.time("get_toolcall_stream"):
+                cached, match = cached_tool_call(request.prompt, request.bypass_cache)
+                if cached is not None:
+                    yield sse_event("tool_call", {"tool_call": cached, "cached": True, "cache_match": match})
+                    return
+                async for kind, value in stream_llm_tool_json(query=request.prompt, try_extract_json=True):
+                    if kind == "token":
+                        yield sse_event("token", {"content": value})
+                    elif isinstance(value, (list, dict)):
+                        remember_tool_call(request.prompt, value)
+                        yield sse_event("tool_call", {"tool_call": value, "cached": False})
+                    else:
+                        yield sse_event("error", {"detail": "Prompt could not be understood as a tool call."})
+        except Exception:
+            yield sse_event("error", {"detail": "Prompt could not be understood as a tool call."})
+        print(f"Elapsed time for get_toolcall_stream: {time.time() - start_time:.2f} seconds")
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @app.post("/execute_toolcall")
 async def execute_toolcall(request: ToolCallRequest):
     try:
-        tools_result = await call_tools_with_json(tools_json=request.tool_call)
+        with request_metrics.time("execute_toolcall"):
+            tools_result = await call_tools_with_json(tools_json=request.tool_call)
         return {"tools_result": tools_result}
+    except SessionPoolTimeout as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception:
         raise HTTPException(status_code=500, detail="Internal Server error")
 
+def elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+async def run_batch_item(index: int, prompt: str, request: BatchRequest, interpret_slots: asyncio.Semaphore,
+                         execute_slots: asyncio.Semaphore) -> dict:
+    """
+    Interpret one prompt of a batch and, if requested, run its tool calls.
+
+    Returns:
+        dict: "index", "prompt", "ok", "cached" (and "cache_match"), "tool_call", "tools_result" (when executed),
+            "error" (when failed) and "timing" with interpret_ms, execute_ms and total_ms.
+    """
+    item = {"index": index, "prompt": prompt}
+    timing = {}
+    start = time.perf_counter()
+    try:
+        async with interpret_slots:
+            stage_start = time.perf_counter()
+            tool_call, match = cached_tool_call(prompt, request.bypass_cache)
+            item["cached"] = tool_call is not None
+            if match:
+                item["cache_match"] = match
+            if tool_call is None:
+                tool_call = await get_llm_tool_json(query=prompt, try_extract_json=True)
+                remember_tool_call(prompt, tool_call)
+            timing["interpret_ms"] = elapsed_ms(stage_start)
+        if not isinstance(tool_call, (list, dict)):
+            raise ValueError("Prompt could not be understood as a tool call.")
+        item["tool_call"] = tool_call
+        if request.execute:
+            calls = normalize_plan(tool_call)
+            async with execute_slots:
+                stage_start = time.perf_counter()
+                async with pool.session() as session:
+                    results = await run_plan(session, calls, TOOL_CONCURRENCY, timer=tool_metrics.time)
+                timing["execute_ms"] = elapsed_ms(stage_start)
+            item["tools_result"] = results
+            failed = sum(1 for result in results if not result["ok"])
+            if failed:
+                raise ToolCallError(f"{failed} of {len(results)} tool calls failed")
+        item["ok"] = True
+    except (ValueError, ToolCallError, SessionPoolTimeout) as e:
+        item["ok"] = False
+        item["error"] = str(e)
+    except Exception as e:
+        item["ok"] = False
+        item["error"] = f"{type(e).__name__}: {e}"
+    timing["total_ms"] = elapsed_ms(start)
+    item["timing"] = timing
+    return item
+
+@app.post("/batch_toolcall")
+async def batch_toolcall(request: BatchRequest):
+    """
+    Interpret many prompts (and optionally run their tool calls) in one request.
+
+    Up to BATCH_CONCURRENCY prompts are interpreted at once, and each prompt's tool
+    calls start as soon as it is interpreted, on at most MCP_POOL_SIZE sessions, so the
+    two stages overlap. Blank prompts are skipped. Answers with newline-delimited JSON:
+    one line per prompt as it finishes (see run_batch_item), in completion order, then
+    a {"summary": {...}} line.
+    """
+    items = [(index, prompt.strip()) for index, prompt in enumerate(request.prompts) if prompt.strip()]
+    if not items:
+        raise HTTPException(status_code=422, detail="The batch has no prompts.")
+    if len(items) > config["BATCH_MAX_PROMPTS"]:
+        raise HTTPException(status_code=413, detail=f"A batch can have at most {config['BATCH_MAX_PROMPTS']} prompts.")
+    concurrency = min(request.max_concurrency or config["BATCH_CONCURRENCY"], config["BATCH_CONCURRENCY"])
+    interpret_slots = asyncio.Semaphore(max(1, concurrency))
+    execute_slots = asyncio.Semaphore(pool.size)
+
+    async def results():
+        start = time.perf_counter()
+        finished = asyncio.Queue()
+        tasks = [asyncio.ensure_future(run_batch_item(index, prompt, request, interpret_slots, execute_slots)) for index, prompt in items]
+        for task in tasks:
+            task.add_done_callback(finished.put_nowait)
+        succeeded = cached = 0
+        try:
+            with request_metrics.time("batch_toolcall"):
+                for _ in tasks:
+                    item = (await finished.get()).result()
+                    succeeded += item["ok"]
+                    cached += item.get("cached", False)
+                    yield json.dumps(item) + "\n"
+        finally:
+            # The client went away: stop the remaining prompts
+            for task in tasks:
+                task.cancel()
+        summary = {
+            "prompts": len(items),
+            "skipped": len(request.prompts) - len(items),
+            "ok": succeeded,
+            "failed": len(items) - succeeded,
+            "cached": cached,
+            "executed": request.execute,
+            "total_ms": elapsed_ms(start),
+        }
+        print(f"Batch of {len(items)} prompts: {succeeded} ok in {summary['total_ms'] / 1000:.2f} seconds")
+        yield json.dumps({"summary": summary}) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(
+        render_metrics(llm_metrics, tool_metrics, request_metrics, pool, *[part for part in (prompt_cache, fast_path) if part is not None]),
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
+
 # --- Main Entrypoint for Standalone Usage ---
 
 async def main():
@@ -211,7 +539,7 @@ async def main():
     
     tools_json = await get_llm_tool_json(query)
     
-    if not isinstance(tools_json, dict):
+    if not isinstance(tools_json, (list, dict)):
         return tools_json  # Return raw response if not valid JSON
     
     response = await call_tools_with_json(tools_json)
@@ -0,0 +1,359 @@
+import re
+import unicodedata
+from collections import Counter
+from datetime import date
+
+# English and Portuguese month names and abbreviations, without accents
+MONTHS = {
+    "january": 1, "jan": 1, "janeiro": 1,
+    "february": 2, "feb": 2, "fevereiro": 2, "fev": 2,
+    "march": 3, "mar": 3, "marco": 3,
+    "april": 4, "apr": 4, "abril": 4, "abr": 4,
+    "may": 5, "maio": 5, "mai": 5,
+    "june": 6, "jun": 6, "junho": 6,
+    "july": 7, "jul": 7, "julho": 7,
+    "august": 8, "aug": 8, "agosto": 8, "ago": 8,
+    "september": 9, "sept": 9, "sep": 9, "setembro": 9, "set": 9,
+    "october": 10, "oct": 10, "outubro": 10, "out": 10,
+    "november": 11, "nov": 11, "novembro": 11,
+    "december": 12, "dec": 12, "dezembro": 12, "dez": 12,
+}
+
+# Command verbs, without accents, by intent
+VERBS = {
+    "add": (
+        "add", "insert", "put", "store", "register",
+        "adiciona", "adicionar", "adicione", "acrescenta", "acrescentar", "acrescente",
+        "insere", "inserir", "insira", "coloca", "colocar", "coloque", "guarda", "guardar", "guarde",
+        "regista", "registar", "registe", "registra", "registrar",
+    ),
+    "edit": (
+        "edit", "update", "change", "modify", "set",
+        "edita", "editar", "edite", "altera", "alterar", "altere", "atualiza", "atualizar", "atualize",
+        "actualiza", "actualizar", "actualize", "muda", "mudar", "mude", "modifica", "modificar", "modifique",
+    ),
+    "remove": (
+        "remove", "delete", "erase", "discard",
+        "remover", "remova", "apaga", "apagar", "apague", "elimina", "eliminar", "elimine",
+        "exclui", "excluir", "exclua", "retira", "retirar", "retire", "tira", "tirar", "tire",
+    ),
+}
+_INTENTS = {verb: intent for intent, verbs in VERBS.items() for verb in verbs}
+
+_ALL_VERBS = "|".join(sorted(_INTENTS, key=len, reverse=True))
+_MONTH = "|".join(sorted(MONTHS, key=len, reverse=True)).replace("marco", "mar[cç]o")
+_CONNECTORS = r"(?:\s+(?:e|and|com|with|a|em|on|at|in|no|na|to|para|,))*"
+
+_LEADING = re.compile(r"^\s*(?:please|por\s+favor|can\s+you|could\s+you|podes|pode)?[\s,]*(?P<verb>\w+)\b", re.IGNORECASE)
+_COMPOUND = re.compile(rf"(?:\b(?:and|e|then|depois|also|tamb[eé]m)\b|[,;])\s*(?:(?:please|por\s+favor)\s+)?\b(?:{_ALL_VERBS})\b", re.IGNORECASE)
+_ITEM_IDS = re.compile(
+    r"\b(?:ids?|n[uú]meros?|n\.?\s*[ºo]|#|items?|itens|artigos?)\s*[:=#]?\s*(?P<ids>\d+(?:\s*(?:,\s*(?:and|e)?|and|e|&)\s*\d+)*)\b",
+    re.IGNORECASE,
+)
+_DATES = (
+    ("iso", re.compile(r"\b(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})\b")),
+    ("numeric", re.compile(r"\b(?P<day>\d{1,2})[/.](?P<month>\d{1,2})[/.](?P<year>\d{4})\b")),
+    ("day_month", re.compile(
+        rf"\b(?P<day>\d{{1,2}})(?:st|nd|rd|th|º)?\s+(?:de\s+|of\s+)?(?P<month>{_MONTH})\.?,?\s+(?:de\s+)?(?P<year>\d{{4}})\b",
+        re.IGNORECASE,
+    )),
+    ("month_day", re.compile(
+        rf"\b(?P<month>{_MONTH})\.?\s+(?P<day>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<year>\d{{4}})\b",
+        re.IGNORECASE,
+    )),
+)
+_ROLES = (
+    ("replacement_date", re.compile(
+        r"\b(?:replacement(?:\s+date)?|replace(?:\s+(?:it|by|on|at))?|data\s+de\s+substitui[cç][aã]o|substitui[cç][aã]o|substituir|trocar)\b",
+        re.IGNORECASE,
+    )),
+    ("expiration_date", re.compile(
+        r"\b(?:expiration(?:\s+date)?|expiry(?:\s+date)?|expires?|expiring|best\s+before|use\s+by|"
+        r"data\s+de\s+validade|validade|data\s+de\s+expira[cç][aã]o|expira|vence)\b",
+        re.IGNORECASE,
+    )),
+)
+_STORAGE = re.compile(
+    r"(?:\b(?:into|in|to|at|from|no|na|ao|em|do|da|para\s+o|para\s+a)\s+(?:the\s+|o\s+|a\s+)?)?"
+    r"\b(?:storage(?:\s+location)?|location|armaz\w*|local(?:iza[cç][aã]o)?|dep[oó]sito)\b"
+    r"(?:\s+(?:named|called|chamad[oa]|de\s+nome|to|para))?\s*[:=]?\s*(?P<value>.*)",
+    re.IGNORECASE,
+)
+_QUANTITY = re.compile(r"\b(?:quantity|quantidade|qty|qtd)\.?\s*(?:of|de|to|para|=|:)?\s*(?P<value>\d+)\b", re.IGNORECASE)
+_LEADING_QUANTITY = re.compile(r"^\s*(?P<value>\d+)\s*(?:x\s+|units?\s+of\s+|unidades?\s+de\s+)?", re.IGNORECASE)
+_NAME = re.compile(r"\b(?:name|nome)\s*(?:to|para|=|:)\s*(?P<value>.*)", re.IGNORECASE)
+_NAME_END = re.compile(r"\b(?:with|com|quantity|quantidade|qty|qtd)\b", re.IGNORECASE)
+_TRAILING = re.compile(rf"{_CONNECTORS}\s*$", re.IGNORECASE)
+_LEADING_ARTICLE = re.compile(r"^(?:(?:the|a|an|o|os|as|um|uma|item|itens|items)\s+)+", re.IGNORECASE)
+# Where a name or storage name ends: another clause ("Fridge, not the pantry"), or a second thing ("milk and eggs")
+_CLAUSE = re.compile(r"\b(?:and|e|or|ou|but|mas|not|n[aã]o|unless|except|exceto|if|se|because|porque|plus|mais|then|depois)\b|[,;&+]", re.IGNORECASE)
+
+# Words, without accents, that may be left over around the recognized parts of a command
+FILLER_WORDS = frozenset(
+    "the a an with of to in into on at and its it item items named called please now by "
+    "o os as um uma com de do da dos das no na nos nas em ao aos para e itens artigo artigos por favor chamado chamada "
+    "data date".split()
+)
+
+
+def _fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def _clean(value: str) -> str:
+    value = _TRAILING.sub("", value.strip(" .,;:!?\"'"))
+    return value.strip(" .,;:!?\"'")
+
+
+def find_dates(text: str) -> list:
+    """
+    Find the dates written in a text, in English or Portuguese.
+
+    Understands 2025-06-25, 25/06/2025, 25.06.2025, "25 de Junho de 2025", "25th June 2025",
+    "25 Jun 2025" and "June 25, 2025". Numeric dates are read day first, and dates without
+    a year are not recognized.
+
+    Returns:
+        list: (start, end, "YYYY-MM-DD") of every valid date, in order.
+    """
+    found = []
+    for kind, pattern in _DATES:
+        for match in pattern.finditer(text):
+            month = match.group("month")
+            month = int(month) if month.isdigit() else MONTHS[_fold(month)]
+            try:
+                value = date(int(match.group("year")), month, int(match.group("day")))
+            except ValueError:
+                continue
+            found.append((match.start(), match.end(), value.isoformat()))
+    found.sort()
+    dates = []
+    for start, end, value in found:
+        if not dates or start >= dates[-1][1]:
+            dates.append((start, end, value))
+    return dates
+
+
+def _assign_dates(text: str, dates: list) -> tuple:
+    # Each date belongs to the closest role keyword before it ("validade", "replacement date"...)
+    keywords = sorted((match.start(), match.end(), role) for role, pattern in _ROLES for match in pattern.finditer(text))
+    assigned, unassigned = {}, 0
+    previous_end = 0
+    for start, end, value in dates:
+        roles = [role for keyword_start, keyword_end, role in keywords if previous_end <= keyword_start and keyword_end <= start]
+        if roles and roles[-1] not in assigned:
+            assigned[roles[-1]] = value
+        else:
+            unassigned += 1
+        previous_end = end
+    # A role keyword with no date after it (e.g. "expires next friday") is left to the LLM
+    dangling = any(
+        not any(keyword_end <= start for start, _, _ in dates) or role not in assigned
+        for _, keyword_end, role in keywords
+    )
+    return assigned, unassigned, dangling
+
+
+def _value_end(text: str, value_start: int, dates: list, stops: tuple) -> int:
+    # A free-text value runs to the next date or role keyword, or the first match of a stop pattern
+    end = len(text)
+    for start, _, _ in dates:
+        if start >= value_start:
+            end = min(end, start)
+    for pattern in [pattern for _, pattern in _ROLES] + list(stops):
+        found = pattern.search(text, value_start)
+        if found:
+            end = min(end, found.start())
+    return end
+
+
+def _storage(text: str, dates: list) -> tuple:
+    # The storage name runs to the next date, role keyword, comma or clause
+    match = _STORAGE.search(text)
+    if not match:
+        return None, None
+    end = _value_end(text, match.start("value"), dates, (_CLAUSE,))
+    value = _clean(text[match.start("value"):end])
+    # "data de ..." left over from a role keyword
+    value = re.sub(r"\s+(?:e\s+)?(?:data|date)(?:\s+de)?$", "", value, flags=re.IGNORECASE)
+    return value or None, (match.start(), end)
+
+
+def _unparsed(text: str, spans: list) -> list:
+    """The words of text outside the recognized spans, other than filler words."""
+    chars = list(text)
+    for start, end in spans:
+        chars[start:end] = " " * (end - start)
+    words = re.findall(r"\w+", "".join(chars))
+    return [word for word in words if _fold(word) not in FILLER_WORDS]
+
+
+def parse_command(prompt: str) -> tuple:
+    """
+    Parse a simple add/edit/remove Item Tracker command in English or Portuguese.
+
+    Every word of the prompt must belong to a recognized part (verb, ids, quantity, name,
+    storage, dates and their keywords) or be a filler word; anything else, such as a
+    range ("items 1 to 5"), a second item or a condition ("unless..."), leaves the
+    prompt to the LLM.
+
+    Examples:
+        "Remove item com id 21"
+        "Remove the items with ids 3, 4 and 9"
+        "Edita item com id 21 para data de validade a 26 de Junho de 2025"
+        "Add Canned Tuna with replacement date 25th June 2025 into storage named Bunker 101"
+        "Adiciona Pao com data de substituição a 25 de Junho de 2025 no armazenamento: mochila do Joao"
+
+    Args:
+        prompt (str): The user's prompt.
+
+    Returns:
+        tuple: (tool_call, confidence, reason). tool_call is a tool plan like the LLM's
+            ([{"tool": ..., "arguments": {...}}]) or None; confidence is between 0 and 1;
+            reason names the intent, or why the prompt was not understood.
+    """
+    text = " ".join(prompt.split())
+    leading = _LEADING.match(text)
+    intent = _INTENTS.get(_fold(leading.group("verb"))) if leading else None
+    if intent is None:
+        return None, 0.0, "no_command"
+    rest = text[leading.end():]
+    if _COMPOUND.search(rest):
+        return None, 0.0, "several_commands"
+    spans = []
+
+    if intent in ("remove", "edit"):
+        ids = _ITEM_IDS.search(rest)
+        if not ids:
+            return None, 0.0, "no_item_id"
+        item_ids = [int(item_id) for item_id in re.findall(r"\d+", ids.group("ids"))]
+        spans.append(ids.span())
+
+    if intent == "remove":
+        if _unparsed(rest, spans):
+            return None, 0.0, "unparsed_text"
+        if len(item_ids) == 1:
+            return [{"tool": "remove_item", "arguments": {"item_id": item_ids[0]}}], 1.0, "remove"
+        return [{"tool": "remove_items", "arguments": {"item_ids": item_ids}}], 1.0, "remove"
+
+    dates = find_dates(rest)
+    assigned, unassigned, dangling = _assign_dates(rest, dates)
+    if unassigned or dangling:
+        return None, 0.0, "unclear_dates"
+    spans += [(start, end) for start, end, _ in dates]
+    spans += [match.span() for _, pattern in _ROLES for match in pattern.finditer(rest)]
+    storage_name, storage_span = _storage(rest, dates)
+    if storage_span:
+        spans.append(storage_span)
+    quantity = _QUANTITY.search(rest)
+    if quantity:
+        spans.append(quantity.span())
+
+    if intent == "edit":
+        if len(item_ids) != 1:
+            return None, 0.0, "several_items"
+        arguments = {"item_id": item_ids[0], **assigned}
+        if quantity:
+            arguments["quantity"] = int(quantity.group("value"))
+        name = _NAME.search(rest)
+        if name:
+            end = _value_end(rest, name.start("value"), dates, (_NAME_END, _CLAUSE))
+            if storage_span and storage_span[0] > name.start("value"):
+                end = min(end, storage_span[0])
+            arguments["name"] = _clean(rest[name.start("value"):end])
+            if not arguments["name"]:
+                return None, 0.0, "no_name"
+            spans.append((name.start(), end))
+        if storage_name:
+            arguments["storage_name"] = storage_name
+        if len(arguments) == 1:
+            return None, 0.0, "no_changes"
+        if _unparsed(rest, spans):
+            return None, 0.0, "unparsed_text"
+        return [{"tool": "edit_item", "arguments": arguments}], 1.0, "edit"
+
+    # add: the name runs from the verb to the first date, role keyword, storage or "with"
+    end = min([storage_span[0] if storage_span else len(rest)] + [start for start, _, _ in dates])
+    for _, pattern in _ROLES:
+        keyword = pattern.search(rest)
+        if keyword:
+            end = min(end, keyword.start())
+    head = _NAME_END.split(rest[:end])[0]
+    spans.append((0, len(head)))
+    leading_quantity = _LEADING_QUANTITY.match(_LEADING_ARTICLE.sub("", head.strip()))
+    if quantity:
+        quantity = int(quantity.group("value"))
+    elif leading_quantity:
+        quantity = int(leading_quantity.group("value"))
+    else:
+        # "Add Canned Tuna ..." adds one
+        quantity = 1
+    name = _LEADING_ARTICLE.sub("", head.strip())
+    if leading_quantity:
+        name = name[leading_quantity.end():]
+    name = _clean(name)
+    if not name or len(name.split()) > 6:
+        return None, 0.0, "no_name"
+    if _CLAUSE.search(name):
+        return None, 0.0, "several_items"
+    if "replacement_date" not in assigned:
+        return None, 0.0, "no_replacement_date"
+    if _unparsed(rest, spans):
+        return None, 0.0, "unparsed_text"
+    arguments = {"name": name, "quantity": quantity, "replacement_date": assigned["replacement_date"]}
+    if storage_name:
+        arguments["storage_name"] = storage_name
+    if "expiration_date" in assigned:
+        arguments["expiration_date"] = assigned["expiration_date"]
+    return [{"tool": "add_item", "arguments": arguments}], 1.0, "add"
+
+
+class FastPath:
+    """
+    Answers simple commands with parse_command instead of the LLM, counting how often.
+
+    Args:
+        min_confidence (float): Lowest parse confidence answered without the LLM.
+    """
+
+    def __init__(self, min_confidence: float = 0.8):
+        self.min_confidence = min_confidence
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def parse(self, prompt: str) -> list | None:
+        """The tool plan for the prompt, or None when it should go to the LLM."""
+        tool_call, confidence, reason = parse_command(prompt)
+        if tool_call is not None and confidence >= self.min_confidence:
+            self.hits[reason] += 1
+            return tool_call
+        self.misses["low_confidence" if tool_call is not None else reason] += 1
+        return None
+
+    def stats(self) -> dict:
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return {
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        }
+
+    def render(self) -> list:
+        """The fast path counters in the Prometheus text format, for metrics.render_metrics."""
+        lines = [
+            "# HELP bridge_fast_path_hits_total Prompts answered by the rule-based parser, by intent.",
+            "# TYPE bridge_fast_path_hits_total counter",
+        ]
+        lines += [f'bridge_fast_path_hits_total{{intent="{intent}"}} {count}' for intent, count in sorted(self.hits.items())]
+        lines += [
+            "# HELP bridge_fast_path_misses_total Prompts left to the LLM by the rule-based parser, by reason.",
+            "# TYPE bridge_fast_path_misses_total counter",
+        ]
+        lines += [f'bridge_fast_path_misses_total{{reason="{reason}"}} {count}' for reason, count in sorted(self.misses.items())]
+        lines += [
+            "# HELP bridge_fast_path_hit_rate Share of prompts answered by the rule-based parser.",
+            "# TYPE bridge_fast_path_hit_rate gauge",
+            f"bridge_fast_path_hit_rate {self.stats()['hit_rate']}",
+        ]
+        return lines
@@ -0,0 +1,118 @@
+import time
+import bisect
+from collections import Counter
+from contextlib import contextmanager
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; quantiles are estimated from the buckets."""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+class LatencyMetric:
+    """
+    Latency histogram, error counter and in-flight gauge per label value.
+
+    Args:
+        name (str): Metric name prefix, e.g. "bridge_llm".
+        help_text (str): What is being timed.
+        label (str): Label name, e.g. "model" or "tool".
+    """
+
+    def __init__(self, name: str, help_text: str, label: str):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.histograms = {}
+        self.errors = Counter()
+        self.in_flight = Counter()
+
+    @contextmanager
+    def time(self, value: str):
+        """Time the enclosed block; an exception counts as an error."""
+        histogram = self.histograms.setdefault(value, Histogram())
+        self.in_flight[value] += 1
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors[value] += 1
+            raise
+        finally:
+            self.in_flight[value] -= 1
+            histogram.observe(time.perf_counter() - start)
+
+    def render(self) -> list:
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def labels(value, **extra):
+            pairs = {self.label: value, **extra}
+            return "{" + ",".join(f'{key}="{_escape(item)}"' for key, item in pairs.items()) + "}"
+
+        family(f"{self.name}_duration_seconds", "histogram", f"{self.help_text} latency.")
+        for value, histogram in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                cumulative += count
+                lines.append(f"{self.name}_duration_seconds_bucket{labels(value, le=bound)} {cumulative}")
+            lines.append(f"{self.name}_duration_seconds_sum{labels(value)} {histogram.sum}")
+            lines.append(f"{self.name}_duration_seconds_count{labels(value)} {histogram.count}")
+
+        family(f"{self.name}_duration_quantile_seconds", "gauge", f"{self.help_text} latency quantiles, estimated from the histogram.")
+        for value, histogram in sorted(self.histograms.items()):
+            for q in QUANTILES:
+                estimate = histogram.quantile(q)
+                if estimate is not None:
+                    lines.append(f"{self.name}_duration_quantile_seconds{labels(value, quantile=q)} {estimate}")
+
+        family(f"{self.name}_errors_total", "counter", f"{self.help_text} errors.")
+        for value in sorted(self.histograms):
+            lines.append(f"{self.name}_errors_total{labels(value)} {self.errors[value]}")
+
+        family(f"{self.name}_in_flight", "gauge", f"{self.help_text}s in progress.")
+        for value in sorted(self.histograms):
+            lines.append(f"{self.name}_in_flight{labels(value)} {self.in_flight[value]}")
+        return lines
+
+
+def render_metrics(*metrics) -> str:
+    """Render metrics (LatencyMetric, or anything with a render() returning lines) in the Prometheus text format."""
+    return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
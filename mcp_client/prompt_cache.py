@@ -0,0 +1,212 @@
+import os
+import re
+import json
+import time
+import difflib
+import threading
+import unicodedata
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 1024
+
+_WORD = re.compile(r"\w+")
+_NUMBER = re.compile(r"\d+")
+# Polite openings skipped to find a prompt's leading verb
+_FILLER = frozenset("please kindly can could would you i want need to por favor pode podes quero".split())
+# Words that can differ between near-repeats: the filler, articles and prepositions
+_IGNORED = _FILLER | frozenset(
+    "a an the my with in into on at of for from named called "
+    "o os as um uma uns umas meu minha de do da dos das no na nos nas em com para ao aos".split()
+)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercase the prompt and collapse its whitespace, so trivially different repeats meet."""
+    prompt = unicodedata.normalize("NFKC", prompt).casefold()
+    return " ".join(prompt.split()).rstrip(" .!?")
+
+
+def _leading_verb(words: list) -> str:
+    return next((word for word in words if word not in _FILLER), "")
+
+
+def _signature(prompt: str) -> tuple:
+    # Only prompts with the same leading verb, numbers and content words can be near-repeats
+    words = _WORD.findall(prompt)
+    return _leading_verb(words), tuple(_NUMBER.findall(prompt)), tuple(sorted(word for word in words if word not in _IGNORED))
+
+
+def similarity(a: str, b: str) -> float:
+    """
+    Similarity (0-1) of two normalized prompts, comparing their words in order.
+
+    Prompts only match when they differ in filler, articles and prepositions
+    ("please add the ..." and "add ..."). Prompts with a different leading verb,
+    other numbers (ids, quantities, dates) or any other word ("tuna" and "beans")
+    never match, since they ask for different tool calls.
+    """
+    if _signature(a) != _signature(b):
+        return 0.0
+    return difflib.SequenceMatcher(None, _WORD.findall(a), _WORD.findall(b)).ratio()
+
+
+class PromptCache:
+    """
+    LRU cache of the tool calls generated for prompts, with optional expiry,
+    near-repeat matching and persistence to a JSON file.
+
+    Args:
+        maxsize (int): Maximum number of prompts; the least recently used is evicted.
+        ttl (float, optional): Seconds an entry stays valid. None means no expiry.
+        threshold (float, optional): Minimum similarity for a prompt to be answered
+            with the entry of a near-repeat. None only answers exact repeats.
+        path (str, optional): JSON file to load the entries from and save them to.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = None, threshold: float = None, path: str = None):
+        if maxsize < 1:
+            raise ValueError("Prompt cache maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self.path = path
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        # Keys by _signature, to find the candidate near-repeats of a prompt
+        self._similar = {}
+        self._lock = threading.Lock()
+
+    def _add(self, key: str, entry: tuple):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if self.threshold is not None:
+            self._similar.setdefault(_signature(key), {})[key] = None
+
+    def _drop(self, key: str):
+        del self._entries[key]
+        if self.threshold is not None:
+            signature = _signature(key)
+            keys = self._similar[signature]
+            del keys[key]
+            if not keys:
+                del self._similar[signature]
+
+    def _expired(self, key: str, now: float) -> bool:
+        expires_at, _ = self._entries[key]
+        if expires_at is not None and now >= expires_at:
+            self._drop(key)
+            self.expirations += 1
+            return True
+        return False
+
+    def get(self, prompt: str) -> tuple:
+        """
+        Look up a prompt, exactly and then (with a threshold) among near-repeats.
+
+        Returns:
+            tuple: (tool_call, match), with match "exact" or "similar", or (None, None) on a miss.
+        """
+        key = normalize_prompt(prompt)
+        now = time.time()
+        with self._lock:
+            if key in self._entries and not self._expired(key, now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][1], "exact"
+            if self.threshold is not None:
+                best, best_score = None, self.threshold
+                words = _WORD.findall(key)
+                for other in list(self._similar.get(_signature(key), ())):
+                    if self._expired(other, now):
+                        continue
+                    score = difflib.SequenceMatcher(None, words, _WORD.findall(other)).ratio()
+                    if score >= best_score:
+                        best, best_score = other, score
+                if best is not None:
+                    self._entries.move_to_end(best)
+                    self.hits += 1
+                    self.similar_hits += 1
+                    return self._entries[best][1], "similar"
+            self.misses += 1
+            return None, None
+
+    def put(self, prompt: str, tool_call):
+        """Store the validated tool call generated for a prompt."""
+        key = normalize_prompt(prompt)
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._add(key, (expires_at, tool_call))
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._similar.clear()
+
+    def load(self, model: str) -> int:
+        """
+        Load the entries saved by save() for the same model, skipping expired ones.
+
+        Returns:
+            int: Number of entries loaded.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        with open(self.path, encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("model") != model:
+            return 0
+        now = time.time()
+        with self._lock:
+            for key, expires_at, tool_call in saved.get("entries", [])[-self.maxsize:]:
+                if expires_at is None or now < expires_at:
+                    self._add(key, (expires_at, tool_call))
+            return len(self._entries)
+
+    def save(self, model: str):
+        """Write the entries to the cache file, replacing it atomically."""
+        if not self.path:
+            return
+        with self._lock:
+            entries = [[key, expires_at, tool_call] for key, (expires_at, tool_call) in self._entries.items()]
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"model": model, "entries": entries}, f)
+        os.replace(temporary, self.path)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def render(self) -> list:
+        """The cache counters in the Prometheus text format, for metrics.render_metrics."""
+        stats = self.stats()
+        lines = []
+        for name, kind, help_text, value in (
+            ("bridge_prompt_cache_entries", "gauge", "Prompts in the tool call cache.", stats["size"]),
+            ("bridge_prompt_cache_hits_total", "counter", "Prompts answered from the tool call cache.", stats["hits"]),
+            ("bridge_prompt_cache_similar_hits_total", "counter", "Prompts answered with the tool call of a near-repeat.", stats["similar_hits"]),
+            ("bridge_prompt_cache_misses_total", "counter", "Prompts not found in the tool call cache.", stats["misses"]),
+            ("bridge_prompt_cache_evictions_total", "counter", "Prompts evicted from the tool call cache.", stats["evictions"]),
+            ("bridge_prompt_cache_expirations_total", "counter", "Prompts expired from the tool call cache.", stats["expirations"]),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+        return lines
+
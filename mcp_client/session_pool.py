@@ -0,0 +1,406 @@
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import anyio
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+
+class SessionPoolTimeout(Exception):
+    """No session of the pool became free within the checkout timeout."""
+
+
+class _NotSent(ConnectionError):
+    """The connection was found lost before the request was sent."""
+
+
+# Errors of a request whose connection went away (e.g. the server restarted)
+_TRANSPORT_ERRORS = (ConnectionError, anyio.EndOfStream, anyio.ClosedResourceError, anyio.BrokenResourceError)
+# ClientSession requests that change nothing on the server, so losing their answer is harmless
+_READ_ONLY_METHODS = frozenset({
+    "send_ping", "list_tools", "list_prompts", "get_prompt", "list_resources", "list_resource_templates", "read_resource",
+})
+
+
+def _describe(error: BaseException) -> str:
+    # Connection errors come wrapped in the transport's task group
+    while isinstance(error, BaseExceptionGroup) and error.exceptions:
+        error = error.exceptions[0]
+    return f"{type(error).__name__}: {error}"
+
+
+class _Slot:
+    """One connection of the pool, kept open (and reopened) by its own task."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.session = None
+        self.generation = 0
+        self.state = "connecting"
+        self.suspect = False
+        self.checked_at = 0.0
+        self.connected_at = 0.0
+        self.broken = asyncio.Event()
+        self.task = None
+
+
+class PooledSession:
+    """
+    A checked-out session of the pool. Behaves like the ClientSession, except that a
+    request fails as soon as the connection is lost. It is then sent once more on
+    another connection opened (or pinged) after the failure if it never went out, or
+    if it is read-only (see SessionPool); the server may have run any other request
+    before going away, so its error is raised. A request raising any other error gets
+    the connection health-checked when it is returned.
+    """
+
+    def __init__(self, pool: "SessionPool", slot: _Slot, generation: int):
+        self._pool = pool
+        self._slot = slot
+        self._generation = generation
+        # The concurrent calls of a tool plan share the session: only the first to fail moves it
+        self._moving = asyncio.Lock()
+
+    def __getattr__(self, name):
+        if not asyncio.iscoroutinefunction(getattr(ClientSession, name, None)):
+            return getattr(self._slot.session, name)
+
+        async def call(*args, **kwargs):
+            failed = (self._slot, self._generation)
+            try:
+                return await self._request(name, args, kwargs)
+            except _TRANSPORT_ERRORS as e:
+                failed_at = time.monotonic()
+                if not isinstance(e, _NotSent) and not self._read_only(name, args, kwargs):
+                    # The next request of the session moves it to another connection
+                    if (self._slot, self._generation) == failed:
+                        self._slot.broken.set()
+                    print(f"MCP session {self._slot.index} lost its connection ({_describe(e)}) during {self._describe_request(name, args, kwargs)}, "
+                          f"not resending it as it may have run")
+                    raise
+                async with self._moving:
+                    if (self._slot, self._generation) == failed:
+                        self._slot.broken.set()
+                        print(f"MCP session {self._slot.index} lost its connection ({_describe(e)}), retrying on another one")
+                        self._slot, self._generation = await self._pool._checkout_fresh(failed_at)
+                self._pool.retries += 1
+                return await self._request(name, args, kwargs)
+
+        return call
+
+    def _read_only(self, name: str, args: tuple, kwargs: dict) -> bool:
+        if name == "call_tool":
+            return (args[0] if args else kwargs.get("name")) in self._pool.read_only_tools
+        return name in _READ_ONLY_METHODS
+
+    @staticmethod
+    def _describe_request(name: str, args: tuple, kwargs: dict) -> str:
+        if name == "call_tool":
+            return f"call of {args[0] if args else kwargs.get('name')}"
+        return name
+
+    async def _request(self, name: str, args: tuple, kwargs: dict):
+        pool, slot = self._pool, self._slot
+        if slot.broken.is_set() or slot.session is None:
+            raise _NotSent(f"Connection of MCP session {slot.index} lost")
+        # A request sent just before the connection dropped would otherwise wait for the read timeout
+        request = asyncio.ensure_future(getattr(slot.session, name)(*args, **kwargs))
+        lost = asyncio.ensure_future(slot.broken.wait())
+        try:
+            while True:
+                done, _ = await asyncio.wait((request, lost), timeout=pool.ping_timeout, return_when=asyncio.FIRST_COMPLETED)
+                if done:
+                    break
+                # A long request: make sure the server can still be reached (a server
+                # shutting down keeps its event streams open but takes no more messages)
+                if not await pool._ping(slot):
+                    slot.broken.set()
+        finally:
+            lost.cancel()
+            if not request.done():
+                request.cancel()
+        try:
+            return request.result()
+        except asyncio.CancelledError:
+            raise ConnectionError(f"Connection of MCP session {slot.index} lost") from None
+        except _TRANSPORT_ERRORS:
+            raise
+        except Exception:
+            slot.suspect = True
+            raise
+
+
+class SessionPool:
+    """
+    Pool of initialized MCP sessions, each over its own SSE connection.
+
+    Requests check a session out for as long as they need it, so concurrent requests
+    use different connections. A connection whose event stream ends (e.g. the server
+    restarted) is reconnected right away, failing its requests in flight. Idle sessions
+    are pinged every health_interval seconds, and a session whose request failed is
+    pinged before it is handed out again; one failing its ping is reconnected too.
+    A request that finds its connection lost, or loses it while read-only, is sent once
+    more on a session connected or pinged after the failure, so a server restart doesn't
+    fail the first requests. Other requests (tool calls that change data) are never sent
+    twice.
+    Failed connection attempts are retried after 1, 2, 4... seconds (up to backoff_max),
+    so the pool recovers by itself when the server comes back.
+
+    Args:
+        url (str): SSE endpoint of the MCP server.
+        size (int): Number of sessions.
+        checkout_timeout (float): Seconds to wait for a free session before giving up.
+        health_interval (float): Seconds between pings of an idle session.
+        call_timeout (float): Seconds to wait for the answer to a request. Requests
+            running longer than 5 seconds ping their connection every 5 seconds.
+        backoff_max (float): Longest wait between reconnection attempts.
+        read_only_tools (Iterable[str], optional): Tools that change nothing on the server,
+            whose calls are sent again when their connection is lost mid-request.
+    """
+
+    def __init__(self, url: str, size: int = 4, checkout_timeout: float = 10.0, health_interval: float = 15.0,
+                 call_timeout: float = 150.0, backoff_max: float = 30.0, read_only_tools=()):
+        if size < 1:
+            raise ValueError("The session pool size must be at least 1")
+        self.url = url
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.health_interval = health_interval
+        self.call_timeout = call_timeout
+        self.backoff_max = backoff_max
+        self.read_only_tools = frozenset(read_only_tools)
+        self.ping_timeout = 5.0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.reconnects = 0
+        self.health_check_failures = 0
+        self.retries = 0
+        self._slots = [_Slot(index) for index in range(size)]
+        # (slot, generation) of the idle sessions; entries of an older connection are skipped
+        self._idle = asyncio.Queue()
+        self._connected = asyncio.Event()
+        self._closing = False
+        self._health_task = None
+        self._checks = set()
+
+    async def start(self, wait: float = 10.0) -> bool:
+        """
+        Start connecting every session and wait for the first one to be ready.
+
+        Args:
+            wait (float): Seconds to wait for a session.
+
+        Returns:
+            bool: True if a session is ready; otherwise the pool keeps trying in the background.
+        """
+        for slot in self._slots:
+            slot.task = asyncio.ensure_future(self._run_slot(slot))
+        self._health_task = asyncio.ensure_future(self._check_idle_sessions())
+        try:
+            await asyncio.wait_for(self._connected.wait(), wait)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self):
+        """Close every session."""
+        self._closing = True
+        tasks = [slot.task for slot in self._slots if slot.task]
+        for slot in self._slots:
+            slot.broken.set()
+        if self._health_task:
+            self._health_task.cancel()
+            tasks.append(self._health_task)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def _watch(slot: _Slot, source, sink):
+        # Pass the server's messages on to the session, noticing when the stream fails or ends
+        try:
+            async with source, sink:
+                async for message in source:
+                    if isinstance(message, Exception):
+                        break
+                    await sink.send(message)
+        except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+            pass
+        slot.broken.set()
+
+    async def _run_slot(self, slot: _Slot):
+        # The connection's context is entered and left in this task, as anyio requires
+        failures = 0
+        while not self._closing:
+            slot.state = "connecting"
+            slot.broken.clear()
+            try:
+                async with sse_client(self.url) as (read_stream, write_stream):
+                    sink, received = anyio.create_memory_object_stream(0)
+                    async with anyio.create_task_group() as watcher:
+                        watcher.start_soon(self._watch, slot, read_stream, sink)
+                        async with ClientSession(received, write_stream, read_timeout_seconds=timedelta(seconds=self.call_timeout)) as session:
+                            await asyncio.wait_for(session.initialize(), self.call_timeout)
+                            if failures or slot.generation:
+                                self.reconnects += 1
+                                print(f"MCP session {slot.index} reconnected")
+                            failures = 0
+                            slot.session = session
+                            slot.generation += 1
+                            slot.suspect = False
+                            slot.connected_at = slot.checked_at = time.monotonic()
+                            slot.state = "idle"
+                            self._idle.put_nowait((slot, slot.generation))
+                            self._connected.set()
+                            await slot.broken.wait()
+                        watcher.cancel_scope.cancel()
+            except Exception as e:
+                if not self._closing:
+                    print(f"MCP session {slot.index} failed to connect: {_describe(e)}")
+            slot.session = None
+            if self._closing:
+                break
+            slot.state = "connecting"
+            # The first attempt after losing a connection is immediate
+            if failures:
+                await asyncio.sleep(min(self.backoff_max, 2 ** (failures - 1)))
+            failures += 1
+        slot.state = "closed"
+
+    async def _ping(self, slot: _Slot, timeout: float = None) -> bool:
+        try:
+            await asyncio.wait_for(slot.session.send_ping(), timeout or self.ping_timeout)
+            slot.checked_at = time.monotonic()
+            return True
+        except Exception as e:
+            self.health_check_failures += 1
+            print(f"MCP session {slot.index} failed its health check: {_describe(e)}")
+            return False
+
+    def _start_check(self, slot: _Slot):
+        task = asyncio.ensure_future(self._check(slot, slot.generation))
+        self._checks.add(task)
+        task.add_done_callback(self._checks.discard)
+
+    async def _check(self, slot: _Slot, generation: int):
+        # The slot is out of the idle queue while it is checked
+        slot.state = "checking"
+        healthy = await self._ping(slot)
+        if slot.generation != generation or slot.broken.is_set():
+            return
+        if healthy:
+            slot.suspect = False
+            slot.state = "idle"
+            self._idle.put_nowait((slot, generation))
+        else:
+            slot.broken.set()
+
+    def _current(self, entry: tuple) -> bool:
+        # The slot's broken flag is cleared as soon as it starts reconnecting, before its session is back
+        slot, generation = entry
+        return slot.generation == generation and not slot.broken.is_set() and slot.session is not None
+
+    async def _check_idle_sessions(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            due = time.monotonic() - self.health_interval
+            for _ in range(self._idle.qsize()):
+                entry = self._idle.get_nowait()
+                if not self._current(entry):
+                    continue
+                slot, generation = entry
+                if slot.checked_at <= due:
+                    self._start_check(slot)
+                else:
+                    self._idle.put_nowait(entry)
+
+    def _release(self, slot: _Slot, generation: int):
+        if slot.generation != generation or slot.broken.is_set():
+            # Lost while checked out: the slot's task queues it again once reconnected
+            return
+        if slot.suspect:
+            self._start_check(slot)
+        else:
+            slot.state = "idle"
+            self._idle.put_nowait((slot, generation))
+
+    async def _checkout(self) -> tuple:
+        while True:
+            entry = await self._idle.get()
+            if self._current(entry):
+                return entry
+
+    async def _checkout_fresh(self, since: float) -> tuple:
+        # A session connected or answering a ping after a connection was lost at since:
+        # when the server restarted, the other sessions opened before are likely dead too
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            try:
+                slot, generation = await asyncio.wait_for(self._checkout(), max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                self.checkout_timeouts += 1
+                raise SessionPoolTimeout(f"No MCP session reconnected within {self.checkout_timeout} seconds") from None
+            self.checkouts += 1
+            slot.state = "busy"
+            # A live server answers at once; a session to a server gone away is just reconnected
+            if slot.connected_at > since or await self._ping(slot, timeout=1.0):
+                return slot, generation
+            slot.broken.set()
+
+    @asynccontextmanager
+    async def session(self):
+        """
+        Check out a session for the enclosed block.
+
+        Raises:
+            SessionPoolTimeout: If no session is free within checkout_timeout seconds.
+        """
+        try:
+            slot, generation = await asyncio.wait_for(self._checkout(), self.checkout_timeout)
+        except asyncio.TimeoutError:
+            self.checkout_timeouts += 1
+            ready = sum(1 for slot in self._slots if slot.session is not None)
+            raise SessionPoolTimeout(
+                f"No MCP session free within {self.checkout_timeout} seconds ({ready} of {self.size} connected)"
+            ) from None
+        self.checkouts += 1
+        slot.state = "busy"
+        session = PooledSession(self, slot, generation)
+        try:
+            yield session
+        finally:
+            # The session may have moved to another connection after losing its own
+            self._release(session._slot, session._generation)
+
+    def stats(self) -> dict:
+        states = {"idle": 0, "busy": 0, "checking": 0, "connecting": 0}
+        for slot in self._slots:
+            if slot.state in states:
+                states[slot.state] += 1
+        return {
+            "size": self.size,
+            "sessions": states,
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "reconnects": self.reconnects,
+            "health_check_failures": self.health_check_failures,
+            "retries": self.retries,
+        }
+
+    def render(self) -> list:
+        """The pool's sessions and counters in the Prometheus text format, for metrics.render_metrics."""
+        stats = self.stats()
+        lines = [
+            "# HELP bridge_mcp_sessions MCP sessions of the pool, by state.",
+            "# TYPE bridge_mcp_sessions gauge",
+        ]
+        lines += [f'bridge_mcp_sessions{{state="{state}"}} {count}' for state, count in stats["sessions"].items()]
+        for name, help_text, value in (
+            ("bridge_mcp_session_checkouts_total", "MCP sessions checked out of the pool.", stats["checkouts"]),
+            ("bridge_mcp_session_checkout_timeouts_total", "Requests that found no free MCP session in time.", stats["checkout_timeouts"]),
+            ("bridge_mcp_session_reconnects_total", "MCP sessions reconnected after a failure.", stats["reconnects"]),
+            ("bridge_mcp_session_health_check_failures_total", "MCP sessions that failed their health check.", stats["health_check_failures"]),
+            ("bridge_mcp_session_retries_total", "Requests sent again on another MCP session after losing their connection.", stats["retries"]),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter", f"{name} {value}"]
+        return lines
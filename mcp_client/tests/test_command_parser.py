@@ -0,0 +1,74 @@
+"""
+Commands the fast path answers without the LLM at its default settings, and some it leaves to it.
+
+    python -m pytest mcp_client/tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from command_parser import FastPath  # noqa: E402
+
+# (prompt, tool plan)
+FAST_PATH_CASES = [
+    (
+        "Remove item com id 21",
+        [{"tool": "remove_item", "arguments": {"item_id": 21}}],
+    ),
+    (
+        "Adiciona Pao com data de substituição a 25 de Junho de 2025 e data de validade a 26 de Junho de 2025 no armazemento: mochila do Joao",
+        [{"tool": "add_item", "arguments": {
+            "name": "Pao", "quantity": 1, "replacement_date": "2025-06-25",
+            "storage_name": "mochila do Joao", "expiration_date": "2025-06-26",
+        }}],
+    ),
+    (
+        "Adiciona Pao com data de substituição a 25 de Junho de 2025 no armazenamento: mochila do Joao",
+        [{"tool": "add_item", "arguments": {
+            "name": "Pao", "quantity": 1, "replacement_date": "2025-06-25", "storage_name": "mochila do Joao",
+        }}],
+    ),
+    (
+        "Add Canned Tuna with replacement date in 25th June 2025 and expiration date in 25th June 2025 into storage named Bunker 101",
+        [{"tool": "add_item", "arguments": {
+            "name": "Canned Tuna", "quantity": 1, "replacement_date": "2025-06-25",
+            "storage_name": "Bunker 101", "expiration_date": "2025-06-25",
+        }}],
+    ),
+    (
+        "Add 2 Canned Tuna with replacement date 25th June 2025 into storage named Bunker 101",
+        [{"tool": "add_item", "arguments": {
+            "name": "Canned Tuna", "quantity": 2, "replacement_date": "2025-06-25", "storage_name": "Bunker 101",
+        }}],
+    ),
+    (
+        "Edita item com id 21 para data de validade a 26 de Junho de 2025",
+        [{"tool": "edit_item", "arguments": {"item_id": 21, "expiration_date": "2025-06-26"}}],
+    ),
+]
+
+LLM_CASES = [
+    "What items expire next week?",
+    "Remove item with id 21 and add Bread with replacement date 2025-07-01",
+    "Remove items 1 to 5",
+    "Add milk and eggs with replacement date 2025-07-01 to the storage Fridge",
+    "Add Bread expiring next friday with replacement date 2025-07-01",
+    "Add milk",
+]
+
+
+@pytest.mark.parametrize("prompt, tool_call", FAST_PATH_CASES)
+def test_fast_path_answers(prompt, tool_call):
+    fast_path = FastPath()
+    assert fast_path.parse(prompt) == tool_call
+    assert fast_path.stats()["hit_rate"] == 1.0
+
+
+@pytest.mark.parametrize("prompt", LLM_CASES)
+def test_fast_path_leaves_to_llm(prompt):
+    fast_path = FastPath()
+    assert fast_path.parse(prompt) is None
+    assert fast_path.stats()["hit_rate"] == 0.0
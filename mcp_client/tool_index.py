@@ -0,0 +1,149 @@
+import os
+import re
+import math
+import unicodedata
+from collections import Counter
+
+# Tools put in the LLM prompt for each query; 0 puts every tool
+TOOL_TOP_K = int(os.getenv("TOOL_TOP_K", "6"))
+
+_WORD = re.compile(r"[a-z0-9]+")
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from how i in into is it its me my of on one or "
+    "the this to what which with you your args returns".split()
+)
+
+# Tool names and parameter names say more about a tool than its description
+NAME_WEIGHT = 3
+PARAMETER_WEIGHT = 2
+
+
+def _stem(word: str) -> str:
+    # Crude suffix stripping, enough for "items"/"item" and "removed"/"remove" to meet
+    for suffix in ("ing", "ed", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith("ss"):
+            word = word[: -len(suffix)]
+            break
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list:
+    """
+    Split text into search terms: accents removed, camelCase and snake_case split,
+    lowercased, stop words dropped and suffixes stripped.
+    """
+    text = unicodedata.normalize("NFKD", _CAMEL.sub(" ", text or ""))
+    text = "".join(char for char in text if not unicodedata.combining(char)).lower()
+    return [_stem(word) for word in _WORD.findall(text) if word not in _STOPWORDS]
+
+
+def _tool_fields(tool) -> tuple:
+    # Tools in OpenAI format ({"type": "function", "function": {...}}) or plain {"name", ...}
+    function = tool.get("function", tool)
+    properties = (function.get("parameters") or {}).get("properties") or {}
+    return function["name"], function.get("description") or "", list(properties)
+
+
+def describe_tools(tools: list) -> str:
+    """The "- <name>: <description>" lines listing tools in a system prompt."""
+    lines = ""
+    for tool in tools:
+        name, description, _ = _tool_fields(tool)
+        lines += f"- {name}: {description}\n"
+    return lines
+
+
+class ToolIndex:
+    """
+    BM25 index of tools over their names, descriptions and parameter names.
+
+    Matches the words of a query against each tool, so a prompt can list only the
+    tools the query is likely to need. Runs locally; building it takes a few
+    milliseconds for a few dozen tools.
+    """
+
+    def __init__(self, tools: list, k1: float = 1.5, b: float = 0.75):
+        self.tools = list(tools)
+        self.k1 = k1
+        self.b = b
+        self._terms = []
+        for tool in self.tools:
+            name, description, parameters = _tool_fields(tool)
+            terms = tokenize(name) * NAME_WEIGHT + tokenize(description)
+            for parameter in parameters:
+                terms += tokenize(parameter) * PARAMETER_WEIGHT
+            self._terms.append(Counter(terms))
+        self._lengths = [sum(terms.values()) for terms in self._terms]
+        self._average_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        frequencies = Counter(term for terms in self._terms for term in terms)
+        count = len(self.tools)
+        self._idf = {
+            term: math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in frequencies.items()
+        }
+
+    def scores(self, query: str) -> list:
+        """BM25 score of every tool for the query, in the index's order."""
+        query_terms = [term for term in set(tokenize(query)) if term in self._idf]
+        scores = []
+        for terms, length in zip(self._terms, self._lengths):
+            score = 0.0
+            for term in query_terms:
+                frequency = terms.get(term)
+                if frequency:
+                    norm = self.k1 * (1 - self.b + self.b * length / self._average_length)
+                    score += self._idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            scores.append(score)
+        return scores
+
+    def search(self, query: str, k: int) -> list:
+        """
+        The k tools matching the query best.
+
+        Returns:
+            list: (score, tool) pairs, best first, only for tools sharing a term with the query.
+        """
+        ranked = sorted(
+            ((score, position) for position, score in enumerate(self.scores(query)) if score > 0),
+            key=lambda pair: (-pair[0], pair[1]),
+        )
+        return [(score, self.tools[position]) for score, position in ranked[:k]]
+
+    def select(self, query: str, k: int = TOOL_TOP_K) -> list:
+        """
+        Tools to put in the prompt for a query.
+
+        Args:
+            query (str): The user's query.
+            k (int): Number of tools to keep; 0 or less keeps every tool.
+
+        Returns:
+            list: The top k tools, in the index's order, or every tool when k doesn't
+                leave any out or no tool matches the query (e.g. a query in another
+                language than the descriptions).
+        """
+        if k <= 0 or len(self.tools) <= k:
+            return self.tools
+        hits = self.search(query, k)
+        if not hits:
+            return self.tools
+        chosen = {id(tool) for _, tool in hits}
+        return [tool for tool in self.tools if id(tool) in chosen]
+
+
+_index_cache = {}
+
+
+def index_for(tools: list) -> ToolIndex:
+    """
+    The ToolIndex of a tool list, reused while the server's tools stay the same.
+    """
+    key = tuple(_tool_fields(tool)[:2] for tool in tools)
+    index = _index_cache.get(key)
+    if index is None:
+        _index_cache.clear()
+        index = _index_cache[key] = ToolIndex(tools)
+    return index
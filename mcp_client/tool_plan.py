@@ -0,0 +1,101 @@
+import os
+import asyncio
+from contextlib import nullcontext
+
+# Tool calls of one plan running at once
+TOOL_CONCURRENCY = int(os.getenv("TOOL_CONCURRENCY", "4"))
+
+PLAN_FORMAT_PROMPT = (
+    'Reply ONLY with a JSON array of tool calls like '
+    '[{"tool": "<tool_name>", "arguments": {"<argument0>": "<value0>", ...}}, ...]. '
+    "The same tool can appear several times. "
+)
+
+
+class ToolCallError(Exception):
+    """The server answered a tool call with an error."""
+
+
+def _unwrap_arguments(value):
+    # Some models answer {"<name>": {"arguments": {...}}} for the older format
+    if isinstance(value, dict) and set(value) == {"arguments"}:
+        return value["arguments"]
+    return value
+
+
+def normalize_plan(plan) -> list:
+    """
+    Turn a tool plan into a list of {"tool", "arguments"} calls.
+
+    Accepted formats:
+        [{"tool": "<name>", "arguments": {...}}, ...]     list of calls (repeats allowed)
+        {"calls": [...]}                                    the same, wrapped
+        {"tool": "<name>", "arguments": {...}}             a single call
+        {"<name>": {...}, ...}                              one call per tool (older format)
+        {"<name>": {"arguments": {...}}, ...}               the same, with wrapped arguments
+
+    Args:
+        plan (list | dict): The plan, as parsed from the LLM's JSON.
+
+    Returns:
+        list: The calls, in order.
+
+    Raises:
+        ValueError: If the plan is not in one of these formats.
+    """
+    if isinstance(plan, dict) and isinstance(plan.get("calls"), list):
+        plan = plan["calls"]
+    if isinstance(plan, dict) and isinstance(plan.get("tool"), str):
+        plan = [plan]
+    if isinstance(plan, dict):
+        plan = [{"tool": name, "arguments": _unwrap_arguments(arguments)} for name, arguments in plan.items()]
+    if not isinstance(plan, list):
+        raise ValueError("A tool plan must be a list of calls or an object")
+
+    calls = []
+    for index, call in enumerate(plan):
+        name = call.get("tool", call.get("name")) if isinstance(call, dict) else None
+        if not isinstance(name, str):
+            raise ValueError(f"Call {index} of the tool plan has no tool name")
+        arguments = call.get("arguments") or {}
+        if not isinstance(arguments, dict):
+            raise ValueError(f"Call {index} ({name}) of the tool plan has arguments that are not an object")
+        calls.append({"tool": name, "arguments": arguments})
+    return calls
+
+
+async def run_plan(session, calls: list, max_concurrency: int = TOOL_CONCURRENCY, timer=None) -> list:
+    """
+    Run the calls of a tool plan concurrently, at most max_concurrency at a time.
+
+    A failing call doesn't stop the others: its entry holds the error instead.
+
+    Args:
+        session (ClientSession): Connected MCP session.
+        calls (list): Calls from normalize_plan.
+        max_concurrency (int): Calls running at once.
+        timer (callable, optional): Called with the tool name, returns a context
+            manager wrapped around the call (e.g. a latency metric). Failed calls
+            raise inside it.
+
+    Returns:
+        list: One entry per call, in the plan's order, with "tool", "arguments", "ok"
+            and either "result" or "error".
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(call):
+        async with semaphore:
+            try:
+                with timer(call["tool"]) if timer else nullcontext():
+                    response = await session.call_tool(call["tool"], arguments=call["arguments"])
+                    text = "\n".join(getattr(content, "text", "") for content in response.content)
+                    if response.isError:
+                        raise ToolCallError(text)
+            except ToolCallError as e:
+                return {**call, "ok": False, "error": str(e)}
+            except Exception as e:
+                return {**call, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        return {**call, "ok": True, "result": text}
+
+    return list(await asyncio.gather(*(run(call) for call in calls)))
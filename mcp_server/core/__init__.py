@@ -0,0 +1,2 @@
+# Core package initialization
+# Shared server infrastructure used by server.py and the tool modules
\ No newline at end of file
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import functools
+from collections import Counter
+
+from mcp.server.fastmcp.exceptions import ToolError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ADMISSION = {"max_concurrency": 64, "max_queue": 128, "timeout": 30}
+
+_limiters = {}
+_timeouts = Counter()
+
+
+class AdmissionRejected(ToolError):
+    """A call was turned away because the server or the tool is at capacity."""
+
+
+class _Limiter:
+    """
+    Concurrency limit with a bounded wait queue.
+
+    Calls beyond the limit wait in line; once max_queue calls are waiting,
+    further calls are rejected right away instead of adding to the backlog.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int):
+        if max_concurrency < 1 or max_queue < 0:
+            raise ValueError(f"Invalid limits for '{name}': max_concurrency must be at least 1 and max_queue at least 0")
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def acquire(self):
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise AdmissionRejected(
+                    f"Server busy: {self.name} is at its limit of {self.max_concurrency} concurrent calls "
+                    f"with {self.waiting} waiting. Try again later."
+                )
+            self.waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self.active += 1
+        self.admitted += 1
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+def create_global_limiter(settings: dict = None) -> _Limiter:
+    """
+    Create the limiter shared by every tool of a server.
+
+    Args:
+        settings (dict, optional): The "admission" section of tool_config.json.
+    """
+    settings = {**DEFAULT_ADMISSION, **(settings or {})}
+    limiter = _limiters["*"] = _Limiter("the server", settings["max_concurrency"], settings["max_queue"])
+    return limiter
+
+
+def admitted_tool(func, name: str, settings: dict = None, shared: _Limiter = None, default_timeout: float = DEFAULT_ADMISSION["timeout"]):
+    """
+    Wrap an async tool function with a deadline and concurrency limits.
+
+    A call first takes a slot of the tool's own limiter (when the tool sets
+    max_concurrency), then one of the global limiter. Calls finding a full wait
+    queue are rejected with an MCP error. The deadline covers the time spent
+    waiting as well as running; when it passes, the call fails with an MCP error
+    (a tool running in a thread pool still finishes in the background).
+
+    Args:
+        func: Async tool function, called with keyword arguments.
+        name (str): Tool name.
+        settings (dict, optional): The tool's "admission" settings: timeout (seconds,
+            null for none), max_concurrency and max_queue (defaults to max_concurrency).
+        shared (_Limiter, optional): The server's global limiter, see create_global_limiter.
+        default_timeout (float, optional): Deadline for tools that don't set one.
+    """
+    settings = settings or {}
+    timeout = settings.get("timeout", default_timeout)
+    own = None
+    if settings.get("max_concurrency"):
+        own = _limiters[name] = _Limiter(
+            f"tool '{name}'", settings["max_concurrency"], settings.get("max_queue", settings["max_concurrency"])
+        )
+
+    async def admit_and_run(kwargs):
+        limiters = [limiter for limiter in (own, shared) if limiter is not None]
+        acquired = []
+        try:
+            for limiter in limiters:
+                await limiter.acquire()
+                acquired.append(limiter)
+            return await func(**kwargs)
+        finally:
+            for limiter in acquired:
+                limiter.release()
+
+    @functools.wraps(func)
+    async def wrapper(**kwargs):
+        if timeout is None:
+            return await admit_and_run(kwargs)
+        try:
+            return await asyncio.wait_for(admit_and_run(kwargs), timeout)
+        except asyncio.TimeoutError:
+            _timeouts[name] += 1
+            logger.warning(f"Tool {name} timed out after {timeout} seconds")
+            raise ToolError(f"Tool '{name}' timed out after {timeout} seconds") from None
+
+    return wrapper
+
+
+def admission_stats() -> dict:
+    """
+    Limits, active and waiting calls and rejections of every limiter ("*" is the
+    global one), and the number of timed out calls per tool.
+    """
+    return {
+        "limiters": {name: limiter.stats() for name, limiter in _limiters.items()},
+        "timeouts": dict(_timeouts),
+    }
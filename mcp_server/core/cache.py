@@ -0,0 +1,175 @@
+import json
+import time
+import hashlib
+import logging
+import functools
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+CACHE_POLICIES = ("none", "lru", "ttl", "daily")
+DEFAULT_MAXSIZE = 1024
+
+_caches = {}
+
+
+def cache_key(kwargs: dict) -> bytes:
+    """
+    Digest of the canonicalized tool arguments.
+
+    Keys are fixed-size digests, so large arguments (e.g. a text for count_words)
+    are not kept alive by the cache.
+    """
+    canonical = json.dumps(kwargs, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).digest()
+
+
+def _next_midnight() -> float:
+    tomorrow = datetime.now().date() + timedelta(days=1)
+    return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of tool results with optional expiry.
+
+    Args:
+        maxsize (int): Maximum number of entries; the least recently used is evicted.
+        ttl (float, optional): Seconds an entry stays valid. None means no expiry.
+        daily (bool): Entries expire at the next local midnight.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = None, daily: bool = False):
+        if maxsize < 1:
+            raise ValueError("Cache maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.daily = daily
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expires_at(self) -> float:
+        if self.daily:
+            return _next_midnight()
+        if self.ttl is not None:
+            return time.time() + self.ttl
+        return None
+
+    def get(self, key) -> tuple:
+        """
+        Look up a key.
+
+        Returns:
+            tuple: (hit, value), with value None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or time.time() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entries beyond maxsize."""
+        with self._lock:
+            self._entries[key] = (self._expires_at(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+def make_cache(policy: dict = None) -> ResultCache:
+    """
+    Build a cache from a declarative policy.
+
+    Policies:
+        {"policy": "none"}: no caching (the default when no policy is given).
+        {"policy": "lru", "maxsize": 1024}: pure tools, entries never expire.
+        {"policy": "ttl", "ttl": 1.0, "maxsize": 128}: entries expire after ttl seconds.
+        {"policy": "daily", "maxsize": 1024}: entries expire at the next local midnight.
+
+    Args:
+        policy (dict, optional): The tool's cache policy.
+
+    Returns:
+        ResultCache | None: The cache, or None when the tool must not be cached.
+    """
+    policy = policy or {"policy": "none"}
+    kind = policy.get("policy", "none")
+    if kind not in CACHE_POLICIES:
+        raise ValueError(f"Unknown cache policy '{kind}'. Use one of: {', '.join(CACHE_POLICIES)}")
+    if kind == "none":
+        return None
+
+    maxsize = policy.get("maxsize", DEFAULT_MAXSIZE)
+    if kind == "ttl":
+        if "ttl" not in policy:
+            raise ValueError("The 'ttl' cache policy needs a 'ttl' in seconds")
+        return ResultCache(maxsize=maxsize, ttl=float(policy["ttl"]))
+    return ResultCache(maxsize=maxsize, daily=kind == "daily")
+
+
+def cached_tool(func, name: str, policy: dict = None):
+    """
+    Wrap an async tool function with a result cache built from its policy.
+
+    Only successful results are cached. Returns the function unchanged when the
+    policy disables caching.
+
+    Args:
+        func: Async tool function, called with keyword arguments.
+        name (str): Tool name, used to report the cache statistics.
+        policy (dict, optional): Cache policy, see make_cache.
+    """
+    cache = make_cache(policy)
+    if cache is None:
+        return func
+    _caches[name] = cache
+    logger.info(f"Caching tool results: {name} ({policy['policy']})")
+
+    @functools.wraps(func)
+    async def wrapper(**kwargs):
+        key = cache_key(kwargs)
+        hit, value = cache.get(key)
+        if hit:
+            return value
+        value = await func(**kwargs)
+        cache.set(key, value)
+        return value
+
+    return wrapper
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters and sizes of every tool cache, keyed by tool name."""
+    return {name: cache.stats() for name, cache in _caches.items()}
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import functools
+
+from core.cache import cache_key
+
+logger = logging.getLogger(__name__)
+
+_groups = {}
+
+
+class _CallGroup:
+    """In-flight executions of one tool, keyed by argument digest, and their counters."""
+
+    def __init__(self):
+        self.in_flight = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def finish(self, key: bytes, task: asyncio.Future):
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+        # Mark the error as retrieved in case every caller gave up waiting
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        total = self.executions + self.coalesced
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_rate": round(self.coalesced / total, 4) if total else 0.0,
+            "in_flight": len(self.in_flight),
+        }
+
+
+def coalesced_tool(func, name: str, enabled: bool = False):
+    """
+    Wrap an async tool function so identical concurrent calls share one execution.
+
+    A call whose tool name and canonicalized arguments match a call still running
+    waits for that call's result (or error) instead of running again. Only for
+    tools without side effects; returns the function unchanged when disabled.
+
+    Args:
+        func: Async tool function, called with keyword arguments.
+        name (str): Tool name, used to report the counters.
+        enabled (bool): The tool's "coalesce" setting.
+    """
+    if not enabled:
+        return func
+    group = _groups[name] = _CallGroup()
+    logger.info(f"Coalescing concurrent calls: {name}")
+
+    @functools.wraps(func)
+    async def wrapper(**kwargs):
+        key = cache_key(kwargs)
+        task = group.in_flight.get(key)
+        if task is None:
+            group.executions += 1
+            # The shared execution runs as its own task, so one caller giving up
+            # doesn't cancel it for the others
+            task = group.in_flight[key] = asyncio.ensure_future(func(**kwargs))
+            task.add_done_callback(functools.partial(group.finish, key))
+        else:
+            group.coalesced += 1
+        return await asyncio.shield(task)
+
+    return wrapper
+
+
+def coalesce_stats() -> dict:
+    """Executions and coalesced calls of every coalescing tool, keyed by name."""
+    return {name: group.stats() for name, group in _groups.items()}
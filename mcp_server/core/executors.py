@@ -0,0 +1,164 @@
+import os
+import asyncio
+import logging
+import functools
+import importlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_TYPES = ("thread", "process")
+
+_executors = {}
+
+
+def call_tool(module_name: str, tool_name: str, kwargs: dict):
+    """
+    Import a tool module and call one of its tools.
+
+    Runs inside the pool workers; for process pools the module is imported once
+    per worker process.
+    """
+    module = importlib.import_module(f"tools.{module_name}")
+    return getattr(module, tool_name)(**kwargs)
+
+
+class ToolExecutor:
+    """
+    A named, bounded pool that synchronous tools are offloaded to.
+
+    Calls beyond max_workers wait in the pool's queue. Each class of tools gets its
+    own pool, so a backlog of slow calls in one pool doesn't hold up the others.
+
+    Args:
+        name (str): Executor name from tool_config.json.
+        type (str): "thread" for blocking I/O, "process" for CPU-bound work.
+        max_workers (int, optional): Pool size; defaults to the concurrent.futures default.
+    """
+
+    def __init__(self, name: str, type: str = "thread", max_workers: int = None):
+        if type not in EXECUTOR_TYPES:
+            raise ValueError(f"Unknown executor type '{type}' for executor '{name}'. Use one of: {', '.join(EXECUTOR_TYPES)}")
+        if max_workers is None:
+            cpus = os.cpu_count() or 1
+            max_workers = min(32, cpus + 4) if type == "thread" else cpus
+        if max_workers < 1:
+            raise ValueError(f"Executor '{name}' needs at least one worker")
+        self.name = name
+        self.type = type
+        self.max_workers = max_workers
+        self.in_flight = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self._pool = None
+
+    def _get_pool(self):
+        # Pools are created on first use so unused executors cost nothing
+        if self._pool is None:
+            if self.type == "thread":
+                self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix=f"tools-{self.name}")
+            else:
+                self._pool = ProcessPoolExecutor(self.max_workers)
+            logger.info(f"Started {self.type} pool '{self.name}' with {self.max_workers} workers")
+        return self._pool
+
+    @property
+    def queued(self) -> int:
+        """Calls submitted but not yet picked up by a worker."""
+        return max(0, self.in_flight - self.max_workers)
+
+    async def run(self, module_name: str, tool_name: str, kwargs: dict):
+        """
+        Run a synchronous tool in the pool and wait for its result.
+
+        Args:
+            module_name (str): Tool module under tools/.
+            tool_name (str): Tool function name.
+            kwargs (dict): Tool arguments; must be picklable for process pools.
+
+        Returns:
+            The tool's result.
+        """
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+        job = pool.submit(functools.partial(call_tool, module_name, tool_name, kwargs))
+        self.in_flight += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        # A caller that stops waiting (e.g. on a timeout) doesn't stop a job that already started,
+        # so the job is only counted out once it actually finishes
+        job.add_done_callback(lambda job: self._call_soon(loop, self._finished, job))
+        try:
+            return await asyncio.wrap_future(job)
+        except BrokenProcessPool:
+            # A worker process died; start a fresh pool for the next calls
+            if self._pool is pool:
+                self._pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+            logger.error(f"Process pool '{self.name}' broke while running {tool_name}, restarting it")
+            raise
+
+    @staticmethod
+    def _call_soon(loop, callback, *args):
+        # Done callbacks run in the pool's threads; the counters belong to the event loop
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # The loop is closed, so nobody reads the counters any more
+            pass
+
+    def _finished(self, job):
+        self.in_flight -= 1
+        if job.cancelled():
+            return
+        if job.exception() is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "type": self.type,
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "running": min(self.in_flight, self.max_workers),
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+def get_executor(name: str, spec: dict) -> ToolExecutor:
+    """
+    Get the shared executor with the given name, creating it from its spec.
+
+    Args:
+        name (str): Executor name.
+        spec (dict): Settings from the "executors" section of tool_config.json,
+            e.g. {"type": "thread", "max_workers": 16}.
+
+    Returns:
+        ToolExecutor: The executor.
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        executor = _executors[name] = ToolExecutor(name, **spec)
+    return executor
+
+
+def executor_stats() -> dict:
+    """Pool size, in-flight calls and queue depth of every executor, keyed by name."""
+    return {name: executor.stats() for name, executor in _executors.items()}
+
+
+def shutdown_executors(wait: bool = True):
+    """Shut down every executor's pool."""
+    for executor in _executors.values():
+        executor.shutdown(wait=wait)
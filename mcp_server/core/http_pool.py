@@ -0,0 +1,184 @@
+import os
+import random
+import asyncio
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Defaults for every pool, overridable per pool through get_pool()
+HTTP_POOL_MAX_CONNECTIONS = int(os.environ.get("HTTP_POOL_MAX_CONNECTIONS", "100"))
+HTTP_POOL_MAX_KEEPALIVE = int(os.environ.get("HTTP_POOL_MAX_KEEPALIVE", "20"))
+HTTP_POOL_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_POOL_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "30"))
+HTTP_POOL_TIMEOUT = float(os.environ.get("HTTP_POOL_TIMEOUT", "10"))
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "3"))
+HTTP_RETRY_BACKOFF = float(os.environ.get("HTTP_RETRY_BACKOFF", "0.2"))
+HTTP_RETRY_BACKOFF_MAX = float(os.environ.get("HTTP_RETRY_BACKOFF_MAX", "5"))
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUS_CODES = {502, 503, 504}
+
+# Errors raised before the request reached the server, always safe to retry
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class AsyncHttpPool:
+    """
+    Shared keep-alive HTTP client with bounded connections and retry with backoff.
+
+    The underlying httpx.AsyncClient is created lazily on first use and re-created
+    (closing the previous one) if it is used from a different event loop, so the pool
+    can live at module level.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "",
+        max_connections: int = HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_POOL_MAX_KEEPALIVE,
+        keepalive_expiry: float = HTTP_POOL_KEEPALIVE_EXPIRY,
+        connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = HTTP_READ_TIMEOUT,
+        pool_timeout: float = HTTP_POOL_TIMEOUT,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff: float = HTTP_RETRY_BACKOFF,
+        backoff_max: float = HTTP_RETRY_BACKOFF_MAX,
+        headers: dict = None,
+    ):
+        self.base_url = base_url
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(max_keepalive, max_connections),
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=read_timeout,
+            pool=pool_timeout,
+        )
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.headers = headers or {}
+        self._client = None
+        self._loop = None
+        self._closing = set()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The httpx client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._discard_client()
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self.limits,
+                timeout=self.timeout,
+                headers=self.headers,
+            )
+            self._loop = loop
+        return self._client
+
+    def _discard_client(self):
+        # Close the client of another event loop, on that loop while it still runs
+        old, old_loop = self._client, self._loop
+        if old is None or old.is_closed:
+            return
+        if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(old.aclose(), old_loop)
+            return
+        task = asyncio.ensure_future(self._aclose_quietly(old))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _aclose_quietly(client: httpx.AsyncClient):
+        # The connections of a stopped loop can fail to close cleanly; their sockets go either way
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f"Closing the HTTP client of a previous event loop failed: {e!r}")
+
+    def _retry_delay(self, attempt: int) -> float:
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
+
+    async def request(self, method: str, url: str, idempotent: bool = None, **kwargs) -> httpx.Response:
+        """
+        Send a request through the pool, retrying transient failures.
+
+        Connection failures are always retried since the request never left the client.
+        Timeouts while waiting for a response and 502/503/504 answers are only retried
+        for idempotent requests.
+
+        Args:
+            method (str): HTTP method.
+            url (str): URL, relative to the pool's base_url.
+            idempotent (bool, optional): Override whether the request is safe to resend.
+                Defaults to True for GET, HEAD, OPTIONS, PUT and DELETE.
+            **kwargs: Passed through to httpx.AsyncClient.request.
+
+        Returns:
+            httpx.Response: The last response received.
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+
+        attempt = 0
+        while True:
+            try:
+                resp = await self.client.request(method, url, **kwargs)
+            except _NOT_SENT_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"{method} {url} failed before sending ({e!r}), retrying")
+            except httpx.TransportError as e:
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                logger.warning(f"{method} {url} failed ({e!r}), retrying")
+            else:
+                if not (idempotent and resp.status_code in RETRY_STATUS_CODES and attempt < self.max_retries):
+                    return resp
+                logger.warning(f"{method} {url} returned {resp.status_code}, retrying")
+                await resp.aclose()
+
+            await asyncio.sleep(self._retry_delay(attempt))
+            attempt += 1
+
+    async def aclose(self):
+        """Close the underlying client and its pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+
+_pools = {}
+
+
+def get_pool(name: str, **kwargs) -> AsyncHttpPool:
+    """
+    Get the shared pool registered under a name, creating it on first use.
+
+    Args:
+        name (str): Pool name, usually the remote service (e.g. "itemtracker").
+        **kwargs: AsyncHttpPool arguments, only used when the pool is created.
+
+    Returns:
+        AsyncHttpPool: The shared pool.
+    """
+    pool = _pools.get(name)
+    if pool is None:
+        pool = _pools[name] = AsyncHttpPool(**kwargs)
+    return pool
+
+
+async def close_pools():
+    """Close every shared pool."""
+    for pool in _pools.values():
+        await pool.aclose()
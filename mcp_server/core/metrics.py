@@ -0,0 +1,308 @@
+import re
+import time
+import bisect
+import functools
+
+from starlette.responses import PlainTextResponse
+
+from core.admission import admission_stats
+from core.cache import cache_stats
+from core.coalesce import coalesce_stats
+from core.executors import executor_stats
+
+# Upper bounds of the histogram buckets, in seconds and bytes
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+QUANTILES = (0.5, 0.95, 0.99)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+_METRIC_NAME = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*")
+
+_tools = {}
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram, as exported to Prometheus.
+
+    Observing a value is a bisect and two additions, so it is cheap enough to
+    run on every tool call. Quantiles are estimated from the buckets.
+    """
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+
+        Returns:
+            float: The estimate, or None when nothing was observed. Values in the
+                overflow bucket are reported as the largest bucket bound.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def cumulative(self) -> list:
+        """(upper bound, cumulative count) pairs, ending with +Inf."""
+        pairs = []
+        total = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class ToolMetrics:
+    """Call, error and in-flight counts, latency and payload sizes of one tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.request_bytes = Histogram(SIZE_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+
+
+def payload_size(value) -> int:
+    """
+    Approximate size of a value serialized as JSON, without serializing it.
+    """
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return 2 + sum(payload_size(key) + payload_size(item) + 2 for key, item in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return 2 + sum(payload_size(item) + 1 for item in value)
+    if value is None or isinstance(value, bool):
+        return 4
+    return len(str(value))
+
+
+def instrumented_tool(func, name: str):
+    """
+    Wrap an async tool function to record its metrics.
+
+    Args:
+        func: Async tool function, called with keyword arguments.
+        name (str): Tool name, used as the metric label.
+    """
+    metrics = _tools.setdefault(name, ToolMetrics())
+
+    @functools.wraps(func)
+    async def wrapper(**kwargs):
+        metrics.calls += 1
+        metrics.in_flight += 1
+        metrics.request_bytes.observe(payload_size(kwargs))
+        start = time.perf_counter()
+        try:
+            result = await func(**kwargs)
+        except Exception:
+            metrics.errors += 1
+            raise
+        finally:
+            metrics.in_flight -= 1
+            metrics.latency.observe(time.perf_counter() - start)
+        metrics.response_bytes.observe(payload_size(result))
+        return result
+
+    return wrapper
+
+
+def tool_stats() -> dict:
+    """Calls, errors, in-flight calls and latency quantiles of every tool, keyed by name."""
+    return {
+        name: {
+            "calls": metrics.calls,
+            "errors": metrics.errors,
+            "in_flight": metrics.in_flight,
+            **{f"p{round(q * 100)}": metrics.latency.quantile(q) for q in QUANTILES},
+        }
+        for name, metrics in _tools.items()
+    }
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Exposition:
+    # Builds the Prometheus text format, one metric family at a time
+
+    def __init__(self):
+        self.lines = []
+
+    def family(self, name: str, kind: str, help_text: str):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value, **labels):
+        self.lines.append(f"{name}{_labels(**labels) if labels else ''} {_number(value)}")
+
+    def histogram(self, name: str, help_text: str, histograms: dict, label: str):
+        self.family(name, "histogram", help_text)
+        for key, histogram in histograms.items():
+            for bound, count in histogram.cumulative():
+                self.sample(f"{name}_bucket", count, **{label: key, "le": _number(bound)})
+            self.sample(f"{name}_sum", histogram.sum, **{label: key})
+            self.sample(f"{name}_count", histogram.count, **{label: key})
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def render_metrics() -> str:
+    """
+    Render the tool, admission, coalescing, cache and executor metrics in the Prometheus text format.
+    """
+    out = _Exposition()
+    # Tools appear once they have been called, which keeps unused profiles' tools out
+    tools = {name: metrics for name, metrics in sorted(_tools.items()) if metrics.calls}
+
+    out.family("mcp_tool_calls_total", "counter", "Tool calls started.")
+    for name, metrics in tools.items():
+        out.sample("mcp_tool_calls_total", metrics.calls, tool=name)
+    out.family("mcp_tool_errors_total", "counter", "Tool calls that raised an error.")
+    for name, metrics in tools.items():
+        out.sample("mcp_tool_errors_total", metrics.errors, tool=name)
+    out.family("mcp_tool_in_flight", "gauge", "Tool calls currently running.")
+    for name, metrics in tools.items():
+        out.sample("mcp_tool_in_flight", metrics.in_flight, tool=name)
+
+    out.histogram(
+        "mcp_tool_duration_seconds", "Tool call latency.",
+        {name: metrics.latency for name, metrics in tools.items()}, "tool",
+    )
+    out.family("mcp_tool_duration_quantile_seconds", "gauge", "Tool call latency quantiles, estimated from the histogram.")
+    for name, metrics in tools.items():
+        for q in QUANTILES:
+            value = metrics.latency.quantile(q)
+            if value is not None:
+                out.sample("mcp_tool_duration_quantile_seconds", value, tool=name, quantile=q)
+    out.histogram(
+        "mcp_tool_request_bytes", "Approximate JSON size of tool arguments.",
+        {name: metrics.request_bytes for name, metrics in tools.items()}, "tool",
+    )
+    out.histogram(
+        "mcp_tool_response_bytes", "Approximate JSON size of tool results.",
+        {name: metrics.response_bytes for name, metrics in tools.items()}, "tool",
+    )
+
+    admission = admission_stats()
+    for field, kind, help_text in (
+        ("max_concurrency", "gauge", "Concurrent call limit."),
+        ("active", "gauge", "Calls holding a slot."),
+        ("waiting", "gauge", "Calls waiting for a slot."),
+        ("rejected", "counter", "Calls rejected because the wait queue was full."),
+    ):
+        name = f"mcp_admission_{field}_total" if kind == "counter" else f"mcp_admission_{field}"
+        out.family(name, kind, help_text)
+        for limiter, stats in sorted(admission["limiters"].items()):
+            out.sample(name, stats[field], limiter=limiter)
+    out.family("mcp_tool_timeouts_total", "counter", "Tool calls that missed their deadline.")
+    for tool, count in sorted(admission["timeouts"].items()):
+        out.sample("mcp_tool_timeouts_total", count, tool=tool)
+
+    coalescing = coalesce_stats()
+    for field, help_text in (
+        ("executions", "Executions of coalescing tools."),
+        ("coalesced", "Calls that shared an identical call's execution."),
+    ):
+        out.family(f"mcp_tool_{field}_total", "counter", help_text)
+        for tool, stats in sorted(coalescing.items()):
+            out.sample(f"mcp_tool_{field}_total", stats[field], tool=tool)
+
+    caches = cache_stats()
+    for field, kind, help_text in (
+        ("hits", "counter", "Tool result cache hits."),
+        ("misses", "counter", "Tool result cache misses."),
+        ("evictions", "counter", "Tool result cache entries evicted."),
+        ("size", "gauge", "Tool result cache entries."),
+    ):
+        name = f"mcp_tool_cache_{field}_total" if kind == "counter" else f"mcp_tool_cache_{field}"
+        out.family(name, kind, help_text)
+        for tool, stats in sorted(caches.items()):
+            out.sample(name, stats[field], tool=tool)
+
+    executors = executor_stats()
+    for field, kind, help_text in (
+        ("max_workers", "gauge", "Executor pool size."),
+        ("in_flight", "gauge", "Calls submitted to the executor and not finished."),
+        ("queued", "gauge", "Calls waiting for an executor worker."),
+        ("completed", "counter", "Calls completed by the executor."),
+        ("failed", "counter", "Calls that failed in the executor."),
+    ):
+        name = f"mcp_executor_{field}_total" if kind == "counter" else f"mcp_executor_{field}"
+        out.family(name, kind, help_text)
+        for executor, stats in sorted(executors.items()):
+            out.sample(name, stats[field], executor=executor)
+
+    return out.text()
+
+
+def merge_metrics(texts: dict, label: str) -> str:
+    """
+    Merge several render_metrics() outputs, telling their samples apart by a label.
+
+    Args:
+        texts (dict): Rendered metrics keyed by the label value of their source, e.g. {"0": ..., "1": ...}.
+        label (str): Label added to every sample, e.g. "worker".
+
+    Returns:
+        str: One exposition with each family's HELP and TYPE once and the samples of every source.
+    """
+    families = {}
+    for value, text in texts.items():
+        family = families.setdefault(None, ([], []))
+        added = _labels(**{label: value})[1:-1]
+        for line in text.splitlines():
+            if line.startswith("# "):
+                family = families.setdefault(line.split(" ", 3)[2], ([], []))
+                if line not in family[0]:
+                    family[0].append(line)
+            elif line:
+                end = _METRIC_NAME.match(line).end()
+                if line[end] == "{":
+                    line = f"{line[:end + 1]}{added}{'' if line[end + 1] == '}' else ','}{line[end + 1:]}"
+                else:
+                    line = f"{line[:end]}{{{added}}}{line[end:]}"
+                family[1].append(line)
+    return "".join(line + "\n" for meta, samples in families.values() for line in (*meta, *samples))
+
+
+async def metrics_endpoint(request):
+    """Starlette endpoint serving render_metrics()."""
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
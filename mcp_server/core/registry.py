@@ -0,0 +1,273 @@
+import os
+import json
+import typing
+import inspect
+import logging
+import importlib
+import pkgutil
+
+import tools
+from core.executors import get_executor
+
+logger = logging.getLogger(__name__)
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOOL_CONFIG_PATH = os.environ.get("TOOL_CONFIG_PATH", os.path.join(SERVER_DIR, "tool_config.json"))
+TOOL_MANIFEST_PATH = os.environ.get("TOOL_MANIFEST_PATH", os.path.join(SERVER_DIR, ".tool_manifest.json"))
+
+MANIFEST_VERSION = 1
+
+# Names available when turning manifest annotations back into types: the typing names
+# and the basic types, so a manifest can't reach functions like __import__ or open
+_ANNOTATION_NAMESPACE = {
+    **{name: getattr(typing, name) for name in typing.__all__},
+    **{cls.__name__: cls for cls in (str, int, float, bool, bytes, complex, list, dict, set, frozenset, tuple, type, object)},
+}
+
+
+def load_tool_config(path: str = TOOL_CONFIG_PATH) -> dict:
+    """
+    Load the tool configuration (profiles, admission limits, executors and per-tool settings).
+
+    Args:
+        path (str): Path to the JSON configuration file.
+
+    Returns:
+        dict: The configuration, with empty defaults for missing sections.
+    """
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    config.setdefault("profiles", {"all": ["*"]})
+    config.setdefault("admission", {})
+    config.setdefault("executors", {})
+    config.setdefault("tools", {})
+    return config
+
+
+def discover_modules() -> list:
+    """List the tool modules in the 'tools' package without importing them."""
+    return sorted(
+        module_name
+        for _, module_name, is_pkg in pkgutil.iter_modules(tools.__path__)
+        if not is_pkg and not module_name.startswith("_")
+    )
+
+
+def _module_fingerprint(module_name: str) -> list:
+    # Source mtime and size, so the manifest can be validated with a stat call
+    stat = os.stat(os.path.join(tools.__path__[0], f"{module_name}.py"))
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _module_tools(module) -> list:
+    # Public functions defined in the module itself
+    return [
+        (name, func)
+        for name, func in inspect.getmembers(module, inspect.isfunction)
+        if not name.startswith("_") and func.__module__ == module.__name__
+    ]
+
+
+def _describe_tool(module_name: str, name: str, func) -> dict:
+    hints = typing.get_type_hints(func)
+    params = []
+    for param in inspect.signature(func).parameters.values():
+        entry = {"name": param.name, "kind": param.kind.name}
+        if param.name in hints:
+            entry["annotation"] = inspect.formatannotation(hints[param.name])
+        if param.default is not inspect.Parameter.empty:
+            # Defaults must survive a JSON round-trip, like any MCP argument
+            json.dumps(param.default)
+            entry["default"] = param.default
+        params.append(entry)
+    return {
+        "name": name,
+        "module": module_name,
+        "doc": inspect.getdoc(func) or "",
+        "is_async": inspect.iscoroutinefunction(func),
+        "params": params,
+        "returns": inspect.formatannotation(hints["return"]) if "return" in hints else None,
+    }
+
+
+def build_module_manifest(module_name: str) -> dict:
+    """
+    Import a tool module and describe its tools.
+
+    Args:
+        module_name (str): Module name inside the 'tools' package.
+
+    Returns:
+        dict: Manifest entry with the module fingerprint and one record per tool.
+    """
+    module = importlib.import_module(f"tools.{module_name}")
+    logger.info(f"Imported tool module: {module_name}")
+    return {
+        "fingerprint": _module_fingerprint(module_name),
+        "tools": [_describe_tool(module_name, name, func) for name, func in _module_tools(module)],
+    }
+
+
+def load_manifest(module_names: list, path: str = TOOL_MANIFEST_PATH) -> dict:
+    """
+    Load the cached tool manifest, rebuilding the entries of modules that changed.
+
+    Only stale or missing modules are imported; the cache is rewritten if anything changed.
+
+    Args:
+        module_names (list): Modules that must be present in the manifest.
+        path (str): Path to the cached manifest.
+
+    Returns:
+        dict: Mapping of module name to manifest entry.
+    """
+    cached = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == MANIFEST_VERSION:
+            cached = data.get("modules", {})
+    except (OSError, ValueError):
+        pass
+
+    modules = dict(cached)
+    changed = False
+    for module_name in module_names:
+        entry = cached.get(module_name)
+        if entry is None or entry.get("fingerprint") != _module_fingerprint(module_name):
+            modules[module_name] = build_module_manifest(module_name)
+            changed = True
+
+    if changed:
+        try:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "modules": modules}, f, indent=1)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write tool manifest {path}: {e}")
+
+    return {name: modules[name] for name in module_names}
+
+
+def _parse_annotation(annotation: str):
+    try:
+        # Dunder attributes would lead from the basic types back to arbitrary objects
+        if "__" in annotation:
+            raise ValueError(annotation)
+        return eval(annotation, {"__builtins__": {}}, _ANNOTATION_NAMESPACE)
+    except Exception:
+        logger.warning(f"Unresolvable annotation in tool manifest: {annotation}")
+        return typing.Any
+
+
+def _signature(entry: dict) -> inspect.Signature:
+    params = []
+    for param in entry["params"]:
+        params.append(
+            inspect.Parameter(
+                param["name"],
+                getattr(inspect.Parameter, param["kind"]),
+                default=param.get("default", inspect.Parameter.empty),
+                annotation=_parse_annotation(param["annotation"]) if "annotation" in param else inspect.Parameter.empty,
+            )
+        )
+    returns = _parse_annotation(entry["returns"]) if entry["returns"] else inspect.Signature.empty
+    return inspect.Signature(params, return_annotation=returns)
+
+
+class ToolRegistry:
+    """
+    Tools of one profile, registered from the cached manifest and imported on first call.
+    """
+
+    def __init__(self, profile: str = "all", config: dict = None, manifest_path: str = TOOL_MANIFEST_PATH):
+        self.config = config if config is not None else load_tool_config()
+        profiles = self.config["profiles"]
+        if profile not in profiles:
+            raise ValueError(f"Unknown tool profile '{profile}'. Available profiles: {', '.join(sorted(profiles))}")
+        self.profile = profile
+
+        # Profile entries are "*", a module name, or "module.function"
+        available = discover_modules()
+        selected_modules = {}
+        for selector in profiles[profile]:
+            module_name, _, tool_name = selector.partition(".")
+            for name in available if module_name == "*" else [module_name]:
+                if name not in available:
+                    raise ValueError(f"Profile '{profile}' references unknown tool module '{name}'")
+                selected_modules.setdefault(name, set()).add(tool_name or "*")
+
+        manifest = load_manifest(sorted(selected_modules), manifest_path)
+        self.tools = {}
+        for module_name, wanted in selected_modules.items():
+            for entry in manifest[module_name]["tools"]:
+                if "*" in wanted or entry["name"] in wanted:
+                    self.tools[entry["name"]] = entry
+        self._resolved = {}
+
+    def tool_settings(self, name: str) -> dict:
+        """Per-tool settings from the configuration."""
+        return self.config["tools"].get(name, {})
+
+    def executor(self, name: str):
+        """
+        Executor a tool runs in, from its "executor" setting.
+
+        Async tools always run on the event loop, as do tools without a setting
+        or with "inline".
+
+        Returns:
+            ToolExecutor: The shared executor, or None to run the tool inline.
+        """
+        executor_name = self.tool_settings(name).get("executor", "inline")
+        if executor_name == "inline":
+            return None
+        executors = self.config["executors"]
+        if executor_name not in executors:
+            raise ValueError(f"Tool '{name}' uses unknown executor '{executor_name}'. Available executors: inline, {', '.join(sorted(executors))}")
+        if self.tools[name]["is_async"]:
+            logger.warning(f"Tool '{name}' is async and runs on the event loop; ignoring executor '{executor_name}'")
+            return None
+        return get_executor(executor_name, executors[executor_name])
+
+    def resolve(self, name: str):
+        """
+        Get the real tool function, importing its module on first use.
+
+        Args:
+            name (str): Tool name.
+
+        Returns:
+            The tool function.
+        """
+        func = self._resolved.get(name)
+        if func is None:
+            module_name = self.tools[name]["module"]
+            module = importlib.import_module(f"tools.{module_name}")
+            logger.info(f"Loaded tool module on first call: {module_name}")
+            func = self._resolved[name] = getattr(module, name)
+        return func
+
+    def proxy(self, name: str):
+        """
+        Build a stand-in for a tool with the manifest's signature and docstring.
+
+        The stand-in imports the tool's module on its first call and then forwards to it,
+        running it in the tool's executor when it has one.
+        """
+        entry = self.tools[name]
+        executor = self.executor(name)
+
+        async def call(**kwargs):
+            if executor is not None:
+                return await executor.run(entry["module"], name, kwargs)
+            result = self.resolve(name)(**kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        call.__name__ = call.__qualname__ = name
+        call.__doc__ = entry["doc"]
+        call.__signature__ = _signature(entry)
+        return call
@@ -0,0 +1,394 @@
+import os
+import time
+import signal
+import socket
+import asyncio
+import logging
+
+import uvicorn
+
+from core.metrics import PROMETHEUS_CONTENT_TYPE, merge_metrics
+
+logger = logging.getLogger(__name__)
+
+MCP_WORKER_DRAIN_TIMEOUT = int(os.environ.get("MCP_WORKER_DRAIN_TIMEOUT", "30"))
+MCP_WORKER_RESTART_BACKOFF_MAX = float(os.environ.get("MCP_WORKER_RESTART_BACKOFF_MAX", "30"))
+
+_HOP_BY_HOP_HEADERS = {b"connection", b"keep-alive", b"proxy-connection"}
+# Idle connections to a worker are reused for this long; workers keep them open longer
+_UPSTREAM_IDLE_TIMEOUT = 30
+_METRICS_TIMEOUT = 5
+
+
+def _parse_head(head: bytes) -> tuple:
+    """
+    Split an HTTP request or response head.
+
+    Returns:
+        tuple: (start line, {lowercase header name: value}, header lines to forward)
+    """
+    lines = head.split(b"\r\n")
+    headers = {}
+    forwarded = []
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        headers[name] = value.strip()
+        if name not in _HOP_BY_HOP_HEADERS:
+            forwarded.append(line)
+    return lines[0], headers, forwarded
+
+
+def _wants_close(version: bytes, headers: dict) -> bool:
+    connection = headers.get(b"connection", b"").lower()
+    return b"close" in connection or (version == b"HTTP/1.0" and b"keep-alive" not in connection)
+
+
+def run_worker(app, fd: int, log_level: str = "info"):
+    """
+    Serve a server's SSE app on a listening socket inherited from the supervisor.
+
+    Args:
+        app: The ASGI app; its message endpoint must carry the worker key.
+        fd (int): File descriptor of the listening socket.
+        log_level (str): uvicorn log level.
+    """
+    sock = socket.socket(fileno=fd)
+    config = uvicorn.Config(
+        app,
+        log_level=log_level.lower(),
+        timeout_keep_alive=_UPSTREAM_IDLE_TIMEOUT * 2,
+        timeout_graceful_shutdown=MCP_WORKER_DRAIN_TIMEOUT,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class _Worker:
+    def __init__(self, slot: int, key: str, port: int, process):
+        self.slot = slot
+        self.key = key
+        self.port = port
+        self.process = process
+        self.connections = 0
+        # Keep-alive connections to the worker, as (reader, writer, idle since)
+        self.idle = []
+        self.stopping = False
+        self.started_at = time.monotonic()
+
+
+class WorkerSupervisor:
+    """
+    Pre-fork supervisor running N MCP server processes behind one port.
+
+    Each worker listens on its own loopback socket, created here and inherited by
+    the worker process. The supervisor accepts client connections on the public
+    port and forwards them:
+
+    - GET /sse goes to the worker with the fewest open connections.
+    - Every worker advertises a message endpoint prefixed with its key
+      (/w<slot>-<generation>/messages/), so the POSTs of an SSE session are routed
+      back to the worker holding that session.
+    - GET on the metrics path returns every worker's metrics, labelled with
+      worker="<slot>".
+
+    Each request on a client connection is routed on its own, so clients keep
+    their connections alive; connections to the workers are kept alive and
+    reused too. Responses without a Content-Length (the SSE streams) get a
+    connection of their own for as long as they last.
+
+    SIGHUP restarts the workers one by one: the replacement takes new sessions
+    while the old worker drains its open ones (up to MCP_WORKER_DRAIN_TIMEOUT
+    seconds). Workers that exit unexpectedly are restarted with backoff.
+    """
+
+    def __init__(self, worker_command: list, workers: int, host: str, port: int, metrics_path: str = None):
+        if workers < 1:
+            raise ValueError("At least one worker is needed")
+        self.worker_command = worker_command
+        self.worker_count = workers
+        self.host = host
+        self.port = port
+        self.metrics_path = metrics_path
+        self.workers = {}
+        self.slots = [None] * workers
+        self._failures = [0] * workers
+        self._generation = 0
+        self._stopping = False
+        self._tasks = set()
+
+    def run(self):
+        """Run the supervisor until SIGINT or SIGTERM."""
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        loop.add_signal_handler(signal.SIGINT, stop.set)
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+        loop.add_signal_handler(signal.SIGHUP, lambda: self._spawn_task(self.rolling_restart()))
+
+        for slot in range(self.worker_count):
+            await self._start_worker(slot)
+
+        server = await asyncio.start_server(self._handle_client, self.host, self.port, reuse_address=True)
+        logger.info(f"Supervisor listening on {self.host}:{self.port} with {self.worker_count} workers")
+        async with server:
+            await stop.wait()
+            logger.info("Supervisor stopping")
+            self._stopping = True
+            server.close()
+            await self._stop_workers(list(self.workers.values()))
+
+    def _spawn_task(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _start_worker(self, slot: int) -> _Worker:
+        self._generation += 1
+        key = f"w{slot}-{self._generation}"
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(socket.SOMAXCONN)
+        sock.set_inheritable(True)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self.worker_command,
+                "--worker-fd", str(sock.fileno()),
+                "--worker-key", key,
+                pass_fds=(sock.fileno(),),
+            )
+        finally:
+            # The worker owns the listening socket now; connections queue in its
+            # backlog until it starts accepting
+            port = sock.getsockname()[1]
+            sock.close()
+
+        worker = _Worker(slot, key, port, process)
+        self.workers[key] = worker
+        self.slots[slot] = key
+        self._spawn_task(self._watch(worker))
+        logger.info(f"Started worker {key} (pid {process.pid}) on 127.0.0.1:{port}")
+        return worker
+
+    async def _watch(self, worker: _Worker):
+        returncode = await worker.process.wait()
+        self.workers.pop(worker.key, None)
+        while worker.idle:
+            worker.idle.pop()[1].close()
+        if worker.stopping or self._stopping:
+            logger.info(f"Worker {worker.key} exited")
+            return
+
+        logger.warning(f"Worker {worker.key} exited unexpectedly with code {returncode}, restarting")
+        if self.slots[worker.slot] == worker.key:
+            # Back off exponentially while a slot keeps dying shortly after starting
+            if time.monotonic() - worker.started_at < 10:
+                self._failures[worker.slot] += 1
+            else:
+                self._failures[worker.slot] = 0
+            if self._failures[worker.slot]:
+                await asyncio.sleep(min(MCP_WORKER_RESTART_BACKOFF_MAX, 2 ** self._failures[worker.slot]))
+            if not self._stopping:
+                await self._start_worker(worker.slot)
+
+    async def rolling_restart(self):
+        """Replace every worker one at a time, letting old workers drain their sessions."""
+        logger.info("Rolling restart of workers")
+        for slot in range(self.worker_count):
+            old = self.workers.get(self.slots[slot])
+            await self._start_worker(slot)
+            if old is not None:
+                await self._stop_workers([old])
+
+    async def _stop_workers(self, workers: list):
+        for worker in workers:
+            worker.stopping = True
+            while worker.idle:
+                worker.idle.pop()[1].close()
+            if worker.process.returncode is None:
+                worker.process.terminate()
+        for worker in workers:
+            try:
+                await asyncio.wait_for(worker.process.wait(), MCP_WORKER_DRAIN_TIMEOUT + 5)
+            except asyncio.TimeoutError:
+                logger.warning(f"Worker {worker.key} did not stop in time, killing it")
+                worker.process.kill()
+                await worker.process.wait()
+
+    def _route(self, path: str) -> _Worker:
+        # Session messages go back to the worker named in the path; new streams
+        # go to the least loaded live worker
+        first = path.lstrip("/").split("/", 1)[0]
+        if first.startswith("w") and first in self.workers:
+            return self.workers[first]
+        if first.startswith("w") and "-" in first:
+            return None
+        live = self._live_workers()
+        return min(live, key=lambda worker: worker.connections) if live else None
+
+    def _live_workers(self) -> list:
+        return [self.workers[key] for key in self.slots if key in self.workers]
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while await self._exchange(reader, writer):
+                pass
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _exchange(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Forward one request and its response; returns whether the client connection can be reused."""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            # The client closed its connection between requests
+            return False
+        request_line, headers, forwarded = _parse_head(head)
+        try:
+            method, target, version = request_line.split(b" ", 2)
+        except ValueError:
+            await self._reply(writer, b"400 Bad Request")
+            return False
+        path = target.split(b"?", 1)[0].decode("latin-1")
+        if self.metrics_path and method == b"GET" and path == self.metrics_path:
+            await self._reply(writer, b"200 OK", (await self._collect_metrics()).encode(), PROMETHEUS_CONTENT_TYPE)
+            return False
+        worker = self._route(path)
+        if worker is None:
+            await self._reply(writer, b"404 Not Found", b"Unknown or expired session worker")
+            return False
+
+        keep_alive = not _wants_close(version, headers)
+        length = headers.get(b"content-length")
+        worker.connections += 1
+        backend = None
+        try:
+            try:
+                backend = await self._connect(worker)
+            except OSError as e:
+                logger.warning(f"Worker {worker.key} unreachable: {e}")
+                await self._reply(writer, b"502 Bad Gateway")
+                return False
+            backend_reader, backend_writer = backend
+            backend_writer.write(b"\r\n".join([request_line, *forwarded, b"", b""]))
+            if length is None and b"transfer-encoding" in headers:
+                # A streamed request body is relayed as is, on a connection of its own
+                await self._tunnel(reader, writer, backend)
+                return False
+            await self._relay(reader, backend_writer, int(length or 0))
+
+            try:
+                response = await backend_reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, ConnectionError) as e:
+                logger.warning(f"Worker {worker.key} dropped a request to {path}: {e!r}")
+                await self._reply(writer, b"502 Bad Gateway")
+                return False
+            status_line, response_headers, response_forwarded = _parse_head(response)
+            response_length = response_headers.get(b"content-length")
+            status = status_line.split(b" ", 2)[1] if status_line.count(b" ") else b""
+            if response_length is None and method != b"HEAD" and status not in (b"204", b"304"):
+                # A stream such as the SSE endpoint: relay both ways until either side closes
+                writer.write(b"\r\n".join([status_line, *response_forwarded, b"Connection: close", b"", b""]))
+                await self._tunnel(reader, writer, backend)
+                return False
+
+            writer.write(b"\r\n".join([status_line, *response_forwarded, *([] if keep_alive else [b"Connection: close"]), b"", b""]))
+            await self._relay(backend_reader, writer, 0 if method == b"HEAD" else int(response_length or 0))
+            if not _wants_close(status_line.split(b" ", 1)[0], response_headers) and not worker.stopping:
+                worker.idle.append((backend_reader, backend_writer, time.monotonic()))
+                backend = None
+            return keep_alive
+        finally:
+            worker.connections -= 1
+            if backend is not None:
+                backend[1].close()
+
+    async def _connect(self, worker: _Worker) -> tuple:
+        # Reuse an idle keep-alive connection to the worker, or open one
+        now = time.monotonic()
+        while worker.idle:
+            reader, writer, idle_since = worker.idle.pop()
+            if now - idle_since < _UPSTREAM_IDLE_TIMEOUT and not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        return await asyncio.open_connection("127.0.0.1", worker.port)
+
+    async def _tunnel(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, backend: tuple):
+        backend_reader, backend_writer = backend
+        upstream = asyncio.create_task(self._pipe(reader, backend_writer))
+        downstream = asyncio.create_task(self._pipe(backend_reader, writer))
+        # Whichever side closes first ends the exchange
+        done, pending = await asyncio.wait({upstream, downstream}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+
+    @staticmethod
+    async def _relay(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, length: int):
+        while length > 0:
+            data = await reader.read(min(length, 65536))
+            if not data:
+                raise asyncio.IncompleteReadError(b"", length)
+            writer.write(data)
+            length -= len(data)
+        await writer.drain()
+
+    @staticmethod
+    async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    async def _collect_metrics(self) -> str:
+        # Every live worker's metrics, told apart by a worker="<slot>" label
+        workers = self._live_workers()
+        texts = await asyncio.gather(*(self._fetch_metrics(worker) for worker in workers))
+        return merge_metrics({str(worker.slot): text for worker, text in zip(workers, texts) if text is not None}, "worker")
+
+    async def _fetch_metrics(self, worker: _Worker) -> str:
+        async def fetch():
+            reader, writer = await asyncio.open_connection("127.0.0.1", worker.port)
+            try:
+                writer.write(f"GET {self.metrics_path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n".encode())
+                return await reader.read()
+            finally:
+                writer.close()
+
+        try:
+            response = await asyncio.wait_for(fetch(), _METRICS_TIMEOUT)
+        except (OSError, asyncio.TimeoutError) as e:
+            logger.warning(f"Could not read the metrics of worker {worker.key}: {e!r}")
+            return None
+        head, _, body = response.partition(b"\r\n\r\n")
+        if head.split(b" ", 2)[1:2] != [b"200"]:
+            logger.warning(f"Worker {worker.key} answered {head[:40]!r} for its metrics")
+            return None
+        return body.decode()
+
+    @staticmethod
+    async def _reply(writer: asyncio.StreamWriter, status: bytes, body: bytes = b"", content_type: str = "text/plain"):
+        writer.write(
+            b"HTTP/1.1 " + status + b"\r\nContent-Type: " + content_type.encode() + b"\r\nContent-Length: "
+            + str(len(body)).encode() + b"\r\nConnection: close\r\n\r\n" + body
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
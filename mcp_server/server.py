@@ -1,44 +1,155 @@
+import os
+import sys
 import logging
-import inspect
-import importlib
-import pkgutil
+import argparse
 
+import uvicorn
 from mcp.server.fastmcp import FastMCP
 
-import tools
+from core.admission import DEFAULT_ADMISSION, admitted_tool, create_global_limiter
+from core.cache import cached_tool
+from core.coalesce import coalesced_tool
+from core.metrics import instrumented_tool, metrics_endpoint
+from core.registry import ToolRegistry
 
 
 # Simple logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create MCP server
-mcp = FastMCP(
-    name="Utility Toolkit",
-    description="Collection of useful tools",
-    host="0.0.0.0",
-    port=3312,
-)
-
-# Dynamically import all modules in the 'tools' package
-tool_modules = []
-for _, module_name, is_pkg in pkgutil.iter_modules(tools.__path__):
-    if not is_pkg:
-        module = importlib.import_module(f"tools.{module_name}")
-        tool_modules.append(module)
-        logger.info(f"Imported tool module: {module_name}")
-
-# Dynamically register all functions from the tool modules
-for module in tool_modules:
-    for name, func in inspect.getmembers(module, inspect.isfunction):
-        mcp.tool()(func)
+MCP_PROFILE = os.environ.get("MCP_PROFILE", "all")
+MCP_HOST = os.environ.get("MCP_HOST", "0.0.0.0")
+MCP_PORT = int(os.environ.get("MCP_PORT", "3312"))
+MCP_WORKERS = int(os.environ.get("MCP_WORKERS", "1"))
+# Prometheus endpoint served next to the SSE app; set to an empty string to disable it
+MCP_METRICS_PATH = os.environ.get("MCP_METRICS_PATH", "/metrics")
+
+
+def create_server(profile: str = MCP_PROFILE, host: str = MCP_HOST, port: int = MCP_PORT, admission: dict = None) -> FastMCP:
+    """
+    Create the MCP server with the tools of a profile.
+
+    Tools are registered from the cached manifest; their modules are only imported
+    when a tool is first called. Each tool is wrapped according to its settings in
+    tool_config.json.
+
+    Args:
+        profile (str): Tool profile from tool_config.json.
+        host (str): Host to bind.
+        port (int): Port to bind.
+        admission (dict, optional): Overrides of the global "admission" settings
+            (max_concurrency, max_queue, timeout).
+
+    Returns:
+        FastMCP: The configured server.
+    """
+    server = FastMCP(
+        name="Utility Toolkit",
+        description="Collection of useful tools",
+        host=host,
+        port=port,
+    )
+    registry = ToolRegistry(profile)
+    admission = {**DEFAULT_ADMISSION, **registry.config["admission"], **(admission or {})}
+    limiter = create_global_limiter(admission)
+    for name, entry in registry.tools.items():
+        settings = registry.tool_settings(name)
+        func = registry.proxy(name)
+        func = admitted_tool(func, name, settings.get("admission"), limiter, admission["timeout"])
+        func = coalesced_tool(func, name, settings.get("coalesce", False))
+        func = cached_tool(func, name, settings.get("cache"))
+        func = instrumented_tool(func, name)
+        server.add_tool(func, name=name, description=entry["doc"])
         logger.info(f"Registered tool: {name}")
+    logger.info(f"Loaded tool profile '{profile}' with {len(registry.tools)} tools")
+    return server
+
+
+def create_app(server: FastMCP):
+    """
+    Build the server's SSE app with the metrics endpoint added at MCP_METRICS_PATH.
+
+    Args:
+        server (FastMCP): The server.
+
+    Returns:
+        Starlette: The ASGI app.
+    """
+    app = server.sse_app()
+    if MCP_METRICS_PATH:
+        app.add_route(MCP_METRICS_PATH, metrics_endpoint)
+    return app
+
+
+_server = None
+
 
-def main():
+def get_server() -> FastMCP:
+    """The module-level server, configured from the environment, built on first use."""
+    global _server
+    if _server is None:
+        _server = create_server()
+    return _server
+
+
+def __getattr__(name):
+    # `server.mcp` (used by `mcp dev server.py`) without building the server at import time,
+    # so the supervisor and runs with other settings don't build one they never serve
+    if name == "mcp":
+        return get_server()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Utility Toolkit MCP server")
+    parser.add_argument("--profile", default=MCP_PROFILE, help="Tool profile to serve (see tool_config.json)")
+    parser.add_argument("--host", default=MCP_HOST, help="Host to bind")
+    parser.add_argument("--port", type=int, default=MCP_PORT, help="Port to bind")
+    parser.add_argument("--workers", type=int, default=MCP_WORKERS, help="Worker processes; more than 1 runs a supervisor in front of them")
+    parser.add_argument("--max-concurrency", type=int, help="Tool calls running at once, across all tools")
+    parser.add_argument("--max-queue", type=int, help="Tool calls waiting for a slot before new ones are rejected")
+    parser.add_argument("--tool-timeout", type=float, help="Default tool deadline in seconds")
+    # Used by the supervisor to start worker processes
+    parser.add_argument("--worker-fd", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-key", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Run the MCP server."""
+    args = parse_args(argv)
+    limits = {"max_concurrency": args.max_concurrency, "max_queue": args.max_queue, "timeout": args.tool_timeout}
+    admission = {key: value for key, value in limits.items() if value is not None}
+
+    if args.workers > 1 and args.worker_fd is None:
+        from core.workers import WorkerSupervisor
+
+        logger.info(f"Starting Utility Toolkit MCP server on port {args.port} with {args.workers} workers")
+        command = [sys.executable, os.path.abspath(__file__), "--profile", args.profile]
+        for flag, value in (("--max-concurrency", args.max_concurrency), ("--max-queue", args.max_queue), ("--tool-timeout", args.tool_timeout)):
+            if value is not None:
+                command += [flag, str(value)]
+        WorkerSupervisor(command, args.workers, args.host, args.port, MCP_METRICS_PATH).run()
+        return
+
+    if args.profile == MCP_PROFILE and not admission:
+        server = get_server()
+    else:
+        server = create_server(args.profile, admission=admission)
+    server.settings.host = args.host
+    server.settings.port = args.port
+
+    if args.worker_fd is not None:
+        from core.workers import run_worker
+
+        # Session message URLs carry the worker key so the supervisor can route them back
+        server.settings.message_path = f"/{args.worker_key}/messages/"
+        run_worker(create_app(server), args.worker_fd, server.settings.log_level)
+        return
+
     try:
-        logger.info("Starting Utility Toolkit MCP server on port 3312")
-        mcp.run(transport="sse")
+        logger.info(f"Starting Utility Toolkit MCP server on port {args.port}")
+        uvicorn.run(create_app(server), host=args.host, port=args.port, log_level=server.settings.log_level.lower())
     except KeyboardInterrupt:
         logger.info("Server stopped (KeyboardInterrupt)")
     except Exception as e:
@@ -46,4 +157,4 @@ def main():
         raise
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
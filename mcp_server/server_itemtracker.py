@@ -1,37 +1,18 @@
-import logging
-import inspect
+import os
 
-from mcp.server.fastmcp import FastMCP
+# Serve only the itemtracker tools on localhost, unless overridden by the environment
+os.environ.setdefault("MCP_PROFILE", "itemtracker")
+os.environ.setdefault("MCP_HOST", "localhost")
 
-import tools.itemtracker_tools as itemtracker_tools
+from server import get_server, main  # noqa: E402
 
-# Simple logging setup
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
 
-# Create MCP server
-mcp = FastMCP(
-    name="Utility Toolkit",
-    description="Collection of useful tools",
-    host="localhost",
-    port=3312,
-)
+def __getattr__(name):
+    # `mcp dev server_itemtracker.py` finds the server, built only when asked for
+    if name == "mcp":
+        return get_server()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Register all functions from itemtracker_tools
-for name, func in inspect.getmembers(itemtracker_tools, inspect.isfunction):
-    mcp.tool()(func)
-    logger.info(f"Registered tool: {name}")
-
-def main():
-    """Run the MCP server."""
-    try:
-        logger.info("Starting Utility Toolkit MCP server on port 3312")
-        mcp.run(transport="sse")
-    except KeyboardInterrupt:
-        logger.info("Server stopped (KeyboardInterrupt)")
-    except Exception as e:
-        logger.error(f"Server error: {e}")
-        raise
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,78 @@
+"""
+Month-end cases of calculate_age and calculate_ages.
+
+    python -m pytest mcp_server/tests
+"""
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from tools.utility_tools import calculate_age, calculate_ages  # noqa: E402
+
+# (birth date, reference date, (years, months, days))
+MONTH_END_CASES = [
+    ("2000-02-29", "2023-02-27", (22, 11, 29)),
+    ("2000-02-29", "2023-02-28", (23, 0, 0)),
+    ("2000-02-29", "2023-03-01", (23, 0, 1)),
+    ("2000-02-29", "2024-02-29", (24, 0, 0)),
+    ("2023-01-31", "2023-02-28", (0, 1, 0)),
+    ("2023-01-31", "2023-03-30", (0, 1, 30)),
+    ("2023-01-31", "2023-03-31", (0, 2, 0)),
+    ("2023-01-31", "2023-04-30", (0, 3, 0)),
+    ("2023-01-31", "2023-05-01", (0, 3, 1)),
+    ("2022-12-31", "2023-01-01", (0, 0, 1)),
+    ("1990-05-15", "2023-05-14", (32, 11, 29)),
+    ("1990-05-15", "2023-05-15", (33, 0, 0)),
+]
+
+
+@pytest.mark.parametrize("birth_date, reference_date, expected", MONTH_END_CASES)
+def test_calculate_age_month_ends(birth_date, reference_date, expected):
+    age = calculate_age(birth_date, reference_date)
+    assert (age["years"], age["months"], age["days"]) == expected
+
+
+@pytest.mark.parametrize("birth_date, reference_date, expected", MONTH_END_CASES)
+def test_calculate_ages_month_ends(birth_date, reference_date, expected):
+    ages = calculate_ages([birth_date], reference_date)
+    assert (ages["years"][0], ages["months"][0], ages["days"][0]) == expected
+
+
+def test_ages_never_go_back():
+    # Each day after the birth day adds a day, or completes a month or a year
+    for birth_date in ("2000-02-29", "2001-01-31", "2001-03-30"):
+        birth = date.fromisoformat(birth_date)
+        previous = None
+        for offset in range(800):
+            reference = (birth + timedelta(days=offset)).isoformat()
+            age = calculate_age(birth_date, reference)
+            current = (age["years"], age["months"], age["days"])
+            if previous is not None:
+                assert current > previous, (birth_date, reference)
+            previous = current
+
+
+def test_calculate_ages_matches_calculate_age():
+    births = [(date(2000, 1, 1) + timedelta(days=offset)).isoformat() for offset in range(0, 800, 7)]
+    births += ["2000-02-29", "2001-01-31", "2001-08-31"]
+    for reference in ("2024-02-28", "2024-02-29", "2024-03-01", "2024-04-30", "2024-05-01", "2024-12-31"):
+        ages = calculate_ages(births, reference)
+        for i, birth_date in enumerate(births):
+            age = calculate_age(birth_date, reference)
+            assert (ages["years"][i], ages["months"][i], ages["days"][i]) == (age["years"], age["months"], age["days"])
+
+
+def test_calculate_age_matches_relativedelta():
+    relativedelta = pytest.importorskip("dateutil.relativedelta").relativedelta
+    birth = date(2000, 1, 29)
+    for birth_offset in range(0, 40):
+        born = birth + timedelta(days=birth_offset)
+        for offset in range(0, 500, 3):
+            reference = born + timedelta(days=offset)
+            delta = relativedelta(reference, born)
+            age = calculate_age(born.isoformat(), reference.isoformat())
+            assert (age["years"], age["months"], age["days"]) == (delta.years, delta.months, delta.days), (born, reference)
@@ -1,32 +1,170 @@
 from typing import Literal
 
+import numpy as np
+
+# Units per quantity as (scale, offset) to the quantity's base unit:
+# base_value = value * scale + offset
+_UNITS = {
+    "length": {  # base: meters
+        "meters": (1.0, 0.0),
+        "kilometers": (1000.0, 0.0),
+        "centimeters": (0.01, 0.0),
+        "millimeters": (0.001, 0.0),
+        "micrometers": (1e-6, 0.0),
+        "nanometers": (1e-9, 0.0),
+        "miles": (1609.344, 0.0),
+        "yards": (0.9144, 0.0),
+        "feet": (0.3048, 0.0),
+        "inches": (0.0254, 0.0),
+        "nautical_miles": (1852.0, 0.0),
+    },
+    "mass": {  # base: kilograms
+        "kilograms": (1.0, 0.0),
+        "grams": (0.001, 0.0),
+        "milligrams": (1e-6, 0.0),
+        "tonnes": (1000.0, 0.0),
+        "pounds": (0.45359237, 0.0),
+        "ounces": (0.028349523125, 0.0),
+        "stones": (6.35029318, 0.0),
+    },
+    "volume": {  # base: liters
+        "liters": (1.0, 0.0),
+        "milliliters": (0.001, 0.0),
+        "cubic_meters": (1000.0, 0.0),
+        "cubic_centimeters": (0.001, 0.0),
+        "gallons": (3.785411784, 0.0),
+        "imperial_gallons": (4.54609, 0.0),
+        "quarts": (0.946352946, 0.0),
+        "pints": (0.473176473, 0.0),
+        "cups": (0.2365882365, 0.0),
+        "fluid_ounces": (0.0295735295625, 0.0),
+        "tablespoons": (0.01478676478125, 0.0),
+        "teaspoons": (0.00492892159375, 0.0),
+    },
+    "speed": {  # base: meters per second
+        "meters_per_second": (1.0, 0.0),
+        "kilometers_per_hour": (1 / 3.6, 0.0),
+        "miles_per_hour": (0.44704, 0.0),
+        "feet_per_second": (0.3048, 0.0),
+        "knots": (1852 / 3600, 0.0),
+    },
+    "temperature": {  # base: kelvin
+        "kelvin": (1.0, 0.0),
+        "celsius": (1.0, 273.15),
+        "fahrenheit": (5 / 9, 273.15 - 32 * 5 / 9),
+        "rankine": (5 / 9, 0.0),
+    },
+}
+
+_ALIASES = {
+    "m": "meters", "meter": "meters", "metre": "meters", "metres": "meters",
+    "km": "kilometers", "kilometer": "kilometers",
+    "cm": "centimeters", "centimeter": "centimeters",
+    "mm": "millimeters", "millimeter": "millimeters",
+    "um": "micrometers", "micrometer": "micrometers",
+    "nm": "nanometers", "nanometer": "nanometers",
+    "mi": "miles", "mile": "miles",
+    "yd": "yards", "yard": "yards",
+    "ft": "feet", "foot": "feet",
+    "in": "inches", "inch": "inches",
+    "nmi": "nautical_miles", "nautical_mile": "nautical_miles",
+    "kg": "kilograms", "kilogram": "kilograms",
+    "g": "grams", "gram": "grams",
+    "mg": "milligrams", "milligram": "milligrams",
+    "t": "tonnes", "tonne": "tonnes", "metric_ton": "tonnes",
+    "lb": "pounds", "lbs": "pounds", "pound": "pounds",
+    "oz": "ounces", "ounce": "ounces",
+    "st": "stones", "stone": "stones",
+    "l": "liters", "liter": "liters", "litre": "liters", "litres": "liters",
+    "ml": "milliliters", "milliliter": "milliliters",
+    "m3": "cubic_meters", "cubic_meter": "cubic_meters",
+    "cc": "cubic_centimeters", "cm3": "cubic_centimeters",
+    "gal": "gallons", "gallon": "gallons",
+    "imperial_gallon": "imperial_gallons",
+    "qt": "quarts", "quart": "quarts",
+    "pt": "pints", "pint": "pints",
+    "cup": "cups",
+    "fl_oz": "fluid_ounces", "fluid_ounce": "fluid_ounces",
+    "tbsp": "tablespoons", "tablespoon": "tablespoons",
+    "tsp": "teaspoons", "teaspoon": "teaspoons",
+    "m/s": "meters_per_second", "mps": "meters_per_second",
+    "km/h": "kilometers_per_hour", "kph": "kilometers_per_hour", "kmh": "kilometers_per_hour",
+    "mph": "miles_per_hour",
+    "ft/s": "feet_per_second", "fps": "feet_per_second",
+    "kn": "knots", "kt": "knots", "knot": "knots",
+    "k": "kelvin",
+    "c": "celsius", "°c": "celsius",
+    "f": "fahrenheit", "°f": "fahrenheit",
+    "r": "rankine",
+}
+
+# Quantities that cannot be negative
+_NON_NEGATIVE = {"length", "mass", "volume"}
+
+# Unit name -> quantity, including aliases
+_QUANTITY_OF = {unit: quantity for quantity, units in _UNITS.items() for unit in units}
+_QUANTITY_OF.update({alias: _QUANTITY_OF[unit] for alias, unit in _ALIASES.items()})
+
+# Precomputed (factor, offset) for every pair of units of the same quantity:
+# target = value * factor + offset
+_CONVERSIONS = {
+    (from_unit, to_unit): (from_scale / to_scale, (from_offset - to_offset) / to_scale)
+    for units in _UNITS.values()
+    for from_unit, (from_scale, from_offset) in units.items()
+    for to_unit, (to_scale, to_offset) in units.items()
+}
+
+
+def _unit(name: str) -> str:
+    key = name.strip().lower().replace(" ", "_")
+    key = _ALIASES.get(key, key)
+    if key not in _QUANTITY_OF:
+        raise ValueError(f"Unknown unit '{name}'. Use list_units to see the supported units")
+    return key
+
+
+def _conversion(from_unit: str, to_unit: str) -> tuple:
+    # Returns (quantity, factor, offset) for a pair of unit names or aliases
+    source, target = _unit(from_unit), _unit(to_unit)
+    if _QUANTITY_OF[source] != _QUANTITY_OF[target]:
+        raise ValueError(f"Cannot convert {_QUANTITY_OF[source]} ({source}) to {_QUANTITY_OF[target]} ({target})")
+    return (_QUANTITY_OF[source],) + _CONVERSIONS[(source, target)]
+
+
+def _convert_array(values, from_unit: str, to_unit: str) -> np.ndarray:
+    quantity, factor, offset = _conversion(from_unit, to_unit)
+    array = np.asarray(values, dtype=np.float64)
+    if not np.all(np.isfinite(array)):
+        raise ValueError("Values must be finite numbers")
+    if quantity in _NON_NEGATIVE and array.size and array.min() < 0:
+        index = int(np.argmax(array < 0))
+        raise ValueError(f"{quantity.capitalize()} cannot be negative (value at index {index})")
+    return array * factor + offset
+
+
 def convert_length(
-    value: float, 
-    from_unit: Literal["meters", "feet"], 
+    value: float,
+    from_unit: Literal["meters", "feet"],
     to_unit: Literal["meters", "feet"]
 ) -> float:
     """
     Convert length between meters and feet.
-    
+
     Args:
         value: The length value to convert
-        from_unit: Convert from "meters" or "feet" 
+        from_unit: Convert from "meters" or "feet"
         to_unit: Convert to "meters" or "feet"
-    
+
     Returns:
         The converted length value
     """
     if value < 0:
         raise ValueError("Length cannot be negative")
-    
+
     if from_unit == to_unit:
         return value
-    
-    if from_unit == "meters" and to_unit == "feet":
-        return round(value * 3.28084, 4)
-    
-    if from_unit == "feet" and to_unit == "meters":
-        return round(value / 3.28084, 4)
+
+    return round(float(_convert_array(value, from_unit, to_unit)), 4)
 
 def convert_temperature(
     value: float,
@@ -35,32 +173,64 @@ def convert_temperature(
 ) -> float:
     """
     Convert temperature between Celsius, Fahrenheit, and Kelvin.
-    
+
     Args:
         value: Temperature value to convert
         from_unit: Convert from "celsius", "fahrenheit", or "kelvin"
         to_unit: Convert to "celsius", "fahrenheit", or "kelvin"
-        
+
     Returns:
         The converted temperature value
     """
     if from_unit == to_unit:
         return value
-    
-    # Convert to Celsius first
-    if from_unit == "fahrenheit":
-        celsius = (value - 32) * 5/9
-    elif from_unit == "kelvin":
-        celsius = value - 273.15
-    else:
-        celsius = value
-    
-    # Convert from Celsius to target
-    if to_unit == "fahrenheit":
-        result = celsius * 9/5 + 32
-    elif to_unit == "kelvin":
-        result = celsius + 273.15
-    else:
-        result = celsius
-    
-    return round(result, 2)
+
+    return round(float(_convert_array(value, from_unit, to_unit)), 2)
+
+def convert_units(value: float, from_unit: str, to_unit: str, precision: int = 6) -> float:
+    """
+    Convert a value between units of length, mass, volume, speed or temperature.
+
+    Args:
+        value: The value to convert
+        from_unit: Unit to convert from (e.g. "km", "pounds", "gallons", "mph", "celsius")
+        to_unit: Unit to convert to, of the same quantity as from_unit
+        precision: Number of decimal places to round to
+
+    Returns:
+        The converted value
+    """
+    return round(float(_convert_array(value, from_unit, to_unit)), precision)
+
+def convert_units_batch(values: list[float], from_unit: str, to_unit: str, precision: int = 6) -> list[float]:
+    """
+    Convert a list of values between units in a single vectorized pass.
+
+    Args:
+        values: The values to convert (e.g. a column of sensor readings)
+        from_unit: Unit to convert from (e.g. "km", "pounds", "gallons", "mph", "celsius")
+        to_unit: Unit to convert to, of the same quantity as from_unit
+        precision: Number of decimal places to round to
+
+    Returns:
+        The converted values, in the same order
+    """
+    return np.round(_convert_array(values, from_unit, to_unit), precision).tolist()
+
+def list_units(quantity: str = None) -> dict:
+    """
+    List the units supported by convert_units and convert_units_batch.
+
+    Args:
+        quantity: Optional quantity to list ("length", "mass", "volume", "speed" or "temperature")
+
+    Returns:
+        Dictionary mapping each quantity to its unit names
+    """
+    if quantity is not None and quantity not in _UNITS:
+        raise ValueError(f"Unknown quantity. Try one of: {', '.join(_UNITS)}")
+    return {
+        name: sorted(units)
+        for name, units in _UNITS.items()
+        if quantity is None or name == quantity
+    }
@@ -1,9 +1,357 @@
 import os
-import requests
+import time
+import asyncio
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+
+from core.http_pool import get_pool
+
+logger = logging.getLogger(__name__)
 
 ITEM_TRACKER_API = os.environ.get("ITEM_TRACKER_API", "http://localhost:3310")
+ITEM_TRACKER_POOL_SIZE = int(os.environ.get("ITEM_TRACKER_POOL_SIZE", "20"))
+ITEM_TRACKER_TIMEOUT = float(os.environ.get("ITEM_TRACKER_TIMEOUT", "10"))
+ITEM_TRACKER_RETRIES = int(os.environ.get("ITEM_TRACKER_RETRIES", "3"))
+ITEM_TRACKER_BULK_CONCURRENCY = int(os.environ.get("ITEM_TRACKER_BULK_CONCURRENCY", "10"))
+ITEM_TRACKER_BULK_MAX_ITEMS = int(os.environ.get("ITEM_TRACKER_BULK_MAX_ITEMS", "500"))
+ITEM_TRACKER_MIRROR_TTL = float(os.environ.get("ITEM_TRACKER_MIRROR_TTL", "30"))
+ITEM_TRACKER_MIRROR_MAX_ITEMS = int(os.environ.get("ITEM_TRACKER_MIRROR_MAX_ITEMS", "100000"))
+
+
+def _api():
+    """Shared keep-alive connection pool to the Item Tracker API."""
+    return get_pool(
+        "itemtracker",
+        base_url=ITEM_TRACKER_API,
+        max_connections=ITEM_TRACKER_POOL_SIZE,
+        max_keepalive=ITEM_TRACKER_POOL_SIZE,
+        read_timeout=ITEM_TRACKER_TIMEOUT,
+        max_retries=ITEM_TRACKER_RETRIES,
+    )
+
+
+class _SortedIndex:
+    """Item ids sorted by a key (ISO dates sort as strings), for range queries by bisection."""
+
+    def __init__(self):
+        self.keys = []
+        self.ids = []
+
+    @classmethod
+    def build(cls, pairs: list) -> "_SortedIndex":
+        """Index (key, id) pairs with one sort, rather than one insert per item."""
+        index = cls()
+        pairs.sort(key=lambda pair: pair[0])
+        index.keys = [key for key, _ in pairs]
+        index.ids = [item_id for _, item_id in pairs]
+        return index
+
+    def add(self, key: str, item_id):
+        i = bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.ids.insert(i, item_id)
+
+    def remove(self, key: str, item_id):
+        i = bisect_left(self.keys, key)
+        while i < len(self.keys) and self.keys[i] == key:
+            if self.ids[i] == item_id:
+                del self.keys[i]
+                del self.ids[i]
+                return
+            i += 1
 
-def add_item(name: str, quantity: int, replacement_date: str, storage_name: str = "", expiration_date: str = None) -> str:
+    def range(self, start: str = None, end: str = None) -> list:
+        # Ids with start <= key <= end, in key order
+        lo = 0 if start is None else bisect_left(self.keys, start)
+        hi = len(self.keys) if end is None else bisect_right(self.keys, end)
+        return self.ids[lo:hi]
+
+
+def _date_key(value) -> str:
+    # Dates may come back as "YYYY-MM-DD" or as full ISO timestamps
+    return value[:10] if isinstance(value, str) and value else None
+
+
+def _storage_key(value) -> str:
+    return (value or "").strip().casefold()
+
+
+def _build_mirror(items: list, max_items: int, date_fields: tuple) -> tuple:
+    """
+    Build a mirror's items, storage and date indexes from a full item list.
+
+    Returns:
+        tuple: (items by id, ids by storage, _SortedIndex by date field, whether items were dropped)
+    """
+    by_id = {}
+    truncated = False
+    for item in items:
+        item_id = item.get("id")
+        if item_id is None:
+            continue
+        if item_id not in by_id and len(by_id) >= max_items:
+            truncated = True
+            continue
+        by_id[item_id] = item
+    by_storage = {}
+    pairs = {field: [] for field in date_fields}
+    for item_id, item in by_id.items():
+        by_storage.setdefault(_storage_key(item.get("storage_name")), set()).add(item_id)
+        for field in date_fields:
+            key = _date_key(item.get(field))
+            if key:
+                pairs[field].append((key, item_id))
+    by_date = {field: _SortedIndex.build(field_pairs) for field, field_pairs in pairs.items()}
+    return by_id, by_storage, by_date, truncated
+
+
+class _ItemMirror:
+    """
+    Local copy of the Item Tracker items, indexed by id, storage and dates.
+
+    Filled from GET /items/ on first read and refreshed once older than
+    ITEM_TRACKER_MIRROR_TTL (with If-None-Match when the API sends an ETag).
+    The write tools update it directly after each successful call; updates
+    made while a sync is waiting for the API are replayed over its result.
+    """
+
+    DATE_FIELDS = ("expiration_date", "replacement_date")
+
+    def __init__(self, ttl: float = ITEM_TRACKER_MIRROR_TTL, max_items: int = ITEM_TRACKER_MIRROR_MAX_ITEMS):
+        self.ttl = ttl
+        self.max_items = max_items
+        self.truncated = False
+        self.synced_at = None
+        self._etag = None
+        self._lock = None
+        self._loop = None
+        # Writes made while a sync is in flight, as ("put", item) or ("discard", id)
+        self._pending = None
+        self._clear()
+
+    def _clear(self):
+        self.items = {}
+        self.by_storage = {}
+        self.by_date = {field: _SortedIndex() for field in self.DATE_FIELDS}
+
+    def _sync_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+        return self._lock
+
+    def put(self, item: dict):
+        item_id = item.get("id")
+        if item_id is None:
+            return
+        if self._pending is not None:
+            self._pending.append(("put", item))
+        self._remove(item_id)
+        if len(self.items) >= self.max_items:
+            self.truncated = True
+            return
+        self.items[item_id] = item
+        self.by_storage.setdefault(_storage_key(item.get("storage_name")), set()).add(item_id)
+        for field, index in self.by_date.items():
+            key = _date_key(item.get(field))
+            if key:
+                index.add(key, item_id)
+
+    def discard(self, item_id):
+        if self._pending is not None:
+            self._pending.append(("discard", item_id))
+        self._remove(item_id)
+
+    def _remove(self, item_id):
+        item = self.items.pop(item_id, None)
+        if item is None:
+            return
+        storage = _storage_key(item.get("storage_name"))
+        ids = self.by_storage.get(storage)
+        if ids is not None:
+            ids.discard(item_id)
+            if not ids:
+                del self.by_storage[storage]
+        for field, index in self.by_date.items():
+            key = _date_key(item.get(field))
+            if key:
+                index.remove(key, item_id)
+
+    def invalidate(self):
+        """Force a full resync on the next read."""
+        self.synced_at = None
+
+    async def ensure_fresh(self):
+        if self.synced_at is not None and time.monotonic() - self.synced_at < self.ttl:
+            return
+        async with self._sync_lock():
+            # Another caller may have synced while this one waited
+            if self.synced_at is not None and time.monotonic() - self.synced_at < self.ttl:
+                return
+            await self._sync()
+
+    async def _sync(self):
+        headers = {"If-None-Match": self._etag} if self._etag and self.synced_at is not None else {}
+        # Writes made until the new indexes are swapped in are replayed over them
+        self._pending = []
+        try:
+            resp = await _api().request("GET", "/items/", headers=headers)
+            if resp.status_code == 304:
+                self.synced_at = time.monotonic()
+                return
+            resp.raise_for_status()
+            data = resp.json()
+            items = data.get("items", []) if isinstance(data, dict) else data
+            # Indexing a large list takes a while; keep it off the event loop
+            built = await asyncio.get_running_loop().run_in_executor(
+                None, _build_mirror, items, self.max_items, self.DATE_FIELDS
+            )
+        finally:
+            pending, self._pending = self._pending, None
+
+        self.items, self.by_storage, self.by_date, self.truncated = built
+        # The API may have answered before these writes reached it
+        for action, value in pending:
+            if action == "put":
+                self.put(value)
+            else:
+                self.discard(value)
+        if self.truncated:
+            logger.warning(f"Item mirror holds only the first {self.max_items} of {len(items)} items")
+        self._etag = resp.headers.get("ETag")
+        self.synced_at = time.monotonic()
+
+    def query(self, storage_name: str = None, date_field: str = "expiration_date", start: str = None, end: str = None, name_contains: str = None) -> list:
+        if start is not None or end is not None:
+            ids = self.by_date[date_field].range(start, end)
+        else:
+            ids = list(self.items)
+        if storage_name is not None:
+            in_storage = self.by_storage.get(_storage_key(storage_name), set())
+            ids = [item_id for item_id in ids if item_id in in_storage]
+        items = [self.items[item_id] for item_id in ids]
+        if name_contains:
+            needle = name_contains.casefold()
+            items = [item for item in items if needle in (item.get("name") or "").casefold()]
+        return items
+
+
+_mirror = _ItemMirror()
+
+
+def _parse_date(value: str, field: str) -> str:
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        raise ValueError(f"{field} must be in YYYY-MM-DD format")
+
+
+def _response_item(resp) -> dict:
+    # The created or updated item, when the API sends it back
+    try:
+        data = resp.json()
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) and "id" in data else None
+
+
+def _page(items: list, limit: int, offset: int = 0) -> dict:
+    return {
+        "total": len(items),
+        "items": items[offset:offset + limit],
+        "truncated_mirror": _mirror.truncated,
+    }
+
+async def _create_item(name: str, quantity: int, replacement_date: str, storage_name: str = "", expiration_date: str = None) -> tuple:
+    # Returns (ok, message)
+    payload = {
+        "name": name,
+        "quantity": quantity,
+        "replacement_date": replacement_date,
+        "storage_name": storage_name,
+        "expiration_date": expiration_date,
+    }
+    resp = await _api().request("POST", "/items/", json=payload)
+    if not resp.is_error:
+        item = _response_item(resp)
+        if item is not None:
+            _mirror.put(item)
+        else:
+            _mirror.invalidate()
+        return True, f"Item '{name}' added successfully."
+    return False, f"Failed to add item: {resp.text}"
+
+async def _update_item(item_id: int, name: str = None, quantity: int = None, replacement_date: str = None, storage_name: str = None, expiration_date: str = None) -> tuple:
+    # Returns (ok, message)
+    payload = {}
+    if name is not None:
+        payload["name"] = name
+    if quantity is not None:
+        payload["quantity"] = quantity
+    if replacement_date is not None:
+        payload["replacement_date"] = replacement_date
+    if storage_name is not None:
+        payload["storage_name"] = storage_name
+    if expiration_date is not None:
+        payload["expiration_date"] = expiration_date
+
+    if not payload:
+        return False, "No fields to update."
+
+    # Fields are set to absolute values, so resending the PATCH is safe
+    resp = await _api().request("PATCH", f"/items/{item_id}", json=payload, idempotent=True)
+    if not resp.is_error:
+        item = _response_item(resp)
+        if item is None and item_id in _mirror.items:
+            item = {**_mirror.items[item_id], **payload}
+        if item is not None:
+            _mirror.put(item)
+        else:
+            _mirror.invalidate()
+        return True, f"Item {item_id} updated successfully."
+    return False, f"Failed to update item: {resp.text}"
+
+async def _delete_item(item_id: int) -> tuple:
+    # Returns (ok, message)
+    resp = await _api().request("DELETE", f"/items/{item_id}")
+    if not resp.is_error:
+        _mirror.discard(item_id)
+        return True, f"Item {item_id} removed successfully."
+    return False, f"Failed to remove item: {resp.text}"
+
+async def _run_bulk(operations: list) -> dict:
+    """
+    Run item operations with bounded concurrency and collect per-item outcomes.
+
+    Args:
+        operations (list): Zero-argument callables returning an (ok, message) coroutine.
+
+    Returns:
+        dict: Success and failure counts, and one result per operation in order.
+    """
+    if len(operations) > ITEM_TRACKER_BULK_MAX_ITEMS:
+        raise ValueError(f"At most {ITEM_TRACKER_BULK_MAX_ITEMS} items can be sent in one call")
+
+    semaphore = asyncio.Semaphore(ITEM_TRACKER_BULK_CONCURRENCY)
+
+    async def run(index, operation):
+        async with semaphore:
+            try:
+                ok, message = await operation()
+            except TypeError as e:
+                ok, message = False, f"Invalid item: {e}"
+            except Exception as e:
+                ok, message = False, f"{type(e).__name__}: {e}"
+        return {"index": index, "ok": ok, "message": message}
+
+    results = await asyncio.gather(*(run(i, operation) for i, operation in enumerate(operations)))
+    succeeded = sum(result["ok"] for result in results)
+    return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
+
+async def add_item(name: str, quantity: int, replacement_date: str, storage_name: str = "", expiration_date: str = None) -> str:
     """
     Add a new item to the Item Tracker.
 
@@ -17,19 +365,9 @@ def add_item(name: str, quantity: int, replacement_date: str, storage_name: str
     Returns:
         str: Result message.
     """
-    payload = {
-        "name": name,
-        "quantity": quantity,
-        "replacement_date": replacement_date,
-        "storage_name": storage_name,
-        "expiration_date": expiration_date,
-    }
-    resp = requests.post(f"{ITEM_TRACKER_API}/items/", json=payload)
-    if resp.ok:
-        return f"Item '{name}' added successfully."
-    return f"Failed to add item: {resp.text}"
+    return (await _create_item(name, quantity, replacement_date, storage_name, expiration_date))[1]
 
-def edit_item(item_id: int, name: str = None, quantity: int = None, replacement_date: str = None, storage_name: str = None, expiration_date: str = None) -> str:
+async def edit_item(item_id: int, name: str = None, quantity: int = None, replacement_date: str = None, storage_name: str = None, expiration_date: str = None) -> str:
     """
     Edit an existing item in the Item Tracker.
 
@@ -44,27 +382,9 @@ def edit_item(item_id: int, name: str = None, quantity: int = None, replacement_
     Returns:
         str: Result message.
     """
-    payload = {}
-    if name is not None:
-        payload["name"] = name
-    if quantity is not None:
-        payload["quantity"] = quantity
-    if replacement_date is not None:
-        payload["replacement_date"] = replacement_date
-    if storage_name is not None:
-        payload["storage_name"] = storage_name
-    if expiration_date is not None:
-        payload["expiration_date"] = expiration_date
-
-    if not payload:
-        return "No fields to update."
-
-    resp = requests.patch(f"{ITEM_TRACKER_API}/items/{item_id}", json=payload)
-    if resp.ok:
-        return f"Item {item_id} updated successfully."
-    return f"Failed to update item: {resp.text}"
+    return (await _update_item(item_id, name, quantity, replacement_date, storage_name, expiration_date))[1]
 
-def remove_item(item_id: int) -> str:
+async def remove_item(item_id: int) -> str:
     """
     Remove an item from the Item Tracker.
 
@@ -74,7 +394,125 @@ def remove_item(item_id: int) -> str:
     Returns:
         str: Result message.
     """
-    resp = requests.delete(f"{ITEM_TRACKER_API}/items/{item_id}")
-    if resp.ok:
-        return f"Item {item_id} removed successfully."
-    return f"Failed to remove item: {resp.text}"
\ No newline at end of file
+    return (await _delete_item(item_id))[1]
+
+async def add_items(items: list[dict]) -> dict:
+    """
+    Add many items to the Item Tracker in one call.
+
+    Args:
+        items (list[dict]): Items to add. Each has "name", "quantity" and "replacement_date"
+            (YYYY-MM-DD), and optionally "storage_name" and "expiration_date" (YYYY-MM-DD).
+
+    Returns:
+        dict: "succeeded" and "failed" counts, and "results" with the index, "ok" flag and
+            message of every item, in order.
+    """
+    return await _run_bulk([lambda item=item: _create_item(**item) for item in items])
+
+async def edit_items(edits: list[dict]) -> dict:
+    """
+    Edit many items in the Item Tracker in one call.
+
+    Args:
+        edits (list[dict]): Edits to apply. Each has the "item_id" to edit and any of the new
+            "name", "quantity", "replacement_date", "storage_name" or "expiration_date".
+
+    Returns:
+        dict: "succeeded" and "failed" counts, and "results" with the index, "ok" flag and
+            message of every edit, in order.
+    """
+    return await _run_bulk([lambda edit=edit: _update_item(**edit) for edit in edits])
+
+async def remove_items(item_ids: list[int]) -> dict:
+    """
+    Remove many items from the Item Tracker in one call.
+
+    Args:
+        item_ids (list[int]): IDs of the items to remove.
+
+    Returns:
+        dict: "succeeded" and "failed" counts, and "results" with the index, "ok" flag and
+            message of every removal, in order.
+    """
+    return await _run_bulk([lambda item_id=item_id: _delete_item(item_id) for item_id in item_ids])
+
+async def list_items(storage_name: str = None, limit: int = 100, offset: int = 0) -> dict:
+    """
+    List the items in the Item Tracker, optionally only those in one storage location.
+
+    Args:
+        storage_name (str, optional): Only list items in this storage location.
+        limit (int, optional): Maximum number of items to return. Defaults to 100.
+        offset (int, optional): Number of items to skip, for paging. Defaults to 0.
+
+    Returns:
+        dict: "total" matching items and the "items" of the requested page.
+    """
+    await _mirror.ensure_fresh()
+    return _page(_mirror.query(storage_name=storage_name), limit, offset)
+
+async def query_items(
+    storage_name: str = None,
+    name_contains: str = None,
+    expires_from: str = None,
+    expires_to: str = None,
+    replace_from: str = None,
+    replace_to: str = None,
+    limit: int = 100,
+) -> dict:
+    """
+    Find items by storage location, name and expiration or replacement date ranges.
+
+    Args:
+        storage_name (str, optional): Only items in this storage location.
+        name_contains (str, optional): Only items whose name contains this text.
+        expires_from (str, optional): Only items expiring on or after this date (YYYY-MM-DD).
+        expires_to (str, optional): Only items expiring on or before this date (YYYY-MM-DD).
+        replace_from (str, optional): Only items to replace on or after this date (YYYY-MM-DD).
+        replace_to (str, optional): Only items to replace on or before this date (YYYY-MM-DD).
+        limit (int, optional): Maximum number of items to return. Defaults to 100.
+
+    Returns:
+        dict: "total" matching items and up to limit "items"; sorted by the filtered date
+        when a date range is given (replacement date if both are), otherwise in the
+        Item Tracker's order.
+    """
+    expires_from = _parse_date(expires_from, "expires_from")
+    expires_to = _parse_date(expires_to, "expires_to")
+    replace_from = _parse_date(replace_from, "replace_from")
+    replace_to = _parse_date(replace_to, "replace_to")
+
+    await _mirror.ensure_fresh()
+    if replace_from is not None or replace_to is not None:
+        items = _mirror.query(storage_name, "replacement_date", replace_from, replace_to, name_contains)
+        if expires_from is not None or expires_to is not None:
+            items = [
+                item for item in items
+                if _date_key(item.get("expiration_date"))
+                and (expires_from is None or _date_key(item["expiration_date"]) >= expires_from)
+                and (expires_to is None or _date_key(item["expiration_date"]) <= expires_to)
+            ]
+    else:
+        items = _mirror.query(storage_name, "expiration_date", expires_from, expires_to, name_contains)
+    return _page(items, limit)
+
+async def get_expiring_items(days: int = 7, storage_name: str = None, limit: int = 100) -> dict:
+    """
+    List the items that expire between today and the given number of days from now.
+
+    Args:
+        days (int, optional): Number of days ahead to look. Defaults to 7.
+        storage_name (str, optional): Only items in this storage location.
+        limit (int, optional): Maximum number of items to return. Defaults to 100.
+
+    Returns:
+        dict: "total" matching items and up to limit "items", soonest expiration first.
+    """
+    today = date.today()
+    return await query_items(
+        storage_name=storage_name,
+        expires_from=today.isoformat(),
+        expires_to=(today + timedelta(days=days)).isoformat(),
+        limit=limit,
+    )
@@ -1,5 +1,206 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DUCKDUCKGO_URL = os.environ.get("DUCKDUCKGO_URL", "https://html.duckduckgo.com/html/")
+SEARCH_POOL_SIZE = int(os.environ.get("SEARCH_POOL_SIZE", "10"))
+SEARCH_TIMEOUT = float(os.environ.get("SEARCH_TIMEOUT", "10"))
+SEARCH_MAX_CONCURRENCY = int(os.environ.get("SEARCH_MAX_CONCURRENCY", "8"))
+
+# On-disk result cache; set SEARCH_CACHE_PATH to an empty string to disable it
+SEARCH_CACHE_PATH = os.environ.get(
+    "SEARCH_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".search_cache.sqlite3"),
+)
+SEARCH_CACHE_TTL = float(os.environ.get("SEARCH_CACHE_TTL", "900"))
+SEARCH_CACHE_STALE_TTL = float(os.environ.get("SEARCH_CACHE_STALE_TTL", "86400"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", "10000"))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    # Shared keep-alive session; urllib3's pool is safe to use from several threads
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504], allowed_methods=None)
+            adapter = HTTPAdapter(pool_connections=SEARCH_POOL_SIZE, pool_maxsize=SEARCH_POOL_SIZE, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = "Mozilla/5.0"
+            _session = session
+        return _session
+
+
+class _SearchCache:
+    """
+    SQLite cache of parsed search results, shared by threads and worker processes.
+
+    Entries are evicted least recently used first once max_entries is exceeded.
+    """
+
+    def __init__(self, path: str, max_entries: int = SEARCH_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_results ("
+            " key TEXT PRIMARY KEY,"
+            " results TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS search_results_accessed ON search_results (accessed_at)")
+
+    def get(self, key: str) -> tuple:
+        """
+        Look up a key.
+
+        Returns:
+            tuple: (results, age in seconds), or None when the key is not cached.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT results, created_at FROM search_results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE search_results SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0]), now - row[1]
+
+    def set(self, key: str, results: list):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_results (key, results, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(results), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM search_results WHERE key IN ("
+                " SELECT key FROM search_results ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_refreshing = set()
+
+
+def _get_cache() -> _SearchCache:
+    global _cache
+    if not SEARCH_CACHE_PATH:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = _SearchCache(SEARCH_CACHE_PATH)
+            except sqlite3.Error as e:
+                logger.warning(f"Search cache disabled, could not open {SEARCH_CACHE_PATH}: {e}")
+                return None
+        return _cache
+
+
+def _cache_key(query: str, max_results: int) -> str:
+    # Case and whitespace differences do not change DuckDuckGo's results
+    return f"{max_results}:{' '.join(query.casefold().split())}"
+
+
+class _ResultLinkParser(HTMLParser):
+    """
+    Incremental parser collecting the 'result__a' anchors of a results page.
+
+    It is fed the page chunk by chunk and sets done once max_results anchors
+    have been closed, so the rest of the page is neither downloaded nor parsed.
+    """
+
+    def __init__(self, max_results: int):
+        super().__init__(convert_charrefs=True)
+        self.max_results = max_results
+        self.results = []
+        self.done = max_results <= 0
+        self._link = None
+        self._depth = 0
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if self._link is not None:
+            if tag == "a":
+                self._depth += 1
+            return
+        if tag == "a":
+            attrs = dict(attrs)
+            if "result__a" in (attrs.get("class") or "").split():
+                self._link = attrs.get("href")
+                self._depth = 1
+                self._text = []
+
+    def handle_endtag(self, tag):
+        if self._link is None or tag != "a":
+            return
+        self._depth -= 1
+        if self._depth == 0:
+            self.results.append({"title": "".join(self._text), "link": self._link})
+            self._link = None
+            self.done = len(self.results) >= self.max_results
+
+    def handle_data(self, data):
+        if self._link is not None:
+            self._text.append(data)
+
+
+def _fetch_results(query: str, max_results: int) -> tuple:
+    # Returns (results, cacheable)
+    parser = _ResultLinkParser(max_results)
+    with _get_session().post(DUCKDUCKGO_URL, data={"q": query}, timeout=SEARCH_TIMEOUT, stream=True) as response:
+        response.encoding = response.encoding or "utf-8"
+        for chunk in response.iter_content(chunk_size=8192, decode_unicode=True):
+            parser.feed(chunk)
+            if parser.done:
+                break
+    results = parser.results
+
+    # Error pages and rate-limit answers come back empty; don't keep them
+    return results, response.ok and bool(results)
+
+
+def _revalidate(query: str, max_results: int, key: str):
+    # Refresh a stale entry in the background, once per key at a time
+    with _cache_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            results, cacheable = _fetch_results(query, max_results)
+            if cacheable:
+                _get_cache().set(key, results)
+        except Exception as e:
+            logger.warning(f"Background refresh failed for search '{query}': {e}")
+        finally:
+            with _cache_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=refresh, name="search-revalidate", daemon=True).start()
+
 
 def duckduckgo_search(query: str, max_results: int = 5) -> list:
     """
@@ -12,17 +213,59 @@ def duckduckgo_search(query: str, max_results: int = 5) -> list:
     Returns:
         List[dict]: List of search result dictionaries with 'title' and 'link'.
     """
-    url = "https://html.duckduckgo.com/html/"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    params = {"q": query}
-    
-    response = requests.post(url, data=params, headers=headers)
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    results = []
-    for result in soup.find_all("a", class_="result__a", limit=max_results):
-        title = result.get_text()
-        link = result.get("href")
-        results.append({"title": title, "link": link})
-    
+    cache = _get_cache()
+    key = _cache_key(query, max_results)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            results, age = cached
+            if age < SEARCH_CACHE_TTL:
+                return results
+            if age < SEARCH_CACHE_TTL + SEARCH_CACHE_STALE_TTL:
+                # Serve the stale results now and refresh them for the next caller
+                _revalidate(query, max_results, key)
+                return results
+
+    results, cacheable = _fetch_results(query, max_results)
+    if cache is not None and cacheable:
+        cache.set(key, results)
+
     return results
+
+def duckduckgo_multi_search(queries: list[str], max_results: int = 5, max_concurrency: int = 4) -> dict:
+    """
+    Run several DuckDuckGo searches concurrently and return all their results.
+
+    Args:
+        queries (list[str]): Search query strings.
+        max_results (int): Maximum number of results per query.
+        max_concurrency (int): Maximum number of searches running at once.
+
+    Returns:
+        dict: 'searches' with one entry per query, in order, holding either its
+            'results' or the 'error' that query failed with.
+    """
+    if not queries:
+        return {"searches": []}
+
+    # Queries that only differ in case or spacing are searched once
+    unique = {}
+    for query in queries:
+        unique.setdefault(_cache_key(query, max_results), query)
+
+    def search(query):
+        try:
+            return {"results": duckduckgo_search(query, max_results)}
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+
+    workers = max(1, min(max_concurrency, SEARCH_MAX_CONCURRENCY, len(unique)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search") as executor:
+        outcomes = dict(zip(unique, executor.map(search, unique.values())))
+
+    return {
+        "searches": [
+            {"query": query, **outcomes[_cache_key(query, max_results)]}
+            for query in queries
+        ]
+    }
@@ -1,5 +1,208 @@
+import os
+import mmap
+import codecs
+import heapq
 import secrets
 import string
+from typing import Literal
+from collections import Counter
+
+# Server-local directories analyze_file may read from (os.pathsep separated);
+# file analysis is disabled when unset
+TEXT_TOOLS_ROOTS = [
+    os.path.realpath(root)
+    for root in os.environ.get("TEXT_TOOLS_ROOTS", "").split(os.pathsep)
+    if root
+]
+
+_CHUNK_SIZE = 1 << 20       # Characters or bytes processed per chunk
+_MAX_TERM_LENGTH = 64       # Longer tokens are not counted as terms
+_MAX_TERMS = 1_000_000      # Vocabulary bound for unique word / top term counting
+_TERM_STRIP = string.punctuation + "\u201c\u201d\u2018\u2019\u00ab\u00bb"
+
+_SYMBOLS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+_TOKEN_ALPHABETS = {
+    "alphanumeric": string.ascii_letters + string.digits,
+    "hex": "0123456789abcdef",
+    "urlsafe": string.ascii_letters + string.digits + "-_",
+}
+BULK_SECRETS_MAX_COUNT = int(os.environ.get("BULK_SECRETS_MAX_COUNT", "10000"))
+
+
+class _TextStats:
+    """
+    Single-pass text statistics over a stream of chunks.
+
+    Only one chunk is held at a time; words spanning two chunks are joined
+    through the in_word flag (for counting) and a short carry (for terms).
+    """
+
+    def __init__(self, count_terms: bool = False, max_terms: int = _MAX_TERMS):
+        self.words = 0
+        self.characters = 0
+        self.newlines = 0
+        self.bytes = 0
+        self.terms = Counter() if count_terms else None
+        self.max_terms = max_terms
+        self.vocabulary_truncated = False
+        self._in_word = False
+        self._carry = ""
+
+    def feed(self, chunk: str):
+        if not chunk:
+            return
+        self.characters += len(chunk)
+        self.newlines += chunk.count("\n")
+
+        tokens = chunk.split()
+        self.words += len(tokens)
+        starts_in_word = not chunk[0].isspace()
+        if self._in_word and starts_in_word:
+            # The first token continues the last word of the previous chunk
+            self.words -= 1
+        ends_in_word = not chunk[-1].isspace()
+
+        if self.terms is not None:
+            if self._carry:
+                if starts_in_word:
+                    tokens[0] = self._carry + tokens[0]
+                else:
+                    tokens.insert(0, self._carry)
+                self._carry = ""
+            if ends_in_word:
+                # Keep at most one character past the limit, enough to know it is too long
+                self._carry = tokens.pop()[:_MAX_TERM_LENGTH + 1]
+            self._add_terms(tokens)
+
+        self._in_word = ends_in_word
+
+    def _add_terms(self, tokens: list):
+        normalized = [token.strip(_TERM_STRIP).lower() for token in tokens if len(token) <= _MAX_TERM_LENGTH]
+        if len(self.terms) < self.max_terms:
+            self.terms.update(term for term in normalized if term)
+            return
+        for term in normalized:
+            if term in self.terms:
+                self.terms[term] += 1
+            elif term:
+                self.vocabulary_truncated = True
+
+    def finish(self) -> "_TextStats":
+        if self.terms is not None and self._carry:
+            self._add_terms([self._carry])
+            self._carry = ""
+        return self
+
+    @property
+    def lines(self) -> int:
+        return self.newlines + 1 if self.characters else 0
+
+    def top_terms(self, n: int) -> list:
+        # heapq.nlargest keeps a heap of at most n entries
+        top = heapq.nlargest(n, self.terms.items(), key=lambda item: item[1])
+        return [{"term": term, "count": count} for term, count in top]
+
+
+def _text_chunks(text: str):
+    for start in range(0, len(text), _CHUNK_SIZE):
+        yield text[start:start + _CHUNK_SIZE]
+
+
+def _file_chunks(path: str):
+    # Decode a memory-mapped file chunk by chunk; the incremental decoder keeps
+    # multi-byte characters that straddle a chunk boundary intact
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            for start in range(0, len(mm), _CHUNK_SIZE):
+                yield decoder.decode(mm[start:start + _CHUNK_SIZE])
+    yield decoder.decode(b"", final=True)
+
+
+def _resolve_local_path(path: str) -> str:
+    if not TEXT_TOOLS_ROOTS:
+        raise ValueError("File analysis is disabled. Set TEXT_TOOLS_ROOTS on the server to allow it")
+    real_path = os.path.realpath(path)
+    if not any(os.path.commonpath([root, real_path]) == root for root in TEXT_TOOLS_ROOTS):
+        raise ValueError("Path is outside the directories allowed by TEXT_TOOLS_ROOTS")
+    if not os.path.isfile(real_path):
+        raise ValueError(f"File not found: {path}")
+    return real_path
+
+
+def _stats_result(stats: _TextStats, top_n: int) -> dict:
+    return {
+        "bytes": stats.bytes,
+        "characters": stats.characters,
+        "words": stats.words,
+        "lines": stats.lines,
+        "unique_words": len(stats.terms),
+        "top_terms": stats.top_terms(top_n),
+        "vocabulary_truncated": stats.vocabulary_truncated,
+    }
+
+
+class _RandomChars:
+    """
+    Uniform random characters of an ASCII alphabet, drawn from large os.urandom reads.
+
+    Bytes are mapped to characters with bytes.translate; bytes at or above the largest
+    multiple of the alphabet size are dropped (rejection sampling), so every character
+    is equally likely.
+    """
+
+    def __init__(self, alphabet: str, expected: int = 0):
+        size = len(alphabet)
+        if not 0 < size <= 256:
+            raise ValueError("Alphabet must have between 1 and 256 characters")
+        limit = 256 - 256 % size
+        self._table = bytes(ord(alphabet[b % size]) if b < limit else 0 for b in range(256))
+        self._reject = bytes(range(limit, 256))
+        # Reads are sized for the expected number of characters, plus rejected bytes
+        self._read_size = max(4096, expected * 256 // limit + 64)
+        self._positions = {char: position for position, char in enumerate(alphabet)}
+        self._data = b""
+        self._pos = 0
+
+    def take(self, n: int) -> str:
+        while self._pos + n > len(self._data):
+            fresh = os.urandom(self._read_size).translate(self._table, self._reject)
+            self._data = self._data[self._pos:] + fresh
+            self._pos = 0
+        chars = self._data[self._pos:self._pos + n]
+        self._pos += n
+        return chars.decode("ascii")
+
+    def shuffle(self, items: list):
+        """Fisher-Yates shuffle; the alphabet must hold at least len(items) characters."""
+        for i in range(len(items) - 1, 0, -1):
+            # Rejection sampling over alphabet positions keeps j uniform in [0, i]
+            limit = len(self._positions) - len(self._positions) % (i + 1)
+            position = self._positions[self.take(1)]
+            while position >= limit:
+                position = self._positions[self.take(1)]
+            j = position % (i + 1)
+            items[i], items[j] = items[j], items[i]
+
+
+def _guarantee_probability(categories: list, length: int) -> float:
+    """Probability that a uniform random password contains every category (inclusion-exclusion)."""
+    total = sum(len(category) for category in categories)
+    probability = 0.0
+    for mask in range(1 << len(categories)):
+        missing = sum(len(category) for i, category in enumerate(categories) if mask >> i & 1)
+        probability += (-1) ** bin(mask).count("1") * ((total - missing) / total) ** length
+    return probability
+
+
+def _check_bulk_count(count: int):
+    if count < 1 or count > BULK_SECRETS_MAX_COUNT:
+        raise ValueError(f"Count must be between 1 and {BULK_SECRETS_MAX_COUNT}")
+
 
 def count_words(text: str) -> dict:
     """
@@ -13,22 +216,58 @@ def count_words(text: str) -> dict:
     """
     if not text:
         return {"words": 0, "characters": 0, "lines": 0}
-    
-    # Count words (split by whitespace, filter empty strings)
-    words = len([word for word in text.split() if word.strip()])
-    
-    # Count characters (including spaces)
-    characters = len(text)
-    
-    # Count lines
-    lines = len(text.split('\n'))
-    
+
+    # Single pass over bounded chunks instead of materializing every word and line
+    stats = _TextStats()
+    for chunk in _text_chunks(text):
+        stats.feed(chunk)
+
     return {
-        "words": words,
-        "characters": characters,
-        "lines": lines
+        "words": stats.words,
+        "characters": stats.characters,
+        "lines": stats.lines
     }
 
+def analyze_text(text: str, top_n: int = 10) -> dict:
+    """
+    Compute detailed statistics for a text.
+
+    Args:
+        text: The text to analyze
+        top_n: Number of most frequent terms to return
+
+    Returns:
+        Dictionary with bytes, characters, words, lines, unique words and the top terms
+    """
+    stats = _TextStats(count_terms=True)
+    for chunk in _text_chunks(text):
+        stats.bytes += len(chunk.encode("utf-8"))
+        stats.feed(chunk)
+
+    return _stats_result(stats.finish(), top_n)
+
+def analyze_file(path: str, top_n: int = 10) -> dict:
+    """
+    Compute detailed statistics for a text or log file on the server.
+
+    The file is memory-mapped and read in chunks, so large files are never fully
+    loaded. Only files under the server's TEXT_TOOLS_ROOTS directories can be read.
+
+    Args:
+        path: Path of the file on the server
+        top_n: Number of most frequent terms to return
+
+    Returns:
+        Dictionary with bytes, characters, words, lines, unique words and the top terms
+    """
+    real_path = _resolve_local_path(path)
+    stats = _TextStats(count_terms=True)
+    for chunk in _file_chunks(real_path):
+        stats.feed(chunk)
+    stats.bytes = os.path.getsize(real_path)
+
+    return _stats_result(stats.finish(), top_n)
+
 def generate_password(
     length: int = 12,
     include_symbols: bool = True,
@@ -80,4 +319,85 @@ def generate_password(
     # Shuffle the password list
     secrets.SystemRandom().shuffle(password)
     
-    return ''.join(password)
\ No newline at end of file
+    return ''.join(password)
+
+def generate_passwords(
+    count: int = 10,
+    length: int = 12,
+    include_symbols: bool = True,
+    include_numbers: bool = True,
+    include_uppercase: bool = True
+) -> list:
+    """
+    Generate many secure random passwords in one call.
+
+    Every password has at least one character from each enabled category.
+
+    Args:
+        count: Number of passwords to generate
+        length: Password length (minimum 4, maximum 128)
+        include_symbols: Include special characters
+        include_numbers: Include numbers
+        include_uppercase: Include uppercase letters
+
+    Returns:
+        List of generated password strings
+    """
+    if length < 4 or length > 128:
+        raise ValueError("Password length must be between 4 and 128 characters")
+    _check_bulk_count(count)
+
+    categories = [string.ascii_lowercase]
+    if include_uppercase:
+        categories.append(string.ascii_uppercase)
+    if include_numbers:
+        categories.append(string.digits)
+    if include_symbols:
+        categories.append(_SYMBOLS)
+    alphabet = "".join(categories)
+    chars = _RandomChars(alphabet, expected=count * length)
+
+    if _guarantee_probability(categories, length) >= 0.5 or length > len(alphabet):
+        # Candidates missing a category are redrawn, which keeps the result uniform
+        # over all passwords satisfying the guarantees
+        category_sets = [frozenset(category) for category in categories]
+        passwords = []
+        while len(passwords) < count:
+            candidate = chars.take(length)
+            if all(not category.isdisjoint(candidate) for category in category_sets):
+                passwords.append(candidate)
+        return passwords
+
+    # Short passwords with many categories would be redrawn too often: place one
+    # character of each category, fill the rest and shuffle, like generate_password
+    category_chars = [_RandomChars(category, expected=count) for category in categories]
+    passwords = []
+    for _ in range(count):
+        password = [source.take(1) for source in category_chars]
+        password.extend(chars.take(length - len(password)))
+        chars.shuffle(password)
+        passwords.append("".join(password))
+    return passwords
+
+def generate_tokens(
+    count: int = 10,
+    length: int = 32,
+    alphabet: Literal["alphanumeric", "hex", "urlsafe"] = "urlsafe"
+) -> list:
+    """
+    Generate many random tokens (API keys, invite codes, ...) in one call.
+
+    Args:
+        count: Number of tokens to generate
+        length: Token length (minimum 4, maximum 128)
+        alphabet: Characters to use: "alphanumeric", "hex" or "urlsafe" (letters, digits, '-' and '_')
+
+    Returns:
+        List of generated token strings
+    """
+    if length < 4 or length > 128:
+        raise ValueError("Token length must be between 4 and 128 characters")
+    _check_bulk_count(count)
+
+    chars = _RandomChars(_TOKEN_ALPHABETS[alphabet], expected=count * length)
+    return [chars.take(length) for _ in range(count)]
@@ -1,12 +1,111 @@
+import re
+import calendar
+
+import numpy as np
 import pytz
-from datetime import datetime, date
+from bisect import bisect_left
+from difflib import get_close_matches
+from functools import lru_cache
+from datetime import datetime, date, timedelta
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Suggested when nothing resembles an unknown timezone name
+COMMON_TIMEZONES = [
+    'America/New_York', 'America/Los_Angeles', 'America/Chicago',
+    'Europe/London', 'Europe/Paris', 'Europe/Berlin',
+    'Asia/Tokyo', 'Asia/Shanghai', 'Asia/Kolkata',
+    'Australia/Sydney', 'UTC'
+]
+
+
+def _parse_reference_date(reference_date: str) -> date:
+    if reference_date is None:
+        return date.today()
+    try:
+        return datetime.strptime(reference_date, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError("Reference date must be in YYYY-MM-DD format")
+
+
+def _normalize_timezone_name(name: str) -> str:
+    return name.strip().lower().replace(" ", "_")
+
 
-def calculate_age(birth_date: str) -> dict:
+@lru_cache(maxsize=None)
+def _timezone_index() -> tuple:
+    """
+    Lookup structures over every timezone name, built once.
+
+    Returns:
+        tuple: (lowercase name -> name, sorted lowercase names,
+            sorted (lowercase city, name) pairs for the last path component,
+            their sorted lowercase cities, lowercase city -> name)
+    """
+    by_lower = {name.lower(): name for name in pytz.all_timezones}
+    cities = sorted((name.rsplit("/", 1)[-1].lower(), name) for name in pytz.all_timezones)
+    city_keys = [city for city, _ in cities]
+    city_names = {city: full for city, full in cities}
+    return by_lower, sorted(by_lower), cities, city_keys, city_names
+
+
+def _prefix_matches(sorted_keys: list, prefix: str, limit: int) -> list:
+    # Keys of a sorted list starting with prefix, found by bisection
+    matches = []
+    for i in range(bisect_left(sorted_keys, prefix), len(sorted_keys)):
+        if not sorted_keys[i].startswith(prefix) or len(matches) >= limit:
+            break
+        matches.append(sorted_keys[i])
+    return matches
+
+
+def _suggest_timezones(name: str, limit: int = 10) -> list:
+    """Timezone names resembling name: prefix matches, then city matches, then fuzzy matches."""
+    by_lower, lowered, cities, city_keys, city_names = _timezone_index()
+    key = _normalize_timezone_name(name)
+    suggestions = []
+
+    def add(candidates):
+        for candidate in candidates:
+            if candidate not in suggestions and len(suggestions) < limit:
+                suggestions.append(candidate)
+
+    if key:
+        add(by_lower[match] for match in _prefix_matches(lowered, key, limit))
+        start = bisect_left(city_keys, key)
+        add(full for city, full in cities[start:start + limit] if city.startswith(key))
+        add(city_names[match] for match in get_close_matches(key, city_names, n=limit, cutoff=0.6))
+        add(by_lower[match] for match in get_close_matches(key, lowered, n=limit, cutoff=0.6))
+    return suggestions
+
+
+@lru_cache(maxsize=1024)
+def _resolve_timezone(name: str):
+    # Cached tz objects, looked up case-insensitively; unknown names are not cached
+    canonical = _timezone_index()[0].get(_normalize_timezone_name(name))
+    if canonical is None:
+        suggestions = _suggest_timezones(name) or COMMON_TIMEZONES
+        raise ValueError(f"Unknown timezone. Try one of: {', '.join(suggestions)}")
+    return pytz.timezone(canonical)
+
+
+def _zone_time(tz, now_utc: datetime) -> dict:
+    current_time = now_utc.astimezone(tz)
+    offset_hours = current_time.utcoffset().total_seconds() / 3600
+    return {
+        "timezone": tz.zone,
+        "current_time": current_time.strftime("%Y-%m-%d %H:%M:%S %Z"),
+        "utc_offset": f"{offset_hours:+.1f} hours",
+        "is_dst": current_time.dst() != timedelta(0),
+    }
+
+def calculate_age(birth_date: str, reference_date: str = None) -> dict:
     """
     Calculate age from birth date.
     
     Args:
         birth_date: Birth date in YYYY-MM-DD format
+        reference_date: Date to calculate the age at, in YYYY-MM-DD format (defaults to today)
         
     Returns:
         Dictionary with age in years, months, and days
@@ -16,50 +115,104 @@ def calculate_age(birth_date: str) -> dict:
     except ValueError:
         raise ValueError("Birth date must be in YYYY-MM-DD format")
     
-    today = date.today()
+    today = _parse_reference_date(reference_date)
     
     if birth > today:
         raise ValueError("Birth date cannot be in the future")
     
-    # Calculate years
-    years = today.year - birth.year
-    
-    # Adjust if birthday hasn't occurred this year
-    if today.month < birth.month or (today.month == birth.month and today.day < birth.day):
-        years -= 1
-    
-    # Calculate months
-    months = today.month - birth.month
-    if today.day < birth.day:
-        months -= 1
-    if months < 0:
-        months += 12
+    # This month's anniversary of the birth day, on the last day of the month when
+    # the month is shorter than the birth day (as dateutil's relativedelta counts)
+    anniversary = min(birth.day, calendar.monthrange(today.year, today.month)[1])
+
+    # Whole months since birth, minus one if this month's anniversary hasn't been reached
+    total_months = (today.year - birth.year) * 12 + today.month - birth.month
+    if today.day < anniversary:
+        total_months -= 1
     
-    # Calculate days
-    if today.day >= birth.day:
-        days = today.day - birth.day
+    # Days since the last monthly anniversary
+    if today.day >= anniversary:
+        days = today.day - anniversary
     else:
-        # Get days in previous month
-        if today.month == 1:
-            prev_month_year = today.year - 1
-            prev_month = 12
-        else:
-            prev_month_year = today.year
-            prev_month = today.month - 1
-        
-        # Simple day calculation (could be more precise with calendar module)
-        days_in_prev_month = 31 if prev_month in [1,3,5,7,8,10,12] else 30
-        if prev_month == 2:
-            days_in_prev_month = 29 if prev_month_year % 4 == 0 else 28
-            
-        days = days_in_prev_month - birth.day + today.day
+        prev_month_year, prev_month = (today.year - 1, 12) if today.month == 1 else (today.year, today.month - 1)
+        days_in_prev_month = calendar.monthrange(prev_month_year, prev_month)[1]
+        days = days_in_prev_month - min(birth.day, days_in_prev_month) + today.day
     
     return {
-        "years": years,
-        "months": months, 
+        "years": total_months // 12,
+        "months": total_months % 12, 
         "days": days
     }
 
+def calculate_ages(birth_dates: list[str], reference_date: str = None) -> dict:
+    """
+    Calculate the ages for many birth dates in one pass.
+
+    Args:
+        birth_dates: Birth dates in YYYY-MM-DD format
+        reference_date: Date to calculate the ages at, in YYYY-MM-DD format (defaults to today)
+
+    Returns:
+        Dictionary with the reference date and 'years', 'months' and 'days' lists in the
+        order of birth_dates (null for invalid dates), plus an 'errors' list with the
+        index and reason of each invalid date
+    """
+    today = _parse_reference_date(reference_date)
+    count = len(birth_dates)
+    errors = []
+
+    valid = np.array([isinstance(value, str) and bool(_ISO_DATE.match(value)) for value in birth_dates], dtype=bool)
+    births = np.full(count, np.datetime64("NaT"), dtype="datetime64[D]")
+    try:
+        births[valid] = np.array(birth_dates, dtype=object)[valid].astype("datetime64[D]")
+    except ValueError:
+        # Some well-formed date doesn't exist (e.g. 2023-02-30): parse one by one to find it
+        for i in np.flatnonzero(valid):
+            try:
+                births[i] = np.datetime64(birth_dates[i], "D")
+            except ValueError:
+                valid[i] = False
+
+    ref = np.datetime64(today, "D")
+    future = valid & (births > ref)
+    for i in np.flatnonzero(~valid):
+        errors.append({"index": int(i), "birth_date": birth_dates[i], "error": "Birth date must be in YYYY-MM-DD format"})
+    for i in np.flatnonzero(future):
+        errors.append({"index": int(i), "birth_date": birth_dates[i], "error": "Birth date cannot be in the future"})
+    errors.sort(key=lambda error: error["index"])
+    ok = valid & ~future
+
+    # Calendar fields of the birth dates
+    birth_months = births[ok].astype("datetime64[M]")
+    birth_years = birth_months.astype("datetime64[Y]").astype(np.int64) + 1970
+    birth_month_numbers = birth_months.astype(np.int64) % 12 + 1
+    birth_days = (births[ok] - birth_months.astype("datetime64[D]")).astype(np.int64) + 1
+
+    # Same arithmetic as calculate_age, on whole arrays
+    days_in_month = calendar.monthrange(today.year, today.month)[1]
+    anniversaries = np.minimum(birth_days, days_in_month)
+    total_months = (today.year - birth_years) * 12 + today.month - birth_month_numbers
+    total_months -= today.day < anniversaries
+    ref_month_start = ref.astype("datetime64[M]")
+    days_in_prev_month = int((ref_month_start.astype("datetime64[D]") - (ref_month_start - 1).astype("datetime64[D]")).astype(np.int64))
+    days = np.where(
+        today.day >= anniversaries,
+        today.day - anniversaries,
+        days_in_prev_month - np.minimum(birth_days, days_in_prev_month) + today.day,
+    )
+
+    def column(values):
+        result = np.full(count, None, dtype=object)
+        result[ok] = values.tolist()
+        return result.tolist()
+
+    return {
+        "reference_date": today.isoformat(),
+        "years": column(total_months // 12),
+        "months": column(total_months % 12),
+        "days": column(days),
+        "errors": errors
+    }
+
 def get_timezone_info(timezone_name: str) -> dict:
     """
     Get current time and information for a specific timezone.
@@ -70,30 +223,59 @@ def get_timezone_info(timezone_name: str) -> dict:
     Returns:
         Dictionary with timezone information and current time
     """
-    try:
-        tz = pytz.timezone(timezone_name)
-    except pytz.exceptions.UnknownTimeZoneError:
-        # Return some common timezones as suggestions
-        common_timezones = [
-            'America/New_York', 'America/Los_Angeles', 'America/Chicago',
-            'Europe/London', 'Europe/Paris', 'Europe/Berlin',
-            'Asia/Tokyo', 'Asia/Shanghai', 'Asia/Kolkata',
-            'Australia/Sydney', 'UTC'
-        ]
-        raise ValueError(f"Unknown timezone. Try one of: {', '.join(common_timezones)}")
-    
-    # Get current time in the timezone
-    current_time = datetime.now(tz)
+    tz = _resolve_timezone(timezone_name)
+
+    # One clock read for both the local and the UTC time
     utc_time = datetime.now(pytz.UTC)
-    
-    # Calculate offset from UTC
-    offset = current_time.utcoffset()
-    offset_hours = offset.total_seconds() / 3600
-    
+
     return {
-        "timezone": timezone_name,
-        "current_time": current_time.strftime("%Y-%m-%d %H:%M:%S %Z"),
-        "utc_offset": f"{offset_hours:+.1f} hours",
-        "is_dst": current_time.dst() != pytz.timedelta(0),
+        **_zone_time(tz, utc_time),
         "utc_time": utc_time.strftime("%Y-%m-%d %H:%M:%S UTC")
-    }
\ No newline at end of file
+    }
+
+def get_world_clock(timezone_names: list[str]) -> dict:
+    """
+    Get the current time in several timezones at once, from a single clock read.
+
+    Args:
+        timezone_names: Timezone names (e.g. ['America/New_York', 'Europe/Lisbon', 'Asia/Tokyo'])
+
+    Returns:
+        Dictionary with the UTC time and, per timezone in order, its current time,
+        UTC offset and DST flag, or an error with suggestions for unknown names
+    """
+    utc_time = datetime.now(pytz.UTC)
+
+    zones = []
+    for timezone_name in timezone_names:
+        try:
+            zones.append(_zone_time(_resolve_timezone(timezone_name), utc_time))
+        except ValueError as e:
+            zones.append({
+                "timezone": timezone_name,
+                "error": str(e),
+                "suggestions": _suggest_timezones(timezone_name)
+            })
+
+    return {
+        "utc_time": utc_time.strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "zones": zones
+    }
+
+def search_timezones(query: str, limit: int = 10) -> list:
+    """
+    Find timezone names matching a partial or misspelled name.
+
+    Args:
+        query: Part of a timezone or city name (e.g. 'Europe/L', 'lisbon', 'new york')
+        limit: Maximum number of names to return
+
+    Returns:
+        List of matching timezone names, best matches first
+    """
+    by_lower = _timezone_index()[0]
+    exact = by_lower.get(_normalize_timezone_name(query))
+    suggestions = _suggest_timezones(query, limit)
+    if exact is not None:
+        suggestions = [exact] + [name for name in suggestions if name != exact][:limit - 1]
+    return suggestions